@@ -13,20 +13,22 @@ Mapper.
 
 import collections
 import copy
+import functools
 import logging
 import weakref
 
 from graphit import __module__, version
-from graphit.graph_py2to3 import to_unicode, prepaire_data_dict
+from graphit.graph_py2to3 import colabc, to_unicode, prepaire_data_dict
 from graphit.graph_storage_drivers.graph_dictstorage_driver import init_dictstorage_driver
 from graphit.graph_mixin import NodeTools, EdgeTools
+from graphit.graph_cursor import NodeCursor, EdgeCursor
 from graphit.graph_orm import GraphORM
 from graphit.graph_algorithms.connectivity import nodes_are_interconnected
 from graphit.graph_combinatorial.graph_setlike_operations import graph_union, graph_issubset
 from graphit.graph_combinatorial.graph_update_operations import graph_update, graph_subtract
 from graphit.graph_exceptions import GraphitException
 from graphit.graph_helpers import (edges_between_nodes, edge_list_to_nodes, make_edges, share_common_origin,
-                                   check_nodes_in_graph, group_edge_pairs)
+                                   check_nodes_in_graph, group_edge_pairs, bulk_attributes)
 
 __all__ = ['GraphBase']
 logger = logging.getLogger(__module__)
@@ -173,7 +175,8 @@ class GraphBase(object):
         * If other is not a Graph instance test if there is a node with
           a key_tag (usually node name) that equals other. This is similar to
           the common task of searching for a node with 'name' using the
-          `query_nodes` method.
+          `query_nodes` method. An attribute index on the key_tag is used
+          if available.
 
         :rtype: :py:bool
         """
@@ -181,6 +184,10 @@ class GraphBase(object):
         if isinstance(other, GraphBase):
             return any([other == self, graph_issubset(other, self)])
         else:
+            nodes = self.nodes.index_lookup(self.data.key_tag, other)
+            if nodes is not None:
+                return len(nodes) > 0
+
             for attr in self.nodes.itervalues():
                 if attr.get(self.data.key_tag) == other:
                     return True
@@ -467,6 +474,23 @@ class GraphBase(object):
 
         return cls
 
+    def _node_cursor_compatible(self):
+        """
+        Check if single node Graph objects returned by `getnodes` use the
+        default NodeTools `get` method.
+
+        If so, node values can be obtained using light weight NodeCursor
+        objects rather than by constructing a Graph object for every node.
+
+        :rtype: :py:bool
+        """
+
+        if len(self.orm.node_mapping):
+            return False
+
+        node_cls = self.orm.orm_class_factory(self._get_class_object(), [self.node_tools])
+        return node_cls.get == NodeTools.get
+
     def _set_auto_nid(self):
         """
         Set the automatically assigned node ID (nid) based on the '_id' node
@@ -628,6 +652,38 @@ class GraphBase(object):
 
         return edges_added
 
+    def add_index(self, key, nodes=True, edges=False, ordered=False):
+        """
+        Add a hash or sorted range index on a node and/or edge attribute
+
+        Attribute indexes are maintained by the storage driver when nodes or
+        edges are added, changed or removed. They are used for equality
+        lookups by the `query_nodes`, `query_edges` and `__contains__` methods
+        which then no longer need to evaluate all nodes or edges.
+        An ordered index keeps numeric or date/time attribute values sorted
+        and is in addition used for range comparisons by `query_nodes` and
+        `query_edges` (with `range_query`) and the attribute filters of XPath
+        queries.
+        Indexes are shared by all subgraphs of the graph.
+
+        :param key:     node or edge attribute to index
+        :type key:      :py:str
+        :param nodes:   add index to the node storage
+        :type nodes:    :py:bool
+        :param edges:   add index to the edge storage
+        :type edges:    :py:bool
+        :param ordered: add a sorted range index instead of a hash index
+        :type ordered:  :py:bool
+
+        :raises:        GraphitException, indexes not supported by storage
+                        driver
+        """
+
+        if nodes:
+            self.nodes.add_index(key, ordered=ordered)
+        if edges:
+            self.edges.add_index(key, ordered=ordered)
+
     def add_node(self, node=None, unicode_convert=True, run_node_new=False, **kwargs):
         """
         Add a node to the graph
@@ -710,9 +766,11 @@ class GraphBase(object):
         node_data = {self.data.key_tag: to_unicode(node, convert=unicode_convert)}
         node_data.update(prepaire_data_dict(copy.deepcopy(kwargs)))
         node_data[u'_id'] = self.data.nodeid
-        self.data[u'nodeid'] += 1
 
+        # Store the node before incrementing the node ID counter so it is
+        # unchanged if the node storage refuses the node (e.g. read-only)
         self.nodes[nid] = node_data
+        self.data[u'nodeid'] += 1
 
         # Call 'new' method of the new node once to allow for custom initiation
         if run_node_new:
@@ -797,6 +855,9 @@ class GraphBase(object):
         edge 'views' will be returned by default. Setting the `copy_view`
         attribute to True will copy the full nodes and edges data set of the
         origin graph together with the views to the new graph.
+        A deep copy is never stored in the file of a storage driver with a
+        `path` defined using `functools.partial`. The `path` is set to None
+        for the copy to have file based drivers use a temporary file.
 
         :param deep:        return a deep copy of the Graph object
         :type deep:         :py:bool
@@ -824,7 +885,18 @@ class GraphBase(object):
             with self.data as dc:
                 data_copy = copy.deepcopy(dc.to_dict(return_full=copy_view))
 
-            class_copy = base_cls(nodes=nodes_copy, edges=edges_copy, data=data_copy)
+            storagedriver = self.storagedriver
+            if isinstance(storagedriver, functools.partial) and storagedriver.keywords.get('path') is not None:
+                storagedriver = functools.partial(storagedriver, path=None)
+
+            class_copy = base_cls(nodes=nodes_copy, edges=edges_copy, data=data_copy,
+                                  storagedriver=storagedriver)
+
+            # Copy attribute indexes
+            for key in self.nodes.indexes:
+                class_copy.nodes.add_index(key, ordered=key in self.nodes.ordered_indexes)
+            for key in self.edges.indexes:
+                class_copy.edges.add_index(key, ordered=key in self.edges.ordered_indexes)
 
             # Copy node view
             if copy_view and self.nodes.is_view:
@@ -840,7 +912,8 @@ class GraphBase(object):
 
         # Make a shallow copy
         else:
-            class_copy = base_cls(nodes=self.nodes, edges=self.edges, data=self.data, orm=self.orm)
+            class_copy = base_cls(nodes=self.nodes, edges=self.edges, data=self.data, orm=self.orm,
+                                  storagedriver=self.storagedriver)
             class_copy.origin = self.origin
 
         # Copy class attributes except fixed
@@ -975,7 +1048,8 @@ class GraphBase(object):
             custom_orm_cls.append(self.edge_tools)
 
         base_cls = self.orm.get_edges(self, edges, classes=custom_orm_cls)
-        w = base_cls(nodes=self.nodes, edges=self.edges, data=self.data, orm=self.orm)
+        w = base_cls(nodes=self.nodes, edges=self.edges, data=self.data, orm=self.orm,
+                     storagedriver=self.storagedriver)
 
         # Set views for nodes and edges
         w.edges.set_view(edges)
@@ -1048,11 +1122,13 @@ class GraphBase(object):
             custom_orm_cls.append(self.node_tools)
 
         base_cls = self.orm.get_nodes(self, nodes, classes=custom_orm_cls)
-        w = base_cls(nodes=self.nodes, edges=self.edges, data=self.data, orm=self.orm)
+        w = base_cls(nodes=self.nodes, edges=self.edges, data=self.data, orm=self.orm,
+                     storagedriver=self.storagedriver)
 
-        # Set views for nodes and edges.
+        # Set views for nodes and edges. The edge view is resolved on first
+        # use as it is often not needed for node selections.
         w.nodes.set_view(nodes)
-        w.edges.set_view(edges_between_nodes(self, nodes))
+        w.edges.set_lazy_view(functools.partial(edges_between_nodes, self.origin, list(nodes)))
 
         # copy class attributes except fixed
         for key in self.__slots__:
@@ -1086,12 +1162,18 @@ class GraphBase(object):
 
             del self.edges[between]
 
-    def iteredges(self, orm_cls=None, reverse=False, sort_key=str, group_pairs=False):
+    def iteredges(self, orm_cls=None, reverse=False, sort_key=str, group_pairs=False, cursor=False):
         """
         Graph edge iterator
 
         Returns a new graph view object for the given edge and it's nodes.
 
+        For fast iteration the `cursor` argument returns a light weight
+        EdgeCursor object for every edge instead. A cursor provides the `nid`
+        attribute and `get` and `set` methods of the EdgeTools class but is
+        not constructed by the ORM. When edge pairs are grouped, the cursor
+        refers to the first edge of the pair.
+
         :param orm_cls:     custom classes to construct new Graph class from
                             for every edge that is returned
         :type orm_cls:      :py:list
@@ -1103,8 +1185,10 @@ class GraphBase(object):
         :param group_pairs: group pairs of forward and reverse edges between
                             nodes and return as one edge Graph object.
         :type group_pairs:  :py:bool
+        :param cursor:      return EdgeCursor objects instead of Graph objects
+        :type cursor:       :py:bool
 
-        :return:            single edge Graph object
+        :return:            single edge Graph object or EdgeCursor
         :rtype:             :graphit:Graph
         """
 
@@ -1112,10 +1196,17 @@ class GraphBase(object):
         if group_pairs:
             edges = group_edge_pairs(edges)
 
+        if cursor:
+            for edge in edges:
+                if isinstance(edge[0], tuple):
+                    edge = edge[0]
+                yield EdgeCursor(self, edge)
+            return
+
         for edge in edges:
             yield self.getedges(edge, directed=True, orm_cls=orm_cls)
 
-    def iternodes(self, orm_cls=None, reverse=False, sort_key=str):
+    def iternodes(self, orm_cls=None, reverse=False, sort_key=str, cursor=False):
         """
         Graph node iterator
 
@@ -1123,6 +1214,11 @@ class GraphBase(object):
         The dynamically created object contains additional node tools.
         Nodes are returned in node ID sorted order.
 
+        For fast iteration the `cursor` argument returns a light weight
+        NodeCursor object for every node instead. A cursor provides the `nid`
+        attribute and `get` and `set` methods of the NodeTools class but is
+        not constructed by the ORM.
+
         :param orm_cls:  custom classes to construct new Graph class from for
                          every node that is returned
         :type orm_cls:   list
@@ -1131,15 +1227,223 @@ class GraphBase(object):
         :type reverse:   :py:bool
         :param sort_key: function for sorting node IDs. Equivalent to the 'key'
                          argument to Pythons 'sorted' build in function.
+        :param cursor:   return NodeCursor objects instead of Graph objects
+        :type cursor:    :py:bool
 
-        :return:         single node Graph object
+        :return:         single node Graph object or NodeCursor
         :rtype:          :graphit:Graph
         """
 
-        for node in sorted(self.nodes.keys(), reverse=reverse, key=sort_key):
+        nodes = sorted(self.nodes.keys(), reverse=reverse, key=sort_key)
+
+        if cursor:
+            for node in nodes:
+                yield NodeCursor(self, node)
+            return
+
+        for node in nodes:
             yield self.getnodes(node, orm_cls=orm_cls)
 
-    def query_edges(self, query=None, orm_cls=None, add_edge_tools=True, **kwargs):
+    def load_edges(self, edges, directed=None, node_from_edge=False, attributes=None, unicode_convert=True,
+                   **kwargs):
+        """
+        Bulk load multiple edges into the graph
+
+        Batched alternative to `add_edges` for loading large numbers of edges.
+        The input is validated once after which the new edges are written to
+        the edge storage in one go. As with `add_edge`, an undirected edge is
+        stored as a pair of edges with the second edge referring to the data
+        of the first using a '$data_ref' pointer.
+
+        Edges can be defined as tuple of two node ID's with an optional
+        attribute dictionary as third item. Attributes can also be provided
+        as column arrays using the `attributes` argument being a dictionary
+        of attribute names and sequences with a value for every edge.
+        Additional keyword arguments are added to all edges. As with
+        `add_edge`, attribute values are copied into the graph.
+
+        Edges that exist already are skipped and a warning is logged once.
+        Contrary to `add_edges` the edge 'new' method is not called.
+        Only the ID's of edges that are added are returned. An undirected
+        edge is returned if either edge of its pair is added.
+
+        :param edges:           edges to add to the graph
+        :type edges:            Iterable of node ID tuples
+        :param directed:        override the graph definition for directed
+                                for the added edges.
+        :type directed:         :py:bool
+        :param node_from_edge:  make node for edge node id's not in graph
+        :type node_from_edge:   :py:bool
+        :param attributes:      attribute name to sequence of attribute values
+                                with one value for every edge
+        :type attributes:       :py:dict
+        :param unicode_convert: convert string types to unicode
+        :type unicode_convert:  :py:bool
+        :param kwargs:          any additional keyword arguments to be added as
+                                edge metadata to all edges.
+
+        :return:                list of edge ids for the edges added in the
+                                same order as the input iterable.
+        :rtype:                 :py:list
+
+        :raises:                GraphitException, edge nodes not in graph
+        """
+
+        if directed is None:
+            directed = self.directed
+
+        edge_ids = []
+        records = []
+        for edge in edges:
+            edge_ids.append((to_unicode(edge[0], convert=unicode_convert),
+                             to_unicode(edge[1], convert=unicode_convert)))
+            records.append(edge[2] if len(edge) == 3 and isinstance(edge[2], dict) else None)
+
+        # Validate edge nodes once
+        edge_nodes = collections.OrderedDict()
+        for edge in edge_ids:
+            edge_nodes[edge[0]] = edge_nodes[edge[1]] = None
+        missing = [nid for nid in edge_nodes if nid not in self.nodes]
+        if missing:
+            if not node_from_edge:
+                raise GraphitException('Nodes with id {0} not in graph.'.format(', '.join([str(n) for n in missing])))
+
+            # Force identical node and edge ID's
+            logger.debug('node_from_edge active. Disable auto_nid')
+            curr_auto_nid = self.data.auto_nid
+            self.data.auto_nid = False
+            try:
+                self.load_nodes(missing, unicode_convert=unicode_convert)
+            finally:
+                self.data.auto_nid = curr_auto_nid
+
+        items = []
+        references = []
+        skipped = 0
+        added = set()
+        loaded = []
+        for edge, attr in zip(edge_ids, bulk_attributes(records, attributes=attributes,
+                                                        unicode_convert=unicode_convert, **kwargs)):
+            is_new = False
+            for i, new_edge in enumerate(make_edges(edge, directed=directed)):
+                if i == 1 and new_edge == edge:
+                    continue
+                if new_edge in added or new_edge in self.edges:
+                    skipped += 1
+                    continue
+                is_new = True
+
+                # Undirectional edge: second edge refers to data in the first
+                if i == 1:
+                    references.append((edge, new_edge))
+                else:
+                    items.append((new_edge, attr))
+                added.add(new_edge)
+
+            if is_new:
+                loaded.append(edge)
+
+        if skipped:
+            logger.warning('{0} edges exist. Use edge update to change attributes.'.format(skipped))
+
+        self.edges.set_many(items)
+        self.edges.set_data_references(references)
+        logger.debug('Loaded {0} edges'.format(len(added)))
+
+        return loaded
+
+    def load_nodes(self, nodes, attributes=None, unicode_convert=True, **kwargs):
+        """
+        Bulk load multiple nodes into the graph
+
+        Batched alternative to `add_nodes` for loading large numbers of nodes.
+        The input is validated once after which the new nodes are written to
+        the node storage in one go and the `nodeid` counter is updated once.
+
+        Nodes can be defined as any hashable object or as tuple of node and
+        attribute dictionary. Attributes can also be provided as column arrays
+        using the `attributes` argument being a dictionary of attribute names
+        and sequences with a value for every node. Additional keyword
+        arguments are added to all nodes. As with `add_node`, attribute values
+        are copied into the graph.
+
+        As with `add_node`, nodes that exist already when auto_nid is disabled
+        have their attributes updated and a warning is logged once.
+        Contrary to `add_nodes` the node 'new' method is not called.
+
+        :param nodes:           objects to be added as nodes to the graph
+        :type nodes:            Iterable of hashable objects
+        :param attributes:      attribute name to sequence of attribute values
+                                with one value for every node
+        :type attributes:       :py:dict
+        :param unicode_convert: convert string types to unicode
+        :type unicode_convert:  :py:bool
+        :param kwargs:          any additional keyword arguments to be added as
+                                node attributes to all nodes.
+
+        :return:                list of node ids for the objects added in the
+                                same order as the input iterable.
+        :rtype:                 :py:list
+
+        :raises:                GraphitException, node ID not hashable or None
+        """
+
+        node_objects = []
+        records = []
+        for node in nodes:
+            if isinstance(node, (tuple, list)) and len(node) == 2 and isinstance(node[1], dict):
+                node_objects.append(to_unicode(node[0], convert=unicode_convert))
+                records.append(node[1])
+            else:
+                node_objects.append(to_unicode(node, convert=unicode_convert))
+                records.append(None)
+
+        auto_nid = self.data.auto_nid
+        key_tag = self.data.key_tag
+        nodeid = self.data.nodeid
+
+        nids = []
+        items = collections.OrderedDict()
+        updated = 0
+        for node, attr in zip(node_objects, bulk_attributes(records, attributes=attributes,
+                                                            unicode_convert=unicode_convert, **kwargs)):
+
+            # Use internal nid or node as node ID
+            if auto_nid:
+                nid = nodeid
+            else:
+                if node is None:
+                    raise GraphitException('Node ID required when auto_nid is disabled')
+                if not isinstance(node, colabc.Hashable):
+                    raise GraphitException('Node {0} of type {1} not a hashable object'.format(
+                        node, type(node).__name__))
+                nid = node
+
+                # If node exist, update attributes
+                if nid in items or nid in self.nodes:
+                    updated += 1
+                    (items[nid] if nid in items else self.nodes[nid]).update(attr)
+                    nids.append(nid)
+                    continue
+
+            node_data = {key_tag: node}
+            node_data.update(attr)
+            node_data[u'_id'] = nodeid
+            nodeid += 1
+
+            items[nid] = node_data
+            nids.append(nid)
+
+        if updated:
+            logger.warning('{0} nodes already assigned, attributes updated'.format(updated))
+
+        self.nodes.set_many(items.items())
+        self.data[u'nodeid'] = nodeid
+        logger.debug('Loaded {0} nodes'.format(len(items)))
+
+        return nids
+
+    def query_edges(self, query=None, orm_cls=None, add_edge_tools=True, range_query=False, **kwargs):
         """
         Select edges based on edge data query
 
@@ -1155,6 +1459,13 @@ class GraphBase(object):
             2 Additional keyword arguments used in the same way as in 1.
             3 A custom (lambda) function passed to as is.
 
+        Key, value pairs are evaluated using the `query_attributes` method of
+        the storage driver that uses an attribute index (see `add_index`)
+        if available for one of the keys. If `range_query` is True, keys
+        ending with '__lt', '__le', '__gt' or '__ge' compare the attribute
+        using <, <=, > or >= instead of equality, for example
+        `weight__gt=0.9`.
+
         Matching edges are passed on to the `getedges` method and returned.
 
         :param query:           query function as input to storage driver
@@ -1164,6 +1475,9 @@ class GraphBase(object):
         :type orm_cls:          :py:list
         :param add_edge_tools:  add edge tools to Graph instance if single edge
         :type add_edge_tools:   :py:bool
+        :param range_query:     parse range comparison suffixes in attribute
+                                keys
+        :type range_query:      :py:bool
         :param kwargs:          if `query` is None, build lambda function from
                                 keyword arguments
 
@@ -1176,12 +1490,12 @@ class GraphBase(object):
             query = None
 
         if query is None:
-            query = lambda key, value: all([value.get(k) == v for k, v in kwargs.items()])
-
-        edges = self.edges.query(query)
+            edges = self.edges.query_attributes(kwargs, range_query=range_query)
+        else:
+            edges = self.edges.query(query)
         return self.getedges(edges, orm_cls=orm_cls, add_edge_tools=add_edge_tools)
 
-    def query_nodes(self, query=None, orm_cls=None, add_node_tools=True, **kwargs):
+    def query_nodes(self, query=None, orm_cls=None, add_node_tools=True, range_query=False, **kwargs):
         """
         Select nodes based on node data query
 
@@ -1197,6 +1511,13 @@ class GraphBase(object):
             2 Additional keyword arguments used in the same way as in 1.
             3 A custom (lambda) function passed to as is.
 
+        Key, value pairs are evaluated using the `query_attributes` method of
+        the storage driver that uses an attribute index (see `add_index`)
+        if available for one of the keys. If `range_query` is True, keys
+        ending with '__lt', '__le', '__gt' or '__ge' compare the attribute
+        using <, <=, > or >= instead of equality, for example
+        `weight__gt=0.9`.
+
         Matching nodes are passed on to the `getnodes` method and returned.
 
         :param query:           query function as input to storage driver
@@ -1206,6 +1527,9 @@ class GraphBase(object):
         :type orm_cls:          :py:list
         :param add_node_tools:  add node tools to Graph instance if single node
         :type add_node_tools:   :py:bool
+        :param range_query:     parse range comparison suffixes in attribute
+                                keys
+        :type range_query:      :py:bool
         :param kwargs:          if `query` is None, build lambda function from
                                 keyword arguments
 
@@ -1218,9 +1542,9 @@ class GraphBase(object):
             query = None
 
         if query is None:
-            query = lambda key, value: all([value.get(k) == v for k, v in kwargs.items()])
-
-        nodes = self.nodes.query(query)
+            nodes = self.nodes.query_attributes(kwargs, range_query=range_query)
+        else:
+            nodes = self.nodes.query(query)
         return self.getnodes(nodes, orm_cls=orm_cls, add_node_tools=add_node_tools)
 
     def remove_edge(self, nd1, nd2, directed=None):
@@ -1270,6 +1594,23 @@ class GraphBase(object):
         for edge in edges:
             self.remove_edge(*edge, directed=directed)
 
+    def remove_index(self, key, nodes=True, edges=False):
+        """
+        Remove a hash or range index on a node and/or edge attribute
+
+        :param key:     indexed node or edge attribute
+        :type key:      :py:str
+        :param nodes:   remove index from the node storage
+        :type nodes:    :py:bool
+        :param edges:   remove index from the edge storage
+        :type edges:    :py:bool
+        """
+
+        if nodes:
+            self.nodes.remove_index(key)
+        if edges:
+            self.edges.remove_index(key)
+
     def remove_node(self, node):
         """
         Removing a node from the graph
@@ -1287,7 +1628,7 @@ class GraphBase(object):
         if node in self.nodes:
 
             # Get edges connected to node and remove them
-            edges = [edge for edge in self.edges if node in edge]
+            edges = self.adjacency.incident_edges([node])
             for edge in edges:
                 del self.edges[edge]
 
@@ -1335,7 +1676,8 @@ class GraphBase(object):
         keystring = keystring or self.data.key_tag
         valuestring = valuestring or self.data.value_tag
 
-        return [(n.get(keystring), n.get(valuestring)) for n in self.iternodes()]
+        cursor = self._node_cursor_compatible()
+        return [(n.get(keystring), n.get(valuestring)) for n in self.iternodes(cursor=cursor)]
 
     def keys(self, keystring=None, **kwargs):
         """
@@ -1352,7 +1694,8 @@ class GraphBase(object):
         """
 
         keystring = keystring or self.data.key_tag
-        return [n.get(keystring) for n in self.iternodes()]
+        cursor = self._node_cursor_compatible()
+        return [n.get(keystring) for n in self.iternodes(cursor=cursor)]
 
     def values(self, valuestring=None, **kwargs):
         """
@@ -1368,4 +1711,5 @@ class GraphBase(object):
         """
 
         valuestring = valuestring or self.data.value_tag
-        return [n.get(valuestring) for n in self.iternodes()]
+        cursor = self._node_cursor_compatible()
+        return [n.get(valuestring) for n in self.iternodes(cursor=cursor)]
@@ -26,13 +26,13 @@ def node_neighbors(graph, nid):
         return []
 
     if graph.masked:
-        nodes = set(graph.nodes.keys())
-        adjacency = set(graph.adjacency[nid])
+        nodes = graph.nodes
+        adjacency = graph.adjacency[nid]
     else:
-        nodes = set(graph.origin.nodes.keys())
-        adjacency = set(graph.origin.adjacency[nid])
+        nodes = graph.origin.nodes
+        adjacency = graph.origin.adjacency[nid]
 
-    return sorted(nodes.intersection(adjacency))
+    return sorted(set([node for node in adjacency if node in nodes]))
 
 
 def degree(graph, nodes=None, weight=None):
@@ -10,7 +10,9 @@ Functions for calculating node centrality measures in a graph
 
 import logging
 import heapq
+import random
 
+from collections import deque
 from math import sqrt
 from itertools import count
 
@@ -19,10 +21,218 @@ from graphit.graph_exceptions import GraphitAlgorithmError
 
 logger = logging.getLogger(__module__)
 
-__all__ = ['brandes_betweenness_centrality', 'eigenvector_centrality']
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
 
+try:
+    import numpy
+    import scipy.sparse
+except ImportError:
+    numpy = None
 
-def brandes_betweenness_centrality(graph, nodes=None, normalized=True, weight=None, endpoints=False):
+__all__ = ['brandes_betweenness_centrality', 'eigenvector_centrality', 'pagerank']
+
+
+def _adjacency_snapshot(graph, weight=None):
+    """
+    Compact snapshot of the graph adjacency using integer node indices
+
+    The snapshot only contains lists and numbers making it cheap to pickle
+    for transfer to worker processes.
+
+    :param graph:   Graph to build snapshot for
+    :type graph:    :graphit:Graph
+    :param weight:  edge attribute to use as edge weight
+    :type weight:   :py:str
+
+    :return:        node ID's, adjacency as list of neighbour indices for
+                    every node index and edge weights in the same layout or
+                    None if weight is not defined.
+    :rtype:         :py:tuple
+    """
+
+    node_ids = list(graph.nodes)
+    index = dict((nid, i) for i, nid in enumerate(node_ids))
+
+    adjacency = []
+    weights = [] if weight is not None else None
+    for nid in node_ids:
+        neighbours = graph.adjacency[nid]
+        adjacency.append([index[w] for w in neighbours])
+        if weights is not None:
+            weights.append([graph.edges[(nid, w)].get(weight, 1) for w in neighbours])
+
+    return node_ids, adjacency, weights
+
+
+def _sparse_adjacency_matrix(graph, weight=None):
+    """
+    Weighted adjacency matrix of the graph in SciPy sparse CSR format
+
+    Matrix element (i, j) equals the weight of the edge from node i to j
+    using the node order of the returned node ID's.
+
+    :param graph:   Graph to build matrix for
+    :type graph:    :graphit:Graph
+    :param weight:  edge attribute to use as edge weight. 1 if not defined
+    :type weight:   :py:str
+
+    :return:        node ID's and adjacency matrix
+    :rtype:         :py:tuple
+    """
+
+    if numpy is None:
+        raise GraphitAlgorithmError('Sparse matrix centrality requires the "numpy" and "scipy" packages')
+
+    node_ids, adjacency, weights = _adjacency_snapshot(graph, weight=weight)
+
+    indptr = numpy.zeros(len(adjacency) + 1, dtype=numpy.int64)
+    numpy.cumsum([len(neighbours) for neighbours in adjacency], out=indptr[1:])
+    indices = numpy.fromiter((w for neighbours in adjacency for w in neighbours), dtype=numpy.int64,
+                             count=int(indptr[-1]))
+    if weights is None:
+        data = numpy.ones(len(indices), dtype=numpy.float64)
+    else:
+        data = numpy.fromiter((w for edge_weights in weights for w in edge_weights), dtype=numpy.float64,
+                              count=int(indptr[-1]))
+
+    matrix = scipy.sparse.csr_matrix((data, indices, indptr), shape=(len(node_ids), len(node_ids)))
+    matrix.sum_duplicates()
+
+    return node_ids, matrix
+
+
+def _brandes_accumulate(betweenness, source, path, predecessors, sigma, endpoints=False):
+    """
+    Add the dependencies of a single source to the betweenness
+
+    :param betweenness:     betweenness for every node index, updated in place
+    :type betweenness:      :py:list
+    :param source:          source node index
+    :type source:           :py:int
+    :param path:            node indices in order of distance from source
+    :type path:             :py:list
+    :param predecessors:    shortest path predecessors for every node index
+    :type predecessors:     :py:list
+    :param sigma:           number of shortest paths for every node index
+    :type sigma:            :py:list
+    :param endpoints:       include the endpoints in the shortest path counts
+    :type endpoints:        :py:bool
+    """
+
+    delta = dict.fromkeys(path, 0)
+    correction = 1 if endpoints else 0
+    if endpoints:
+        betweenness[source] += len(path) - correction
+    while path:
+        w = path.pop()
+        coeff = (1 + delta[w]) / sigma[w]
+        for v in predecessors[w]:
+            delta[v] += sigma[v] * coeff
+        if w != source:
+            betweenness[w] += delta[w] + correction
+
+
+def _brandes_single_source(adjacency, weights, source):
+    """
+    Shortest paths from a single source for Brandes betweenness centrality
+
+    Uses breadth-first search if weights is None else Dijkstra.
+
+    :param adjacency:   neighbour indices for every node index
+    :type adjacency:    :py:list
+    :param weights:     edge weights in the same layout as adjacency or None
+    :type weights:      :py:list
+    :param source:      source node index
+    :type source:       :py:int
+
+    :return:            node indices in order of distance from source,
+                        predecessors and number of shortest paths for every
+                        node index
+    :rtype:             :py:tuple
+    """
+
+    path = []
+    path_node_count = {}
+    p = [[] for _ in adjacency]
+    sigma = [0.0] * len(adjacency)
+    sigma[source] = 1.0
+
+    # Weight is None, use breath-first-search
+    if weights is None:
+        path_node_count[source] = 0
+        queue = deque([source])
+        while queue:
+            next_node = queue.popleft()
+            path.append(next_node)
+            dv = path_node_count[next_node]
+            for w in adjacency[next_node]:
+                if w not in path_node_count:
+                    queue.append(w)
+                    path_node_count[w] = dv + 1
+                if path_node_count[w] == dv + 1:
+                    sigma[w] += sigma[next_node]
+                    p[w].append(next_node)
+
+    # If weight, use Dijkstra shortest path
+    else:
+        seen = {source: 0}
+        c = count()
+        queue = []
+        heapq.heappush(queue, (0, next(c), source, source))
+        while queue:
+            (dist, _, pred, v) = heapq.heappop(queue)
+            if v in path_node_count:
+                continue  # already searched this node.
+            sigma[v] += sigma[pred]  # count paths
+            path.append(v)
+            path_node_count[v] = dist
+            for w, edge_weight in zip(adjacency[v], weights[v]):
+                vw_dist = dist + edge_weight
+                if w not in path_node_count and (w not in seen or vw_dist < seen[w]):
+                    seen[w] = vw_dist
+                    heapq.heappush(queue, (vw_dist, next(c), v, w))
+                    sigma[w] = 0.0
+                    p[w] = [v]
+                elif vw_dist == seen[w]:  # handle equal paths
+                    sigma[w] += sigma[v]
+                    p[w].append(v)
+
+    return path, p, sigma
+
+
+def _brandes_partial(adjacency, weights, sources, endpoints=False):
+    """
+    Betweenness for every node index from the shortest paths of a subset of
+    source nodes.
+
+    Module level function used by worker processes in parallel Brandes
+    betweenness centrality calculation.
+
+    :param adjacency:   neighbour indices for every node index
+    :type adjacency:    :py:list
+    :param weights:     edge weights in the same layout as adjacency or None
+    :type weights:      :py:list
+    :param sources:     source node indices
+    :type sources:      :py:list
+    :param endpoints:   include the endpoints in the shortest path counts
+    :type endpoints:    :py:bool
+
+    :rtype:             :py:list
+    """
+
+    betweenness = [0.0] * len(adjacency)
+    for source in sources:
+        path, predecessors, sigma = _brandes_single_source(adjacency, weights, source)
+        _brandes_accumulate(betweenness, source, path, predecessors, sigma, endpoints=endpoints)
+
+    return betweenness
+
+
+def brandes_betweenness_centrality(graph, nodes=None, normalized=True, weight=None, endpoints=False,
+                                   processes=None, k=None, seed=None):
     """
     Brandes algorithm for betweenness centrality.
 
@@ -32,6 +242,18 @@ def brandes_betweenness_centrality(graph, nodes=None, normalized=True, weight=No
     large influence on the transfer of items through the network, under the
     assumption that item transfer follows the shortest paths.
 
+    The shortest paths from each source node are independent of one another.
+    If `processes` is larger than 1, the source nodes are divided over a pool
+    of worker processes (concurrent.futures) each operating on a compact
+    integer snapshot of the graph adjacency. The partial betweenness of the
+    workers is summed. Due to the different order of summation results may
+    differ from the serial calculation by floating point rounding.
+
+    For large graphs the betweenness can be approximated by only using `k`
+    randomly sampled pivot source nodes. The result is rescaled by the ratio
+    of all source nodes to sampled nodes to estimate the exact betweenness.
+    Use `seed` for a reproducible sample.
+
     Original publication:
     Brandes, Ulrik. "A faster algorithm for betweenness centrality*."
     Journal of mathematical sociology 25.2 (2001): 163-177.
@@ -46,73 +268,45 @@ def brandes_betweenness_centrality(graph, nodes=None, normalized=True, weight=No
     :type endpoints:   :py:bool
     :param weight:     edge attribute to use as edge weight
     :type weight:      string
+    :param processes:  number of worker processes. Serial calculation if
+                       None or 1.
+    :type processes:   :py:int
+    :param k:          number of pivot source nodes to sample for
+                       approximate betweenness. Exact if None.
+    :type k:           :py:int
+    :param seed:       random number generator seed for pivot sampling
+    :type seed:        :py:int
 
     :rtype:            :py:dict
     """
 
-    betweenness = dict.fromkeys(graph.nodes, 0.0)
-
-    nodes = nodes or graph.nodes
-    for node in nodes:
-        path = []
-        path_node_count = {}
-        p = dict([(n, []) for n in graph.nodes])
-        sigma = dict.fromkeys(graph.nodes, 0.0)
-        sigma[node] = 1.0
-
-        # Weight is None, use breath-first-search
-        if weight is None:
-            path_node_count[node] = 0
-            queue = [node]
-            while queue:
-                next_node = queue.pop(0)
-                path.append(next_node)
-                dv = path_node_count[next_node]
-                for w in graph.adjacency[next_node]:
-                    if w not in path_node_count:
-                        queue.append(w)
-                        path_node_count[w] = dv + 1
-                    if path_node_count[w] == dv + 1:
-                        sigma[w] += sigma[next_node]
-                        p[w].append(next_node)
-
-        # If weight, use Dijkstra shortest path
-        else:
-            adj = graph.adjacency()
-            seen = {node: 0}
-            c = count()
-            queue = []
-            heapq.heappush(queue, (0, next(c), node, node))
-            while queue:
-                (dist, _, pred, v) = heapq.heappop(queue)
-                if v in path_node_count:
-                    continue  # already searched this node.
-                sigma[v] += sigma[pred]  # count paths
-                path.append(v)
-                path_node_count[v] = dist
-                for w in adj[v]:
-                    vw_dist = dist + graph.edges[(v, w)].get(weight, 1)
-                    if w not in path_node_count and (w not in seen or vw_dist < seen[w]):
-                        seen[w] = vw_dist
-                        heapq.heappush(queue, (vw_dist, next(c), v, w))
-                        sigma[w] = 0.0
-                        p[w] = [v]
-                    elif vw_dist == seen[w]:  # handle equal paths
-                        sigma[w] += sigma[v]
-                        p[w].append(v)
-
-        # accumulation
-        delta = dict.fromkeys(path, 0)
-        correction = 1 if endpoints else 0
-        if endpoints:
-            betweenness[node] += len(path) - correction
-        while path:
-            w = path.pop()
-            coeff = (1 + delta[w]) / sigma[w]
-            for v in p[w]:
-                delta[v] += sigma[v] * coeff
-            if w != node:
-                betweenness[w] += delta[w] + correction
+    if k is not None and k < 1:
+        raise GraphitAlgorithmError('Number of pivot nodes should be 1 or larger, got: {0}'.format(k))
+
+    node_ids, adjacency, weights = _adjacency_snapshot(graph, weight=weight)
+    index = dict((nid, i) for i, nid in enumerate(node_ids))
+    sources = [index[node] for node in (nodes or graph.nodes)]
+
+    # Sample pivot source nodes for approximate betweenness
+    sample_scale = None
+    if k is not None and k < len(sources):
+        sample_scale = len(sources) / float(k)
+        sources = random.Random(seed).sample(sources, k)
+
+    if processes is not None and processes > 1 and ProcessPoolExecutor is None:
+        logger.warning('Parallel betweenness centrality requires the "concurrent.futures" module. Running serial')
+        processes = None
+
+    if processes is not None and processes > 1 and len(sources) > 1:
+        chunks = [sources[i::processes] for i in range(min(processes, len(sources)))]
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            futures = [executor.submit(_brandes_partial, adjacency, weights, chunk, endpoints) for chunk in chunks]
+            partials = [future.result() for future in futures]
+        betweenness = [sum(values) for values in zip(*partials)]
+    else:
+        betweenness = _brandes_partial(adjacency, weights, sources, endpoints=endpoints)
+
+    betweenness = dict(zip(node_ids, betweenness))
 
     # Rescale betweenness values
     nr_nodes = float(len(graph))
@@ -126,6 +320,9 @@ def brandes_betweenness_centrality(graph, nodes=None, normalized=True, weight=No
     else:
         scale = None if graph.directed else 0.5
 
+    if sample_scale is not None:
+        scale = sample_scale if scale is None else scale * sample_scale
+
     if scale is not None:
         for v in betweenness:
             betweenness[v] *= scale
@@ -133,7 +330,7 @@ def brandes_betweenness_centrality(graph, nodes=None, normalized=True, weight=No
     return betweenness
 
 
-def eigenvector_centrality(graph, max_iter=100, tolerance=1.0e-6, weight=None, start_value=None):
+def eigenvector_centrality(graph, max_iter=100, tolerance=1.0e-6, weight=None, start_value=None, sparse=False):
     """
     Eigenvector centrality for nodes in the graph (like Google's PageRank).
 
@@ -149,6 +346,10 @@ def eigenvector_centrality(graph, max_iter=100, tolerance=1.0e-6, weight=None, s
     You can adjust the importance of a node with the rating dictionary,
     which links node id's to a score.
 
+    If `sparse` is True, the weighted adjacency matrix is build once as
+    SciPy sparse matrix and every iteration is performed as sparse
+    matrix-vector product. This requires the numpy and scipy packages.
+
     The algorithm is adapted from NetworkX, Aric Hagberg (hagberg@lanl.gov):
     https://networkx.lanl.gov/attachment/ticket/119/eigenvector_centrality.py
 
@@ -162,6 +363,8 @@ def eigenvector_centrality(graph, max_iter=100, tolerance=1.0e-6, weight=None, s
     :type tolerance:    :py:float
     :param start_value: starting value of eigenvector iteration for each node
     :type start_value:  :py:dict
+    :param sparse:      use sparse matrix power iteration
+    :type sparse:       :py:bool
 
     :return:            eigenvector centrality for each node in the graph
     :rtype:             :py:dict
@@ -182,6 +385,24 @@ def eigenvector_centrality(graph, max_iter=100, tolerance=1.0e-6, weight=None, s
     vector = {node: float(eigen_value) / start_values_sum for node, eigen_value in start_value.items()}
 
     nnodes = len(graph.nodes)
+    if sparse:
+        node_ids, matrix = _sparse_adjacency_matrix(graph, weight=weight)
+
+        # Perform y^T = x^T A (left eigenvector) as (I + A^T) x
+        matrix = (matrix.T + scipy.sparse.identity(nnodes, format='csr')).tocsr()
+        x = numpy.array([vector.get(node, 0.0) for node in node_ids], dtype=numpy.float64)
+        for i in range(max_iter):
+            previous_x = x
+            x = matrix.dot(previous_x)
+
+            norm = numpy.sqrt(x.dot(x)) or 1
+            x /= norm
+
+            if numpy.abs(x - previous_x).sum() < nnodes * tolerance:
+                return dict(zip(node_ids, x.tolist()))
+
+        raise GraphitAlgorithmError('Unable to convergen in {0} iterations'.format(max_iter))
+
     for i in range(max_iter):
         previous_vector = vector
         vector = previous_vector.copy()
@@ -201,3 +422,76 @@ def eigenvector_centrality(graph, max_iter=100, tolerance=1.0e-6, weight=None, s
             return vector
 
     raise GraphitAlgorithmError('Unable to convergen in {0} iterations'.format(max_iter))
+
+
+def pagerank(graph, damping=0.85, personalization=None, max_iter=100, tolerance=1.0e-6, weight=None):
+    """
+    PageRank of the nodes in the graph
+
+    PageRank ranks nodes by the stationary distribution of a random walk
+    following the (weighted) edges of the graph. With probability
+    1 - `damping` the walk jumps to a random node chosen according to the
+    personalization vector, uniform if not defined. Nodes without outgoing
+    edges (dangling nodes) distribute their rank according to the same
+    vector.
+
+    The weighted adjacency matrix is build once as SciPy sparse matrix and
+    the power iteration is performed as sparse matrix-vector products.
+    Requires the numpy and scipy packages.
+
+    Original publication:
+    Page, Lawrence et al. "The PageRank citation ranking: Bringing order to
+    the web." Stanford InfoLab (1999).
+
+    :param graph:           Graph to calculate PageRank for
+    :type graph:            :graphit:Graph
+    :param damping:         probability to follow an edge in every step
+    :type damping:          :py:float
+    :param personalization: random jump probability for nodes. Nodes not
+                            defined have zero probability.
+    :type personalization:  :py:dict
+    :param max_iter:        maximum number of iterations to reach convergance
+    :type max_iter:         :py:int
+    :param tolerance:       iteration convergence criterion
+    :type tolerance:        :py:float
+    :param weight:          edge attribute to use as weight. 1 if not defined
+    :type weight:           string
+
+    :return:                PageRank for each node in the graph summing to 1
+    :rtype:                 :py:dict
+    """
+
+    if len(graph) == 0:
+        raise GraphitAlgorithmError('Cannot compute PageRank for graph without nodes')
+
+    if not 0 <= damping <= 1:
+        raise GraphitAlgorithmError('Damping factor should be between 0 and 1, got: {0}'.format(damping))
+
+    node_ids, matrix = _sparse_adjacency_matrix(graph, weight=weight)
+    nnodes = len(node_ids)
+
+    # Personalization vector used for random jumps and dangling nodes
+    if personalization is None:
+        jump = numpy.full(nnodes, 1.0 / nnodes)
+    else:
+        jump = numpy.array([personalization.get(node, 0) for node in node_ids], dtype=numpy.float64)
+        if jump.sum() <= 0:
+            raise GraphitAlgorithmError('Personalization vector cannot have all zero values')
+        jump /= jump.sum()
+
+    # Transpose of the row normalized adjacency matrix
+    out_weight = numpy.asarray(matrix.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    out_weight[dangling] = 1
+    transition = (scipy.sparse.diags(1.0 / out_weight) * matrix).T.tocsr()
+
+    x = numpy.full(nnodes, 1.0 / nnodes)
+    for i in range(max_iter):
+        previous_x = x
+        x = damping * (transition.dot(previous_x) + previous_x[dangling].sum() * jump) + (1 - damping) * jump
+
+        # Check for convergence (in the L_1 norm).
+        if numpy.abs(x - previous_x).sum() < nnodes * tolerance:
+            return dict(zip(node_ids, x.tolist()))
+
+    raise GraphitAlgorithmError('Unable to convergen in {0} iterations'.format(max_iter))
@@ -11,7 +11,7 @@ Functions for calculating node connectivity.
 import logging
 
 from graphit import __module__
-from graphit.graph_algorithms.shortest_path import dijkstra_shortest_path
+from graphit.graph_algorithms.shortest_path import single_source_shortest_path
 
 logger = logging.getLogger(__module__)
 
@@ -71,8 +71,8 @@ def is_reachable(graph, root, destination):
     """
 
     if root in graph.nodes and destination in graph.nodes:
-        connected_path = dijkstra_shortest_path(graph, root, destination)
-        return destination in connected_path
+        distances, predecessors = single_source_shortest_path(graph, root, targets=[destination])
+        return destination in distances
     else:
         logger.error('Root or destination nodes not in graph')
 
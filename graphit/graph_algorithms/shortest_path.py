@@ -8,6 +8,7 @@
 Functions for calculating the shortest paths in a graph.
 """
 
+import itertools
 import logging
 import heapq
 
@@ -15,7 +16,136 @@ from graphit import __module__
 
 logger = logging.getLogger(__module__)
 
-__all__ = ['dijkstra_shortest_path']
+__all__ = ['astar_shortest_path', 'bidirectional_shortest_path', 'dijkstra_shortest_path', 'predecessor_path',
+           'single_source_shortest_path']
+
+
+def predecessor_path(predecessors, target):
+    """
+    Return the path from the source node to the target node from the
+    predecessor map returned by `single_source_shortest_path`
+
+    :param predecessors:    predecessor of every reached node, None for the
+                            source node
+    :type predecessors:     :py:dict
+    :param target:          target node
+
+    :return:                path from source to target or empty list if the
+                            target was not reached
+    :rtype:                 :py:list
+    """
+
+    path = []
+    if target in predecessors:
+        while target is not None:
+            path.append(target)
+            target = predecessors[target]
+
+    return path[::-1]
+
+
+def single_source_shortest_path(graph, source, targets=None, weight=None, adjacency=None):
+    """
+    Shortest path distances and predecessors from a source node to all nodes
+    reachable from it.
+
+    Uses breadth first search if no `weight` attribute is defined and
+    Dijkstra's algorithm with a binary heap otherwise. The `weight` attribute
+    defaults to 1 for edges not having it.
+    If a node can be reached via multiple shortest paths, the predecessor with
+    the lowest node ID is used.
+
+    The search stops as soon as the distances to all nodes in `targets` are
+    known. Distances and predecessors of other nodes are then incomplete.
+
+    :param graph:       graph to search
+    :type graph:        graph class instance
+    :param source:      node to start the search from
+    :param targets:     stop the search when these nodes are reached
+    :type targets:      :py:list
+    :param weight:      edge attribute to use as edge weight
+    :type weight:       :py:str
+    :param adjacency:   adjacency of the graph, build from the graph by
+                        default
+    :type adjacency:    :py:dict
+
+    :return:            distance of every reached node to the source and its
+                        predecessor on the shortest path (None for source)
+    :rtype:             :py:tuple of :py:dict
+    """
+
+    adj = adjacency if adjacency is not None else graph.adjacency()
+
+    remaining = None
+    if targets is not None:
+        remaining = set(targets)
+        remaining.discard(source)
+
+    distances = {source: 0}
+    predecessors = {source: None}
+
+    # Breadth first search
+    if weight is None:
+        level = [source]
+        while level and remaining != set():
+            next_level = []
+            for node in level:
+                distance = distances[node] + 1
+                for neighbour in adj.get(node, ()):
+                    if neighbour not in distances:
+                        distances[neighbour] = distance
+                        predecessors[neighbour] = node
+                        next_level.append(neighbour)
+                    elif distances[neighbour] == distance:
+                        try:
+                            if node < predecessors[neighbour]:
+                                predecessors[neighbour] = node
+                        except TypeError:
+                            pass
+
+            if remaining is not None:
+                remaining.difference_update(next_level)
+            level = next_level
+
+        return distances, predecessors
+
+    # Dijkstra
+    visited = set()
+    queue = [(0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if node in visited:
+            continue
+
+        visited.add(node)
+        if remaining is not None:
+            remaining.discard(node)
+            if not remaining:
+                break
+
+        for neighbour in adj.get(node, ()):
+            if neighbour in visited:
+                continue
+
+            cost = distance + graph.edges[(node, neighbour)].get(weight, 1)
+            if neighbour not in distances or cost < distances[neighbour]:
+                distances[neighbour] = cost
+                predecessors[neighbour] = node
+                heapq.heappush(queue, (cost, neighbour))
+            elif cost == distances[neighbour]:
+                try:
+                    if node < predecessors[neighbour]:
+                        predecessors[neighbour] = node
+                except TypeError:
+                    pass
+
+    # Discard tentative distances of nodes not reached before termination
+    for node in list(distances):
+        if node not in visited:
+            del distances[node]
+            del predecessors[node]
+
+    return distances, predecessors
 
 
 def dijkstra_shortest_path(graph, start, goal=None, weight=None):
@@ -27,8 +157,14 @@ def dijkstra_shortest_path(graph, start, goal=None, weight=None):
     The `weight` attribute defined the edge data attribute to use as
     weight which defaults to 1 if not defined or not found.
 
-    If the target node is not specified, the path search will continue untill
-    the leaf node(s) are reached.
+    If the target node is not specified, the path to the node furthest away
+    from the start node is returned. That is the node settled last by the
+    search: the one with the highest node ID among the nodes at the largest
+    distance. For a start node without neighbours the path is [start].
+
+    The path is resolved using `single_source_shortest_path`. Use that
+    function directly to obtain the paths to multiple target nodes in one
+    search.
 
     Original publication:
     Dijkstra, E. W. (1959). "A note on two problems in connexion with graphs"
@@ -46,32 +182,192 @@ def dijkstra_shortest_path(graph, start, goal=None, weight=None):
     :rtype:           :py:list
     """
 
-    adj = graph.adjacency()
-
-    # Flatten linked list of form [0,[1,[2,[]]]]
-    def flatten(linked_list):
-        while len(linked_list) > 0:
-            yield linked_list[0]
-            linked_list = linked_list[1]
-
-    queue = [(0, start, ())]
-    visited_nodes = []
-    path = None
-    while len(queue):
-        (cost1, node1, path) = heapq.heappop(queue)
-        if node1 not in visited_nodes:
-            visited_nodes.append(node1)
-        if node1 == goal:
-            return list(flatten(path))[::-1] + [node1]
-        path = (node1, path)
-        for node2 in adj[node1]:
-            if node2 not in visited_nodes:
-                cost2 = 1
-                if weight is not None:
-                    cost2 = graph.edges[(node1, node2)].get(weight, 1)
-                heapq.heappush(queue, (cost1 + cost2, node2, path))
-
-    # Without a goal node continue search up to leaf node
-    if not goal and path:
-        return list(flatten(path))[::-1]
+    targets = [goal] if goal is not None else None
+    distances, predecessors = single_source_shortest_path(graph, start, targets=targets, weight=weight)
+
+    # Without goal, the last node settled by the search ordering nodes on
+    # (distance, node ID) as the priority queue does.
+    if goal is None:
+        try:
+            goal = max(distances, key=lambda node: (distances[node], node))
+        except TypeError:
+            goal = max(distances, key=distances.get)
+
+    return predecessor_path(predecessors, goal)
+
+
+def _edge_weight(graph, edge, weight):
+    """
+    Return the weight of an edge or 1 if `weight` is None or the edge does
+    not have the weight attribute.
+    """
+
+    if weight is None:
+        return 1
+    return graph.edges[edge].get(weight, 1)
+
+
+def astar_shortest_path(graph, start, goal, heuristic=None, weight=None):
+    """
+    A* algorithm for finding the shortest path between two nodes.
+
+    A* extends Dijkstra's algorithm with a heuristic estimating the cost of
+    the path from a node to the goal node. Nodes are explored in order of the
+    cost from the start node plus the heuristic cost. The path returned is a
+    shortest path as long as the heuristic never overestimates the actual
+    cost (admissible). Explored nodes are explored again when a cheaper path
+    to them is found later on, which only happens if the heuristic is not
+    consistent. Without heuristic the search equals Dijkstra's algorithm that
+    stops at the goal node.
+
+    Neighbours are resolved per explored node from the graph adjacency
+    following directed edges.
+
+    Original publication:
+    Hart, P. E., Nilsson, N. J., Raphael, B. (1968). "A Formal Basis for the
+    Heuristic Determination of Minimum Cost Paths". IEEE Transactions on
+    Systems Science and Cybernetics 4 (2): 100–107. doi:10.1109/TSSC.1968.300136
+
+    :param graph:       graph to search
+    :type graph:        graph class instance
+    :param start:       node to start the search from
+    :param goal:        target node
+    :param heuristic:   function taking a node and the goal node and
+                        returning the estimated cost of the path between them
+    :type heuristic:    :py:func
+    :param weight:      edge attribute to use as edge weight, defaults to 1
+                        if not defined or not found
+    :type weight:       :py:str
+
+    :return:            shortest path or empty list if goal is not reachable
+    :rtype:             :py:list
+    """
+
+    if start not in graph.nodes or goal not in graph.nodes:
+        return []
+
+    heuristic = heuristic or (lambda node, target: 0)
+    counter = itertools.count()
+
+    distances = {start: 0}
+    predecessors = {start: None}
+    queue = [(heuristic(start, goal), next(counter), 0, start)]
+    while queue:
+        _, _, distance, node = heapq.heappop(queue)
+        if node == goal:
+            return predecessor_path(predecessors, goal)
+
+        # Skip queue entries superseded by a cheaper path to the node
+        if distance > distances[node]:
+            continue
+
+        for neighbour in graph.adjacency[node]:
+            cost = distance + _edge_weight(graph, (node, neighbour), weight)
+            if neighbour not in distances or cost < distances[neighbour]:
+                distances[neighbour] = cost
+                predecessors[neighbour] = node
+                heapq.heappush(queue, (cost + heuristic(neighbour, goal), next(counter), cost, neighbour))
+
     return []
+
+
+def bidirectional_shortest_path(graph, start, goal, weight=None):
+    """
+    Bidirectional search for the shortest path between two nodes.
+
+    Searches forward from the start node and backward from the goal node
+    until both searches meet. Uses breadth first search if no `weight`
+    attribute is defined and Dijkstra's algorithm otherwise. The backward
+    search follows directed edges in reverse using the node predecessors.
+    Compared to a search from the start node only, far less nodes are
+    explored for distant nodes.
+
+    If multiple shortest paths exist, any one of them is returned.
+
+    :param graph:       graph to search
+    :type graph:        graph class instance
+    :param start:       node to start the search from
+    :param goal:        target node
+    :param weight:      edge attribute to use as edge weight, defaults to 1
+                        if not defined or not found
+    :type weight:       :py:str
+
+    :return:            shortest path or empty list if goal is not reachable
+    :rtype:             :py:list
+    """
+
+    if start not in graph.nodes or goal not in graph.nodes:
+        return []
+    if start == goal:
+        return [start]
+
+    adjacency = graph.adjacency
+    neighbours = (lambda node: adjacency[node], adjacency.predecessors)
+    edges = (lambda node, neighbour: (node, neighbour), lambda node, neighbour: (neighbour, node))
+
+    # Predecessors in the forward and successors in the backward search
+    trees = ({start: None}, {goal: None})
+
+    def join(node):
+        path = predecessor_path(trees[0], node)
+        node = trees[1][node]
+        while node is not None:
+            path.append(node)
+            node = trees[1][node]
+        return path
+
+    # Breadth first search expanding the smallest level
+    if weight is None:
+        levels = [[start], [goal]]
+        while levels[0] and levels[1]:
+            direction = 0 if len(levels[0]) <= len(levels[1]) else 1
+            tree, other = trees[direction], trees[1 - direction]
+
+            next_level = []
+            for node in levels[direction]:
+                for neighbour in neighbours[direction](node):
+                    if neighbour not in tree:
+                        tree[neighbour] = node
+                        next_level.append(neighbour)
+                    if neighbour in other:
+                        return join(neighbour)
+            levels[direction] = next_level
+
+        return []
+
+    # Dijkstra alternating between both directions
+    counter = itertools.count()
+    distances = ({start: 0}, {goal: 0})
+    visited = (set(), set())
+    queues = ([(0, next(counter), start)], [(0, next(counter), goal)])
+
+    best = None
+    meet = None
+    direction = 1
+    while queues[0] and queues[1]:
+        direction = 1 - direction
+        distance, _, node = heapq.heappop(queues[direction])
+        if node in visited[direction]:
+            continue
+
+        # Shortest path found when a node is final in both directions
+        if node in visited[1 - direction]:
+            break
+        visited[direction].add(node)
+
+        for neighbour in neighbours[direction](node):
+            cost = distance + _edge_weight(graph, edges[direction](node, neighbour), weight)
+            dist = distances[direction]
+            if neighbour not in dist or cost < dist[neighbour]:
+                dist[neighbour] = cost
+                trees[direction][neighbour] = node
+                heapq.heappush(queues[direction], (cost, next(counter), neighbour))
+
+                if neighbour in distances[1 - direction]:
+                    total = cost + distances[1 - direction][neighbour]
+                    if best is None or total < best:
+                        best, meet = total, neighbour
+
+    if meet is None:
+        return []
+    return join(meet)
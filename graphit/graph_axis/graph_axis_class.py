@@ -12,7 +12,7 @@ from graphit.graph_combinatorial.graph_update_operations import graph_axis_updat
 from graphit.graph_exceptions import GraphitException
 from graphit.graph_query.query_xpath import XpathExpressionEvaluator
 from graphit.graph_axis.graph_axis_methods import (node_ancestors, node_children, node_descendants, node_neighbors,
-    node_parent, node_all_parents, node_siblings, node_leaves)
+    node_parent, node_all_parents, node_siblings, node_leaves, node_is_ancestor)
 
 __all__ = ['GraphAxis']
 
@@ -180,6 +180,27 @@ class GraphAxis(GraphBase):
 
         return self.getnodes(nds, add_node_tools=False)
 
+    def is_ancestor(self, ancestor, node=None):
+        """
+        Check if a node is an ancestor of the source node
+
+        An ancestor is a node on the shortest path between the root node and
+        the source node as returned by the `ancestors` method.
+
+        :param ancestor:     potential ancestor node
+        :type ancestor:      :py:int, :py:str
+        :param node:         source node to check ancestor for
+        :type node:          :py:int, :py:str
+
+        :rtype:              :py:bool
+        """
+
+        nid = node or self._resolve_nid()
+        if self.masked and ancestor not in self.nodes:
+            return False
+
+        return node_is_ancestor(self.origin, ancestor, nid, self.root)
+
     def leaves(self, return_nids=False, include_root=False, include_isolated=False):
         """
         Return all leaf nodes in the (sub)graph
@@ -348,20 +369,27 @@ class GraphAxis(GraphBase):
             return sorted(nsb)
         return self.getnodes(nsb, add_node_tools=False)
 
-    def xpath(self, expression, sep='/'):
+    def xpath(self, expression, sep='/', nid_sets=False):
         """
         Evaluate XPath expression against graph
 
-        :param expression: XPath axpression
-        :type expression:  :py:str
+        Parsed expressions are cached by the XpathExpressionEvaluator. A
+        query plan compiled using `XpathExpressionEvaluator.compile` may be
+        used instead of the expression string.
+
+        :param expression: XPath axpression or compiled query plan
+        :type expression:  :py:str or XpathQueryPlan
         :param sep:        XPath path location seperator
         :type sep:         :py:str
+        :param nid_sets:   evaluate path steps on node ID's instead of
+                           intermediate sub graphs
+        :type nid_sets:    :py:bool
 
         :rtype:            :graphit:GraphAxis
         """
 
         xpath = XpathExpressionEvaluator(sep=sep)
-        return xpath.resolve(expression, self)
+        return xpath.resolve(expression, self, nid_sets=nid_sets)
 
     # DICTIONARY LIKE NODE ACCESS
     def items(self, keystring=None, valuestring=None, desc=True):
@@ -389,7 +417,9 @@ class GraphAxis(GraphBase):
         if desc:
             return [(n.get(keystring), n.get(valuestring)) if n.isleaf else (n.get(keystring), n)
                     for n in self.iternodes()]
-        return [(n.get(keystring), n.get(valuestring)) for n in self.iternodes()]
+
+        cursor = self._node_cursor_compatible()
+        return [(n.get(keystring), n.get(valuestring)) for n in self.iternodes(cursor=cursor)]
 
     def keys(self, keystring=None, desc=False):
         """
@@ -410,7 +440,9 @@ class GraphAxis(GraphBase):
 
         if desc:
             return [n.get(keystring) if n.isleaf else n for n in self.iternodes()]
-        return [n.get(keystring) for n in self.iternodes()]
+
+        cursor = self._node_cursor_compatible()
+        return [n.get(keystring) for n in self.iternodes(cursor=cursor)]
 
     def values(self, valuestring=None, desc=True):
         """
@@ -431,7 +463,9 @@ class GraphAxis(GraphBase):
 
         if desc:
             return [n.get(valuestring) if n.isleaf else n for n in self.iternodes()]
-        return [n.get(valuestring) for n in self.iternodes()]
+
+        cursor = self._node_cursor_compatible()
+        return [n.get(valuestring) for n in self.iternodes(cursor=cursor)]
 
     def update(self, data):
         """
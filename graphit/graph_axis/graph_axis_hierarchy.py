@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+file: graph_axis_hierarchy.py
+
+Hierarchy index of a graph relative to a root node.
+
+The axis methods define the parent and ancestors of a node using the
+Dijkstra shortest path from the root node to that node. The hierarchy index
+stores the result for all nodes at once by a single breadth first search
+from the root: the parent and depth of every node reachable from the root.
+
+The parent pointers define a tree that is labeled on first use with the
+interval of its pre-order traversal covered by every node and its
+descendants. This allows constant time ancestor checks and returns the
+descendants of a node from a slice of the traversal order. If the graph
+itself is a tree relative to the root, these descendants equal the ones
+found by walking the graph (`node_descendants` function) in the same order.
+
+Indexes are cached per root in the adjacency cache of the edge storage
+(see `adjacency_cache` method of the storage drivers) and are rebuilt after
+edges are added or removed.
+"""
+
+from graphit.graph_algorithms.shortest_path import predecessor_path, single_source_shortest_path
+
+__all__ = ['HierarchyIndex', 'node_hierarchy']
+
+# Maximum number of root nodes to cache a hierarchy index for
+MAX_CACHED_ROOTS = 16
+
+
+class HierarchyIndex(object):
+    """
+    Parent and depth of all nodes reachable from a root node
+
+    Build using breadth first search over the adjacency of the graph
+    (`single_source_shortest_path` function). If a node can be reached via
+    multiple parents at the same depth the one with the lowest node ID is
+    used. This equals the parent in the path returned by the
+    `dijkstra_shortest_path` function without edge weights.
+    """
+
+    __slots__ = ('root', 'parent', 'depth', 'is_tree', '_order', '_start', '_end')
+
+    def __init__(self, graph, root):
+        """
+        Implement class __init__
+
+        :param graph:       Graph to build the index for
+        :type graph:        Graph class instance
+        :param root:        root node
+        """
+
+        adjacency = graph.adjacency()
+
+        self.root = root
+        self.depth, self.parent = single_source_shortest_path(graph, root, adjacency=adjacency)
+
+        # The graph is a tree relative to the root if all edges between
+        # reachable nodes connect a parent and child.
+        self.is_tree = all(self.parent[child] == node or self.parent[node] == child
+                           for node in self.depth for child in adjacency.get(node, ()))
+
+        self._order = None
+        self._start = None
+        self._end = None
+
+    def __contains__(self, nid):
+        """
+        Check if node is reachable from the root node
+
+        :rtype: :py:bool
+        """
+
+        return nid in self.depth
+
+    def _label(self):
+        """
+        Label the nodes with the start and end of the interval in the
+        pre-order traversal of the tree covering the node and its descendants
+        """
+
+        children = {}
+        for nid, parent in self.parent.items():
+            if parent is not None:
+                children.setdefault(parent, []).append(nid)
+
+        for nids in children.values():
+            try:
+                nids.sort()
+            except TypeError:
+                pass
+
+        self._order = []
+        self._start = {}
+        self._end = {}
+
+        stack = [(self.root, False)]
+        while stack:
+            nid, visited = stack.pop()
+            if visited:
+                self._end[nid] = len(self._order)
+                continue
+
+            self._start[nid] = len(self._order)
+            self._order.append(nid)
+            stack.append((nid, True))
+            stack.extend((child, False) for child in reversed(children.get(nid, [])))
+
+    def descendants(self, nid, include_self=False):
+        """
+        Return the descendants of the node in the tree defined by the parent
+        pointers.
+
+        The children of the node are returned first followed by the
+        descendants of every child in pre-order. For trees this equals the
+        order of the walk in the `node_descendants` function.
+
+        :param nid:             node to return descendants for
+        :param include_self:    include nid in results
+        :type include_self:     :py:bool
+
+        :return:                descendant node ID's or empty list if the
+                                node is not reachable from the root.
+        :rtype:                 :py:list
+        """
+
+        if nid not in self.depth:
+            return []
+
+        if self._order is None:
+            self._label()
+
+        descendants = self._order[self._start[nid] + 1:self._end[nid]]
+        depth = self.depth[nid] + 1
+        descendants = [n for n in descendants if self.depth[n] == depth] + \
+                      [n for n in descendants if self.depth[n] > depth]
+
+        if include_self:
+            descendants.insert(0, nid)
+
+        return descendants
+
+    def is_ancestor(self, ancestor, nid):
+        """
+        Check if a node is an ancestor of another node
+
+        :param ancestor:    potential ancestor node
+        :param nid:         node to check ancestor for
+
+        :rtype:             :py:bool
+        """
+
+        if ancestor == nid or ancestor not in self.depth or nid not in self.depth:
+            return False
+
+        if self._order is None:
+            self._label()
+
+        return self._start[ancestor] < self._start[nid] < self._end[ancestor]
+
+    def path(self, nid):
+        """
+        Return the path from the root node to the node
+
+        :param nid: node to return the path for
+
+        :return:    node ID's from root to nid or empty list if the node is
+                    not reachable from the root.
+        :rtype:     :py:list
+        """
+
+        return predecessor_path(self.parent, nid)
+
+
+def node_hierarchy(graph, root):
+    """
+    Return the hierarchy index of the graph relative to the root node
+
+    The index is only available for graphs without a node or edge view using
+    a storage driver supporting an adjacency cache.
+
+    :param graph:   Graph to return the index for
+    :type graph:    Graph class instance
+    :param root:    root node
+    :type root:     :py:int, :py:str
+
+    :return:        hierarchy index or None if not available
+    :rtype:         :graphit:graph_axis:HierarchyIndex
+    """
+
+    if graph.nodes.is_view or graph.edges.is_view:
+        return None
+
+    cache = graph.edges.adjacency_cache()
+    if cache is None:
+        return None
+
+    hierarchies = cache.setdefault('hierarchy', {})
+    index = hierarchies.get(root)
+    if index is None:
+        if len(hierarchies) >= MAX_CACHED_ROOTS:
+            hierarchies.clear()
+        index = hierarchies[root] = HierarchyIndex(graph, root)
+
+    return index
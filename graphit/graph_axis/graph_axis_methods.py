@@ -16,11 +16,13 @@ from itertools import combinations
 
 from graphit.graph_algorithms import node_neighbors
 from graphit.graph_algorithms.path_traversal import dfs_paths
-from graphit.graph_algorithms.shortest_path import dijkstra_shortest_path
+from graphit.graph_algorithms.shortest_path import (dijkstra_shortest_path, predecessor_path,
+                                                    single_source_shortest_path)
+from graphit.graph_axis.graph_axis_hierarchy import node_hierarchy
 from graphit.graph_helpers import edge_list_to_adjacency
 
 __all__ = ['closest_to', 'node_neighbors', 'node_all_parents', 'node_ancestors', 'node_children',
-           'node_descendants', 'node_leaves', 'node_parent', 'node_siblings']
+           'node_descendants', 'node_is_ancestor', 'node_leaves', 'node_parent', 'node_siblings']
 
 
 def closest_to(graph, source, target):
@@ -47,10 +49,12 @@ def closest_to(graph, source, target):
     if len(target) == 1:
         return target
 
+    # Shortest paths to all targets from a single search
+    distances, predecessors = single_source_shortest_path(graph.origin, source, targets=target)
+
     shortest = {}
     for nid in sorted(target):
-        path = dijkstra_shortest_path(graph.origin, source, nid)
-        shortest[nid] = set(path)
+        shortest[nid] = set(predecessor_path(predecessors, nid))
 
     remove = []
     for comb in combinations(shortest.keys(), 2):
@@ -65,7 +69,8 @@ def node_ancestors(graph, nid, root, include_self=False):
     Return the ancestors of the source node
 
     Traversal path is determined as the shortest path between the root node
-    and the target node (Dijkstra shortest path).
+    and the target node (Dijkstra shortest path). The path is resolved from
+    the cached hierarchy index of the graph if available (`node_hierarchy`).
 
     This function always uses the full graph to return the ancestors.
     For masked graphs, check afterwards if the ancestors are in the graph
@@ -85,7 +90,11 @@ def node_ancestors(graph, nid, root, include_self=False):
     :rtype:              :py:list
     """
 
-    anc = dijkstra_shortest_path(graph.origin, root, nid)
+    hierarchy = node_hierarchy(graph.origin, root)
+    if hierarchy is not None:
+        anc = hierarchy.path(nid)
+    else:
+        anc = dijkstra_shortest_path(graph.origin, root, nid)
 
     if not include_self and nid in anc:
         anc.remove(nid)
@@ -141,6 +150,10 @@ def node_descendants(graph, nid, root, include_self=False):
     Directed graphs and/or masked behaviour: masked descendant linage's
     or linage's unreachable by directed edges are not returned.
 
+    If the graph is a tree relative to the root, the descendants are returned
+    from the interval labels of the cached hierarchy index (`node_hierarchy`)
+    without walking the graph, in the same order as the walk.
+
     :param graph:        Graph to perform calculation for
     :type graph:         Graph class instance
     :param nid:          source node to start search from
@@ -154,6 +167,10 @@ def node_descendants(graph, nid, root, include_self=False):
     :rtype:              :py:list
     """
 
+    hierarchy = node_hierarchy(graph, root)
+    if hierarchy is not None and hierarchy.is_tree and nid in hierarchy:
+        return hierarchy.descendants(nid, include_self=include_self)
+
     # Get nid child nodes to start descendants walk from
     # Add self to avoid backtracking during the walk
     start = node_children(graph, nid, root, include_self=True)
@@ -175,6 +192,33 @@ def node_descendants(graph, nid, root, include_self=False):
     return start
 
 
+def node_is_ancestor(graph, ancestor, nid, root):
+    """
+    Check if a node is an ancestor of the source node
+
+    An ancestor is a node on the shortest path between the root node and the
+    source node (see `node_ancestors`). The check takes constant time using
+    the interval labels of the cached hierarchy index if available.
+
+    :param graph:        Graph to perform calculation for
+    :type graph:         Graph class instance
+    :param ancestor:     potential ancestor node
+    :type ancestor:      :py:int, :py:str
+    :param nid:          source node
+    :type nid:           :py:int, :py:str
+    :param root:         root node for the search
+    :type root:          :py:int, :py:str
+
+    :rtype:              :py:bool
+    """
+
+    hierarchy = node_hierarchy(graph.origin, root)
+    if hierarchy is not None:
+        return hierarchy.is_ancestor(ancestor, nid)
+
+    return ancestor in node_ancestors(graph, nid, root)
+
+
 def node_leaves(graph, include_isolated=False):
     """
     Return all leaf nodes in the graph
@@ -219,7 +263,9 @@ def node_leaves(graph, include_isolated=False):
 def node_parent(graph, nid, root):
     """
     Get the parent node of the source node relative to the graph root
-    when following the shortest path (Dijkstra shortest path).
+    when following the shortest path (Dijkstra shortest path). The parent is
+    resolved from the cached hierarchy index of the graph if available
+    (`node_hierarchy`).
 
     This function always uses the full graph to return the parent.
     For masked graphs, check afterwards if the parent is in the graph
@@ -237,6 +283,10 @@ def node_parent(graph, nid, root):
     :rtype:        Graph object
     """
 
+    hierarchy = node_hierarchy(graph, root)
+    if hierarchy is not None:
+        return hierarchy.parent.get(nid)
+
     shortest_path = dijkstra_shortest_path(graph, root, nid)
     if len(shortest_path) > 1 and shortest_path[-1] == nid:
         return shortest_path[-2]
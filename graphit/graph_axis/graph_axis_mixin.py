@@ -8,6 +8,7 @@ NodeTools and EdgeTools classes for axis based graphs (GraphAxis class)
 
 from graphit.graph_mixin import NodeTools, EdgeTools
 from graphit.graph_algorithms.shortest_path import dijkstra_shortest_path
+from graphit.graph_axis.graph_axis_hierarchy import node_hierarchy
 
 __all__ = ['NodeAxisTools']
 
@@ -64,7 +65,11 @@ class NodeAxisTools(NodeTools):
 
         key = key or self.data.key_tag
 
-        shortest_path = dijkstra_shortest_path(self.origin, self.root, self.nid)
+        hierarchy = node_hierarchy(self.origin, self.root)
+        if hierarchy is not None:
+            shortest_path = hierarchy.path(self.nid)
+        else:
+            shortest_path = dijkstra_shortest_path(self.origin, self.root, self.nid)
         breadcrumbs = [str(self.origin.nodes[nid][key]) for nid in shortest_path]
 
         return sep.join(breadcrumbs)
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+"""
+file: graph_cursor.py
+
+Defines light weight node and edge cursor classes used for fast iteration over
+the nodes or edges in a graph.
+
+In contrast to the single node or edge Graph objects returned by the `getnodes`
+and `getedges` methods, a cursor is not built by the ORM and does not set up
+node and edge storage views. It offers the `nid` attribute and the `get` and
+`set` methods of the NodeTools and EdgeTools classes operating directly on the
+node or edge storage of the graph.
+"""
+
+import abc
+
+from graphit.graph_py2to3 import to_unicode
+
+__all__ = ['NodeCursor', 'EdgeCursor']
+
+
+class CursorBaseClass(object):
+    """
+    Abstract base class for node and edge cursors
+    """
+    __metaclass__ = abc.ABCMeta
+
+    __slots__ = ('graph', 'nid')
+
+    def __init__(self, graph, nid):
+        """
+        Implement class __init__
+
+        :param graph: graph the node or edge is part of
+        :type graph:  :graphit:Graph
+        :param nid:   node or edge ID
+        :type nid:    mixed
+        """
+
+        self.graph = graph
+        self.nid = nid
+
+    def __call__(self):
+        """
+        Implement class __call__
+
+        :return: default value using value_tag
+        """
+
+        return self.get()
+
+    def __contains__(self, key):
+        """
+        Check if node/edge dictionary contains key
+
+        :param key: key to check
+
+        :rtype:     :py:bool
+        """
+
+        return key in self.attributes
+
+    def __eq__(self, other):
+        """
+        Implement class __eq__
+
+        Cursors are equal when they point to the same node or edge in the
+        same graph.
+
+        :rtype: :py:bool
+        """
+
+        if not isinstance(other, type(self)):
+            return False
+
+        return self.graph is other.graph and self.nid == other.nid
+
+    def __getattr__(self, key):
+        """
+        Implement class __getattr__
+
+        Expose node or edge dictionary keys as class attributes.
+
+        :param key: attribute name
+        :return:    attribute value
+        """
+
+        if key in ('graph', 'nid') or key.startswith('__'):
+            raise AttributeError(key)
+
+        value = self.get(key=key, default='_Graph_no_key__')
+        if value == '_Graph_no_key__':
+            raise AttributeError('No such node or edge attribute: {0}'.format(key))
+
+        return value
+
+    def __getitem__(self, key):
+        """
+        Implement class __getitem__
+
+        :param key: attribute name
+        :return:    attribute value
+        """
+
+        value = self.get(key=key, default='_Graph_no_key__')
+        if value == '_Graph_no_key__':
+            raise KeyError('No such node or edge attribute: {0}'.format(key))
+
+        return value
+
+    def __hash__(self):
+        """
+        Implement class __hash__
+
+        :rtype: :py:int
+        """
+
+        return hash((id(self.graph), self.nid))
+
+    def __ne__(self, other):
+        """
+        Implement class __ne__
+
+        :rtype: :py:bool
+        """
+
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        """
+        Implement class __repr__
+
+        :rtype: :py:str
+        """
+
+        return '<{0} {1}: {2}>'.format(type(self).__name__, repr(self.nid), repr(self.get(self.graph.data.key_tag)))
+
+    def __setitem__(self, key, value):
+        """
+        Implement class __setitem__
+
+        :param key:   attribute name
+        :param value: attribute value
+        """
+
+        self.set(key, value)
+
+    @property
+    def attributes(self):
+        """
+        Return the node or edge attribute dictionary
+
+        :rtype: :py:dict
+        """
+
+        return self._storage()[self.nid]
+
+    @abc.abstractmethod
+    def _storage(self):
+        """
+        Return the node or edge storage of the graph
+        """
+
+        return
+
+    def get(self, key=None, default=None, defaultattr=None):
+        """
+        Return node or edge value
+
+        Equivalent to the `get` method of the NodeTools and EdgeTools classes.
+        If `key` is not defined the method returns the value of the default
+        value_tag.
+
+        :param key:         node or edge value attribute name. If not defined
+                            then attempt to use class wide `value_tag`
+                            attribute.
+        :type key:          mixed
+        :param defaultattr: node or edge value attribute to use as source of
+                            default data when `key` attribute is not present.
+        :type defaultattr:  mixed
+        :param default:     value to return when all fails
+        :type default:      mixed
+        """
+
+        target = self.attributes
+
+        key = key or self.graph.data.value_tag
+        if key in target:
+            return target[key]
+
+        if defaultattr:
+            return target.get(defaultattr, default)
+        return default
+
+    @abc.abstractmethod
+    def getgraph(self):
+        """
+        Return the node or edge as single node or edge Graph object built by
+        the graph ORM.
+
+        :rtype: :graphit:Graph
+        """
+
+        return
+
+    def set(self, key, value=None):
+        """
+        Set node or edge attribute values.
+
+        :param key:   node or edge attribute key
+        :param value: node or edge attribute value
+        """
+
+        self.attributes[to_unicode(key)] = to_unicode(value)
+
+
+class NodeCursor(CursorBaseClass):
+    """
+    Light weight node cursor
+    """
+
+    __slots__ = ()
+
+    def _storage(self):
+        """
+        Return the node storage of the graph
+        """
+
+        return self.graph.nodes
+
+    def getgraph(self):
+        """
+        Return the node as single node Graph object built by the graph ORM.
+
+        :rtype: :graphit:Graph
+        """
+
+        return self.graph.getnodes(self.nid)
+
+
+class EdgeCursor(CursorBaseClass):
+    """
+    Light weight edge cursor
+    """
+
+    __slots__ = ()
+
+    def _storage(self):
+        """
+        Return the edge storage of the graph
+        """
+
+        return self.graph.edges
+
+    def getgraph(self):
+        """
+        Return the edge as single edge Graph object built by the graph ORM.
+
+        :rtype: :graphit:Graph
+        """
+
+        return self.graph.getedges(self.nid, directed=True)
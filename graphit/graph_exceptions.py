@@ -11,7 +11,7 @@ import logging
 from graphit import __module__
 
 __all__ = ['GraphitException', 'GraphitAlgorithmError', 'GraphitEdgeNotFound', 'GraphitNodeNotFound',
-           'GraphitValidationError']
+           'GraphitReadOnlyError', 'GraphitValidationError']
 
 logger = logging.getLogger(__module__)
 
@@ -52,5 +52,11 @@ class GraphitEdgeNotFound(GraphitException):
     """
 
 
+class GraphitReadOnlyError(GraphitException):
+    """
+    Exception raised when changing a read-only graph storage
+    """
+
+
 class GraphitAlgorithmError(GraphitException):
     """Exception for unexpected termination of algorithms."""
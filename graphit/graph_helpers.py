@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import copy
+import itertools
 import logging
 
 from graphit import __module__
-from graphit.graph_exceptions import GraphitNodeNotFound
+from graphit.graph_py2to3 import to_unicode, PY_PRIMITIVES
+from graphit.graph_exceptions import GraphitException, GraphitNodeNotFound
 
 logger = logging.getLogger(__module__)
 
@@ -25,18 +27,24 @@ def edges_between_nodes(graph, nodes):
     """
     Return all edges in graph that connect the nodes
 
-    :param graph:
-    :param nodes:
-    :return:
-    """
+    Only the outgoing edges of the nodes are considered using the incident
+    edge lookup of the adjacency storage of the origin graph. Edges are
+    returned in adjacency order: grouped by source node in the order of
+    `nodes`, followed by the order of the neighbours of that node. This is
+    not necessarily the iteration order of the edge storage.
+
+    :param graph:   graph to return edges from
+    :type graph:    :graphit:Graph
+    :param nodes:   nodes to return connecting edges for
+    :type nodes:    :py:list
 
-    edge_selection = []
-    # TODO: graph.origin or graph
-    for edge in graph.origin.edges:
-        if edge[0] in nodes and edge[1] in nodes:
-            edge_selection.append(edge)
+    :return:        edges connecting the nodes
+    :rtype:         :py:list
+    """
 
-    return edge_selection
+    nodes = list(nodes)
+    node_set = set(nodes)
+    return [edge for edge in graph.origin.adjacency.incident_edges(nodes, method='outdegree') if edge[1] in node_set]
 
 
 def adjacency_to_edges(nodes, adjacency, node_source):
@@ -64,6 +72,63 @@ def adjacency_to_edges(nodes, adjacency, node_source):
     return edges
 
 
+def bulk_attributes(records, attributes=None, unicode_convert=True, **kwargs):
+    """
+    Build attribute dictionaries for a batch of nodes or edges
+
+    Merges per-item attribute dictionaries (records), column arrays of
+    attribute values and attributes shared by all items (kwargs) into a new
+    attribute dictionary per item. Shared attributes override item attributes
+    similar to the `add_nodes` and `add_edges` graph methods.
+    As `add_node` and `add_edge` copy their attributes, values that are not
+    primitive types are deep copied per item so items do not share them with
+    each other or with the input records and columns.
+
+    :param records:         per item attribute dictionary or None
+    :type records:          :py:list
+    :param attributes:      attribute name to sequence of attribute values
+                            with one value for every item in records
+    :type attributes:       :py:dict
+    :param unicode_convert: convert string types to unicode
+    :type unicode_convert:  :py:bool
+    :param kwargs:          attributes shared by all items
+
+    :return:                attribute dictionaries
+    :rtype:                 generator
+
+    :raises:                GraphitException, column length does not equal
+                            the number of records
+    """
+
+    attributes = attributes or {}
+    for name, column in attributes.items():
+        if len(column) != len(records):
+            raise GraphitException('Attribute column "{0}" has {1} values for {2} items'.format(
+                name, len(column), len(records)))
+
+    names = [to_unicode(name, convert=unicode_convert) for name in attributes]
+    columns = zip(*attributes.values()) if attributes else itertools.repeat(())
+
+    shared = dict([(to_unicode(key, convert=unicode_convert), to_unicode(value, convert=unicode_convert))
+                   for key, value in kwargs.items()])
+    copy_shared = any([not (value is None or isinstance(value, PY_PRIMITIVES)) for value in shared.values()])
+
+    for record, values in zip(records, columns):
+        attr = {}
+        if record:
+            attr.update([(to_unicode(key, convert=unicode_convert), to_unicode(value, convert=unicode_convert))
+                         for key, value in record.items()])
+        if names:
+            attr.update(zip(names, values))
+        for key, value in attr.items():
+            if not (value is None or isinstance(value, PY_PRIMITIVES)):
+                attr[key] = copy.deepcopy(value)
+        if shared:
+            attr.update(copy.deepcopy(shared) if copy_shared else shared)
+
+        yield attr
+
+
 def edge_list_to_adjacency(edges):
     """
     Create adjacency dictionary based on a list of edges
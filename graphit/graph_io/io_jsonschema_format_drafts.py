@@ -179,18 +179,18 @@ class ArrayType(JSONSchemaValidatorDraft07):
 
 
 JSONSchemaORMDraft07 = GraphORM()
-JSONSchemaORMDraft07.node_mapping.add(StringType, lambda x: x.get('type') == 'string')
-JSONSchemaORMDraft07.node_mapping.add(IntegerType, lambda x: x.get('type') == 'integer')
-JSONSchemaORMDraft07.node_mapping.add(NumberType, lambda x: x.get('type') == 'number')
-JSONSchemaORMDraft07.node_mapping.add(BooleanType, lambda x: x.get('type') == 'boolean')
-JSONSchemaORMDraft07.node_mapping.add(ArrayType, lambda x: x.get('type') == 'array')
-JSONSchemaORMDraft07.node_mapping.add(Email, lambda x: x.get('type') == 'email')
-JSONSchemaORMDraft07.node_mapping.add(Email, lambda x: x.get('type') == 'idn-email')
-JSONSchemaORMDraft07.node_mapping.add(DateTime, lambda x: x.get('type') == 'date-time')
-JSONSchemaORMDraft07.node_mapping.add(Date, lambda x: x.get('type') == 'date')
-JSONSchemaORMDraft07.node_mapping.add(Time, lambda x: x.get('type') == 'time')
-JSONSchemaORMDraft07.node_mapping.add(IP4Address, lambda x: x.get('type') == 'ipv4')
-JSONSchemaORMDraft07.node_mapping.add(IP6Address, lambda x: x.get('type') == 'ipv6')
-JSONSchemaORMDraft07.node_mapping.add(Hostname, lambda x: x.get('type') == 'hostname')
-JSONSchemaORMDraft07.node_mapping.add(Hostname, lambda x: x.get('type') == 'idn-hostname')
-JSONSchemaORMDraft07.node_mapping.add(URI, lambda x: x.get('type') == 'uri')
+JSONSchemaORMDraft07.node_mapping.add(StringType, {'type': 'string'})
+JSONSchemaORMDraft07.node_mapping.add(IntegerType, {'type': 'integer'})
+JSONSchemaORMDraft07.node_mapping.add(NumberType, {'type': 'number'})
+JSONSchemaORMDraft07.node_mapping.add(BooleanType, {'type': 'boolean'})
+JSONSchemaORMDraft07.node_mapping.add(ArrayType, {'type': 'array'})
+JSONSchemaORMDraft07.node_mapping.add(Email, {'type': 'email'})
+JSONSchemaORMDraft07.node_mapping.add(Email, {'type': 'idn-email'})
+JSONSchemaORMDraft07.node_mapping.add(DateTime, {'type': 'date-time'})
+JSONSchemaORMDraft07.node_mapping.add(Date, {'type': 'date'})
+JSONSchemaORMDraft07.node_mapping.add(Time, {'type': 'time'})
+JSONSchemaORMDraft07.node_mapping.add(IP4Address, {'type': 'ipv4'})
+JSONSchemaORMDraft07.node_mapping.add(IP6Address, {'type': 'ipv6'})
+JSONSchemaORMDraft07.node_mapping.add(Hostname, {'type': 'hostname'})
+JSONSchemaORMDraft07.node_mapping.add(Hostname, {'type': 'idn-hostname'})
+JSONSchemaORMDraft07.node_mapping.add(URI, {'type': 'uri'})
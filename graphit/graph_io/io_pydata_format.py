@@ -464,10 +464,10 @@ def write_pydata(graph, default=None, allow_none=True, export_all=False, include
 
     # Build ORM with format specific conversion classes
     pydataorm = GraphORM(inherit=False)
-    pydataorm.node_mapping.add(ParseDictionaryType, lambda x: x.get('format') == 'dict')
-    pydataorm.node_mapping.add(ParseListType, lambda x: x.get('format') == 'list')
-    pydataorm.node_mapping.add(ParseSetType, lambda x: x.get('format') == 'set')
-    pydataorm.node_mapping.add(ParseTupleType, lambda x: x.get('format') == 'tuple')
+    pydataorm.node_mapping.add(ParseDictionaryType, {'format': 'dict'})
+    pydataorm.node_mapping.add(ParseListType, {'format': 'list'})
+    pydataorm.node_mapping.add(ParseSetType, {'format': 'set'})
+    pydataorm.node_mapping.add(ParseTupleType, {'format': 'tuple'})
 
     # Set current ORM aside and register new one.
     curr_orm = graph.orm
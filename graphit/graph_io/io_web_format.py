@@ -208,8 +208,8 @@ def read_web(web, graph=None, orm_data_tag='haddock_type', auto_parse_format=Tru
 
     # Build .web parser ORM with format specific conversion classes
     weborm = GraphORM()
-    weborm.node_mapping.add(RestraintsInterface, lambda x: x.get(graph.data.key_tag) == 'activereslist')
-    weborm.node_mapping.add(RestraintsInterface, lambda x: x.get(graph.data.key_tag) == 'passivereslist')
+    weborm.node_mapping.add(RestraintsInterface, {graph.data.key_tag: 'activereslist'})
+    weborm.node_mapping.add(RestraintsInterface, {graph.data.key_tag: 'passivereslist'})
 
     # Set current ORM aside and register parser ORM.
     curr_orm = graph.orm
@@ -340,8 +340,8 @@ def write_web(graph, orm_data_tag='haddock_type', indent=2, root_nid=None):
 
     # Build ORM with format specific conversion classes
     weborm = GraphORM()
-    weborm.node_mapping.add(RestraintsInterface, lambda x: x.get(graph.data.key_tag) == 'activereslist')
-    weborm.node_mapping.add(RestraintsInterface, lambda x: x.get(graph.data.key_tag) == 'passivereslist')
+    weborm.node_mapping.add(RestraintsInterface, {graph.data.key_tag: 'activereslist'})
+    weborm.node_mapping.add(RestraintsInterface, {graph.data.key_tag: 'passivereslist'})
 
     # Resolve the root node (if any) for hierarchical data structures
     if root_nid and root_nid not in graph.nodes:
@@ -9,6 +9,8 @@ Defines the Graph Object Relation Mapper (ORM)
 import inspect
 import logging
 
+from collections import OrderedDict
+
 from graphit import __module__
 from graphit.graph_py2to3 import colabc
 from graphit.graph_storage_drivers.graph_dictstorage_driver import DictStorage
@@ -17,22 +19,298 @@ __all__ = ['GraphORM']
 logger = logging.getLogger(__module__)
 
 
+class AttributeMatcher(object):
+    """
+    Matching function for a declarative attribute mapping
+
+    Evaluates to True when all attribute keys in `match_attr` are equal to
+    the defined value similar to:
+
+        lambda x: x.get('key') == value and ...
+
+    Contrary to a function defined locally, instances can be pickled.
+    """
+
+    __slots__ = ('match_attr',)
+
+    def __init__(self, match_attr):
+        """
+        Implement class __init__
+
+        :param match_attr: attribute key, value pairs to match
+        :type match_attr:  :py:dict
+        """
+
+        self.match_attr = match_attr
+
+    def __call__(self, attributes):
+        """
+        Match node or edge attributes
+
+        :param attributes:  node or edge attributes
+        :type attributes:   :py:dict
+
+        :rtype:             :py:bool
+        """
+
+        return all(attributes.get(key) == value for key, value in self.match_attr.items())
+
+    def __getstate__(self):
+        """
+        Implement class __getstate__
+
+        Enables the class to be pickled. Required because the class uses
+        __slots__
+
+        :return:    object content for pickling
+        :rtype:     :py:dict
+        """
+
+        return {'match_attr': self.match_attr}
+
+    def __setstate__(self, state):
+        """
+        Implement class __setstate__
+
+        Enables the class to be unpickled. Required because the class uses
+        __slots__
+
+        :param state:    object content for unpickling
+        :type state:     :py:dict
+        """
+
+        self.match_attr = state['match_attr']
+
+
+class MappingRecord(dict):
+    """
+    Mapping dictionary stored in a MappingDictStorage
+
+    Every change to the mapping increments the `mapping_version` counter of
+    the storage it is part of allowing in place changes to a mapping to be
+    detected without comparing all mappings.
+    """
+
+    __slots__ = ('_storage',)
+
+    def __init__(self, storage, *args, **kwargs):
+        """
+        Implement class __init__
+
+        :param storage: internal dictionary of the MappingDictStorage
+        :type storage:  :graphit:DictWrapper
+        """
+
+        super(MappingRecord, self).__init__(*args, **kwargs)
+        self._storage = storage
+
+    def __reduce__(self):
+
+        return MappingRecord, (self._storage, dict(self))
+
+    def __setitem__(self, key, value):
+
+        super(MappingRecord, self).__setitem__(key, value)
+        self._storage.mapping_version += 1
+
+    def __delitem__(self, key):
+
+        super(MappingRecord, self).__delitem__(key)
+        self._storage.mapping_version += 1
+
+    def clear(self):
+
+        super(MappingRecord, self).clear()
+        self._storage.mapping_version += 1
+
+    def pop(self, key, *args):
+
+        self._storage.mapping_version += 1
+        return super(MappingRecord, self).pop(key, *args)
+
+    def popitem(self):
+
+        self._storage.mapping_version += 1
+        return super(MappingRecord, self).popitem()
+
+    def setdefault(self, key, default=None):
+
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def update(self, *args, **kwargs):
+
+        super(MappingRecord, self).update(*args, **kwargs)
+        self._storage.mapping_version += 1
+
+
 class MappingDictStorage(DictStorage):
+    """
+    Storage of node or edge ORM mappings
+
+    A mapping is defined by a matching function or a declarative attribute
+    mapping (a dictionary of attribute key, value pairs). Declarative mappings
+    are stored in a hash index from attribute values to mappings so that
+    matching of a node or edge does not require evaluation of every mapping.
+    Matching functions are evaluated for every node or edge.
+
+    Match results are cached by node or edge ID for storage that tracks
+    changes to node or edge attributes, enabled by the storage `track_changes`
+    or `add_index` methods. A cached
+    result is reused until the attributes change. The least recently used
+    results are evicted when the cache exceeds `match_cache_size`. The index
+    and cache are rebuilt when the mappings change.
+
+    Mappings are stored as MappingRecord dictionaries that increment the
+    `mapping_version` counter of the storage on every change. The counter
+    together with the storage identity defines the mapping `state`.
+    """
 
     mapping_index = 0
+    match_cache_size = 10000
+
+    _match_state = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        Implement class __init__
+
+        Store mappings as MappingRecord and initiate the mapping version
+        counter if not already shared with another MappingDictStorage.
+        """
+
+        super(MappingDictStorage, self).__init__(*args, **kwargs)
+
+        self._storage.__dict__.setdefault('mapping_version', 0)
+        for key, mapping in self._storage.items():
+            if not isinstance(mapping, MappingRecord):
+                self._storage[key] = MappingRecord(self._storage, mapping)
+
+    def __delitem__(self, key):
+        """
+        Implement class __delitem__
+
+        Remove mapping and increment the mapping version
+
+        :param key: mapping identifier
+        """
+
+        super(MappingDictStorage, self).__delitem__(key)
+        self._storage.mapping_version += 1
+
+    def __setitem__(self, key, value):
+        """
+        Implement class __setitem__
+
+        Store mapping as MappingRecord and increment the mapping version
+
+        :param key:     mapping identifier
+        :param value:   mapping dictionary
+        :type value:    :py:dict
+        """
+
+        super(MappingDictStorage, self).__setitem__(key, MappingRecord(self._storage, value))
+        self._storage.mapping_version += 1
 
     @classmethod
     def _check_duplicate_mapping(self, source, target):
         """
-        Equality of functions is determined by checking code object equality
+        Equality of functions is determined by checking code object equality.
+        Declarative mappings are equal when the attribute mapping is equal.
 
         :param source:
         :param target:
         :return:
         """
 
-        return target['class'] == source['class'] and \
-               hash(target['match_func'].__code__) == hash(source['match_func'].__code__)
+        if target['class'] != source['class']:
+            return False
+
+        source_attr = source.get('match_attr')
+        target_attr = target.get('match_attr')
+        if source_attr is not None or target_attr is not None:
+            return source_attr == target_attr
+
+        return hash(target['match_func'].__code__) == hash(source['match_func'].__code__)
+
+    def _build_match_index(self):
+        """
+        (Re)build the hash index of declarative mappings if the mappings
+        changed since the last build.
+
+        The index is a dictionary of attribute key to dictionaries of
+        attribute value to mappings. Every declarative mapping is indexed on
+        one of its attribute keys. Other mappings are stored separately for
+        evaluation of their matching function.
+        """
+
+        state = self.state()
+        if state == self._match_state:
+            return
+
+        index = {}
+        unindexed = []
+        for pos, mapping in enumerate(self._storage.values()):
+            match_attr = mapping.get('match_attr')
+            if match_attr:
+                key, value = next(iter(match_attr.items()))
+                index.setdefault(key, {}).setdefault(value, []).append((pos, mapping))
+            else:
+                unindexed.append((pos, mapping))
+
+        self._match_index = index
+        self._match_unindexed = unindexed
+        self._match_cache = OrderedDict()
+        self._match_state = state
+
+    def _match_attributes(self, attributes):
+        """
+        Match node or edge attributes against all mappings
+
+        :param attributes:  node or edge attributes
+        :type attributes:   :py:dict
+
+        :return:            mro_pos and class of matched mappings in order of
+                            mapping registration
+        :rtype:             :py:list
+        """
+
+        candidates = list(self._match_unindexed)
+        for key, values in self._match_index.items():
+            try:
+                candidates.extend(values.get(attributes.get(key), ()))
+            except TypeError:
+                continue
+
+        matched = []
+        for pos, mapping in sorted(candidates, key=lambda x: x[0]):
+            match_attr = mapping.get('match_attr')
+            if match_attr is not None:
+                matching_result = all(attributes.get(key) == value for key, value in match_attr.items())
+            else:
+                matching_result = mapping['match_func'](attributes)
+
+            if isinstance(matching_result, bool) and matching_result:
+                matched.append((mapping['mro_pos'], mapping['class']))
+
+        return matched
+
+    def state(self):
+        """
+        Return the current state of the mapping as tuple.
+
+        The state is defined by the identity of the internal storage and the
+        mapping version that is incremented on every change, including in
+        place changes to mapping dictionaries. The state is used to detect
+        changes to the mapping and invalidate cached classes, match results
+        and the mapping index.
+
+        :rtype: :py:tuple
+        """
+
+        return id(self._storage), self._storage.mapping_version
 
     def add(self, cls, match_func, mro_pos=0):
         """
@@ -41,13 +319,21 @@ class MappingDictStorage(DictStorage):
         A mapped class is included in a new Graph or GraphAxis class by the
         ORM class factory based on a match in the node or edge attributes.
 
+        The `match_func` is either a function evaluating the attributes or a
+        dictionary of attribute key, value pairs that should all be equal to
+        the node or edge attributes for a match. The latter, declarative,
+        mapping is resolved using a hash index and is preferred for simple
+        equality matches:
+
+            mapping.add(cls, {'type': 'string'})
+
         Every node/edge mapped using the `add` method results in a unique map.
         Use the `update` method to update an existing mapping using the map ID.
 
         :param cls:        class to map
         :type cls:         :py:class
-        :param match_func: attribute matching function
-        :type match_func:  :py:func
+        :param match_func: attribute matching function or attribute mapping
+        :type match_func:  :py:func or :py:dict
         :param mro_pos:    preferred index of class in Python MRO
         :type mro_pos:     :py:int
 
@@ -59,11 +345,19 @@ class MappingDictStorage(DictStorage):
         if not inspect.isclass(cls):
             raise TypeError('"cls" argument is not a class (got {0})'.format(type(cls)))
 
-        if not callable(match_func):
+        # Build mapping dictionary and check if it already exists
+        if isinstance(match_func, colabc.Mapping):
+            match_attr = dict(match_func)
+            for value in match_attr.values():
+                if not isinstance(value, colabc.Hashable):
+                    raise TypeError('"match_func" attribute values should be hashable (got {0})'.format(value))
+            mapping_dict = {'mro_pos': mro_pos, 'class': cls, 'match_func': AttributeMatcher(match_attr),
+                            'match_attr': match_attr}
+        elif callable(match_func):
+            mapping_dict = {'mro_pos': mro_pos, 'class': cls, 'match_func': match_func}
+        else:
             raise TypeError('"match_func" argument is not a function (got {0})'.format(match_func))
 
-        # Build mapping dictionary and check if it already exists
-        mapping_dict = {'mro_pos': mro_pos, 'class': cls, 'match_func': match_func}
         for mapidx, mapping in self._storage.items():
             if self._check_duplicate_mapping(mapping, mapping_dict):
                 logger.info('Mapping "{0}" already defined. Use update to make changes'.format(mapidx))
@@ -71,7 +365,8 @@ class MappingDictStorage(DictStorage):
 
         # Add to mapping dictionary
         self.mapping_index += 1
-        self._storage[self.mapping_index] = mapping_dict
+        self._storage[self.mapping_index] = MappingRecord(self._storage, mapping_dict)
+        self._storage.mapping_version += 1
 
         return self.mapping_index
 
@@ -115,9 +410,16 @@ class MappingDictStorage(DictStorage):
     def match(self, graph, node_edge_ids):
         """
         Match attributes of node or edge based on ID against registered
-        matching functions.
+        mappings.
         Sort mapped classes according to preferred MRO order (mro_pos).
 
+        Declarative mappings are resolved using the mapping index, matching
+        functions are evaluated. Results are cached by node or edge ID until
+        the node or edge attributes change if change tracking was enabled on
+        the storage using `track_changes` or `add_index`. Matching does not
+        enable change tracking itself. In place changes to mutable attribute values, such as
+        appending to a list, are not detected.
+
         :param graph:           Graph containing nodes or edges to match
         :param node_edge_ids:   List of node or edge ID's
 
@@ -126,19 +428,33 @@ class MappingDictStorage(DictStorage):
         :rtype:                 :py:list
         """
 
+        self._build_match_index()
+
         mro_class_stack = []
         for i in node_edge_ids:
 
             # Get node or edge attributes
-            if isinstance(i, tuple):
-                attributes = graph.origin.edges.get(i)
-            else:
-                attributes = graph.origin.nodes.get(i)
-
-            for mapping in self.values():
-                matching_result = mapping['match_func'](attributes or {})
-                if isinstance(matching_result, bool) and matching_result:
-                    mro_class_stack.append((mapping['mro_pos'], mapping['class']))
+            storage = graph.origin.edges if isinstance(i, tuple) else graph.origin.nodes
+            attributes = storage.get(i)
+
+            # Reuse cached match result if the attributes did not change.
+            # Only values of storage already tracking changes have a version
+            version = getattr(attributes, 'version', None)
+            if version is not None:
+                cached = self._match_cache.pop(i, None)
+                if cached is None or cached[0] is not attributes or cached[1] != version:
+                    cached = (attributes, version, self._match_attributes(attributes))
+                if len(self._match_cache) >= self.match_cache_size:
+                    self._match_cache.popitem(last=False)
+                self._match_cache[i] = cached
+                mro_class_stack.extend(cached[2])
+                continue
+
+            attributes = attributes or {}
+            if not isinstance(attributes, dict):
+                attributes = dict(attributes)
+
+            mro_class_stack.extend(self._match_attributes(attributes))
 
         # Sort mapped classes according to preferred MRO order (mro_pos)
         if mro_class_stack:
@@ -183,6 +499,14 @@ class GraphORM(object):
     returning a boolean will do. The benefit of using functions is the freedom
     in defining the matching criteria.
 
+    Simple equality matches are better defined declaratively as a dictionary
+    of attribute key, value pairs that all need to match:
+
+        {'arg': 1, 'type': 'string'}
+
+    Declarative mappings are resolved using a hash index of attribute values
+    rather than evaluating every mapping for every node or edge.
+
     **Class inheritance**
     Class inheritance is respected by the ORM and can be controlled.
     By default, the base class used in a mapping is the one from which the call
@@ -221,9 +545,14 @@ class GraphORM(object):
     will be included in the newly generated Graph class regardless of the ORM
     results (orm_cls argument). This allows to partly bypass current limitations
     of the ORM by writing custom evaluation code.
+
+    **Class cache**
+    Classes built by the class factory are cached and reused for the same
+    base class, custom classes and factory arguments. The cache is cleared
+    when the node or edge mapping changes.
     """
 
-    __slots__ = ('node_mapping', 'edge_mapping', 'inherit')
+    __slots__ = ('node_mapping', 'edge_mapping', 'inherit', '_class_cache', '_class_cache_state')
 
     def __init__(self, node_mapping=None, edge_mapping=None, inherit=True):
         """
@@ -247,12 +576,15 @@ class GraphORM(object):
         self.edge_mapping = MappingDictStorage(edge_mapping)
         self.inherit = inherit
 
+        self._class_cache = {}
+        self._class_cache_state = None
+
     def __getstate__(self):
         """
         Implement class __getstate__
 
         Enables the class to be pickled. Required because the class uses
-        __slots__
+        __slots__. The class cache is not pickled.
 
         :return:    object content for pickling
         :rtype:     :py:dict
@@ -260,7 +592,8 @@ class GraphORM(object):
 
         state = {}
         for key in self.__slots__:
-            state[key] = getattr(self, key)
+            if key not in ('_class_cache', '_class_cache_state'):
+                state[key] = getattr(self, key)
 
         return state
 
@@ -275,6 +608,9 @@ class GraphORM(object):
         :type state:     :py:dict
         """
 
+        self._class_cache = {}
+        self._class_cache_state = None
+
         for key, value in state.items():
             if key in self.__slots__:
                 setattr(self, key, value)
@@ -306,6 +642,9 @@ class GraphORM(object):
         the NodeEdgeToolsBaseClass abstract base class that custom node or edge
         classes should inherit from.
 
+        Built classes are cached by base class, classes, `exclude_node_edge`
+        and `inherit` and reused until the node or edge mapping changes.
+
         :param base_cls:          graph base class. Needs to be based on Graph
         :type base_cls:           :py:class
         :param classes:           additional classes to include in base class
@@ -323,6 +662,16 @@ class GraphORM(object):
         :rtype:                   :py:class
         """
 
+        # Clear class cache if mappings changed
+        state = (self.node_mapping.state(), self.edge_mapping.state())
+        if state != self._class_cache_state:
+            self._class_cache = {}
+            self._class_cache_state = state
+
+        cache_key = (base_cls, tuple(classes), exclude_node_edge, self.inherit)
+        if cache_key in self._class_cache:
+            return self._class_cache[cache_key]
+
         # Get method resolution order for base_cls excluding ORM build classes
         base_cls_mro = [c for c in base_cls.mro() if not self.__module__ == c.__module__]
 
@@ -341,7 +690,10 @@ class GraphORM(object):
                 base_cls_mro.insert(0, n)
 
         # Build the new base class
-        return type(base_cls.__name__, tuple(base_cls_mro), {})
+        orm_cls = type(base_cls.__name__, tuple(base_cls_mro), {})
+        self._class_cache[cache_key] = orm_cls
+
+        return orm_cls
 
     def get_nodes(self, graph, nodes, classes=None):
         """
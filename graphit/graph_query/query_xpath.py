@@ -7,13 +7,20 @@ XPath based query of Axis based graphs.
 """
 
 import json
+import operator
 import re
 import logging
+import threading
+
+from collections import OrderedDict
 
 from graphit import Graph, __module__
-from graphit.graph_axis.graph_axis_methods import node_children, node_ancestors, node_parent
+from graphit.graph_exceptions import GraphitException
+from graphit.graph_helpers import check_nodes_in_graph
+from graphit.graph_axis.graph_axis_methods import (node_children, node_ancestors, node_descendants, node_parent,
+                                                   node_siblings)
 
-__all__ = ['XpathExpressionEvaluator']
+__all__ = ['XpathExpressionEvaluator', 'XpathQueryPlan']
 logger = logging.getLogger(__module__)
 
 # Regular expressions
@@ -21,6 +28,18 @@ split_filter_chars = re.compile(r'([\[\]])')
 split_path_seperators = re.compile(r'(\.+|/+)')
 split_operators = re.compile(r'(>=|<=|!=|=|<|>|\*)')
 
+# Attribute filter operators resolved using node attribute indexes mapped to
+# the range bound arguments of the storage driver `range_lookup` method
+INDEX_OPERATORS = {'=': None,
+                   '<': ('upper', {'include_upper': False}),
+                   '<=': ('upper', {'include_upper': True}),
+                   '>': ('lower', {'include_lower': False}),
+                   '>=': ('lower', {'include_lower': True})}
+
+# Attribute filter comparison operators
+ATTRIBUTE_OPERATORS = {'=': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le,
+                       '>': operator.gt, '>=': operator.ge}
+
 
 def get_attributes(attr, graph=None):
     """
@@ -41,6 +60,20 @@ def get_attributes(attr, graph=None):
         if attr[0] == '*':
             return graph
 
+    # Use attribute index for equality and range comparison if available
+    if len(attr) == 3 and attr[1] in INDEX_OPERATORS:
+        if attr[1] == '=':
+            indexed = graph.nodes.index_lookup(attr[0], attr[2])
+        else:
+            bound, kwargs = INDEX_OPERATORS[attr[1]]
+            kwargs = dict(kwargs)
+            kwargs[bound] = attr[2]
+            indexed = graph.nodes.range_lookup(attr[0], **kwargs)
+
+        if indexed is not None:
+            indexed = set(indexed)
+            return graph.getnodes([nid for nid in graph.nodes() if nid in indexed])
+
     # Select nodes that have the particular attribute
     sel = [nid for nid in graph.nodes() if attr[0] in graph.nodes[nid]]
 
@@ -256,8 +289,464 @@ def search_ancestors(graph, loc=None, exp=None, attr=None):
     return ancestors
 
 
+def _has_node_tools(graph):
+    """
+    Check if the graph has the NodeTools class attached
+
+    :param graph:   graph to check
+    :type graph:    :graphit:GraphAxis
+
+    :rtype:         :py:bool
+    """
+
+    try:
+        graph.nid
+    except AttributeError:
+        return False
+    return True
+
+
+def _resolve_nid(graph, nids, single):
+    """
+    Node ID based equivalent of the GraphAxis `_resolve_nid` method
+
+    Returns the node ID of a selection having NodeTools or the graph root
+    otherwise. Like the NodeTools `nid` property the node ID is None if that
+    selection does not contain exactly one node.
+
+    :param graph:   GraphAxis instance the query is evaluated on
+    :type graph:    :graphit:GraphAxis
+    :param nids:    current node selection
+    :type nids:     :py:list
+    :param single:  node selection has NodeTools
+    :type single:   :py:bool
+    """
+
+    if graph.root is None:
+        raise GraphitException('Graph node descendant requires a root node')
+
+    if single:
+        return nids[0] if len(nids) == 1 else None
+    return graph.root
+
+
+def getnodes_nids(graph, nids, single, add_node_tools=True):
+    """
+    Node ID based equivalent of the Graph `getnodes` method
+
+    Returns the node selection a `getnodes` call with the same node ID's
+    would represent and if the resulting graph would have NodeTools attached.
+    As in `getnodes`:
+
+    * NodeTools are added to single node selections if `add_node_tools` is
+      True. A selection of zero or one node also inherits NodeTools from the
+      graph `getnodes` is called on (`single`) if the ORM inherits classes.
+      Selections of multiple nodes never have NodeTools.
+    * Duplicate node ID's are counted as separate nodes and a selection with
+      as many node ID's as there are nodes in the graph selects all nodes.
+
+    :param graph:           GraphAxis instance the query is evaluated on
+    :type graph:            :graphit:GraphAxis
+    :param nids:            node ID's to select
+    :type nids:             :py:list
+    :param single:          graph `getnodes` is called on has NodeTools
+    :type single:           :py:bool
+    :param add_node_tools:  add NodeTools to single node selections
+    :type add_node_tools:   :py:bool
+
+    :return:                node selection and NodeTools flag
+    :rtype:                 :py:tuple
+    :raises:                GraphitNodeNotFound, node check fails
+    """
+
+    if nids:
+        check_nodes_in_graph(graph.origin, nids)
+
+    has_node_tools = len(nids) == 1 and add_node_tools
+    if len(nids) <= 1 and single and graph.orm.inherit:
+        has_node_tools = True
+
+    if len(nids) == len(graph.origin.nodes):
+        return list(graph.origin.nodes.keys()), has_node_tools
+
+    return unique_nids(nids), has_node_tools
+
+
+def get_attributes_nids(attr, graph, nids, single):
+    """
+    Node ID based equivalent of the `get_attributes` function
+
+    :param attr:    parsed attribute filter
+    :type attr:     :py:list
+    :param graph:   GraphAxis instance the query is evaluated on
+    :type graph:    :graphit:GraphAxis
+    :param nids:    node selection to filter
+    :type nids:     :py:list
+    :param single:  node selection has NodeTools
+    :type single:   :py:bool
+
+    :return:        filtered node selection and NodeTools flag
+    :rtype:         :py:tuple
+    """
+
+    nodes = graph.origin.nodes
+
+    if len(attr) == 1:
+        if isinstance(attr[0], int) and len(nids) > attr[0]:
+            id_sorted_nodes = sorted([(nodes[nid].get('_id'), nid) for nid in nids])
+            return [id_sorted_nodes[attr[0]][1]], True
+        if attr[0] == '*':
+            return nids, single
+
+    # Use attribute index for equality and range comparison if available
+    if len(attr) == 3 and attr[1] in INDEX_OPERATORS:
+        if attr[1] == '=':
+            indexed = nodes.index_lookup(attr[0], attr[2])
+        else:
+            bound, kwargs = INDEX_OPERATORS[attr[1]]
+            kwargs = dict(kwargs)
+            kwargs[bound] = attr[2]
+            indexed = nodes.range_lookup(attr[0], **kwargs)
+
+        if indexed is not None:
+            indexed = set(indexed)
+            return getnodes_nids(graph, [nid for nid in nids if nid in indexed], single)
+
+    sel = [nid for nid in nids if attr[0] in nodes[nid]]
+    if len(attr) == 3:
+        operator = ATTRIBUTE_OPERATORS.get(attr[1])
+        if operator is not None:
+            sel = [n for n in sel if operator(nodes[n][attr[0]], attr[2])]
+
+    return getnodes_nids(graph, sel, single)
+
+
+def filter_nids(graph, nids, single, exp=None, attr=None):
+    """
+    Filter a node selection on node key and attributes
+
+    Node ID based equivalent of the `query_nodes` and `get_attributes`
+    selection used by the path functions.
+
+    :param graph:   GraphAxis instance the query is evaluated on
+    :type graph:    :graphit:GraphAxis
+    :param nids:    node selection to filter
+    :type nids:     :py:list
+    :param single:  node selection has NodeTools
+    :type single:   :py:bool
+    :param exp:     expression to query for in node key
+    :type exp:      :py:str
+    :param attr:    attributes to evaluate for matched expressions
+    :type attr:     :py:list
+
+    :return:        filtered node selection and NodeTools flag
+    :rtype:         :py:tuple
+    """
+
+    if exp not in (None, '*'):
+        nids, single = getnodes_nids(graph, filter_key_nids(graph, nids, exp), single)
+
+    for a in attr or []:
+        nids, single = get_attributes_nids(a, graph, nids, single)
+
+    return nids, single
+
+
+def filter_key_nids(graph, nids, exp):
+    """
+    Select nodes having `exp` as value of the node key_tag attribute
+
+    :param graph:   GraphAxis instance the query is evaluated on
+    :type graph:    :graphit:GraphAxis
+    :param nids:    node selection to filter
+    :type nids:     :py:list
+    :param exp:     node key to select
+    :type exp:      :py:str
+
+    :rtype:         :py:list
+    """
+
+    nodes = graph.origin.nodes
+    key_tag = graph.data.key_tag
+
+    indexed = nodes.index_lookup(key_tag, exp)
+    if indexed is not None:
+        indexed = set(indexed)
+        return [nid for nid in nids if nid in indexed]
+
+    return [nid for nid in nids if nodes[nid].get(key_tag) == exp]
+
+
+def unique_nids(nids):
+    """
+    Remove duplicate node ID's preserving order
+
+    :param nids:    node ID's
+    :type nids:     :py:list
+
+    :rtype:         :py:list
+    """
+
+    return list(OrderedDict.fromkeys(nids))
+
+
+def get_root_nids(graph, nids, single, loc=None, exp=None, attr=None):
+    """
+    Node ID based equivalent of the `get_root` path function
+    """
+
+    return getnodes_nids(graph, filter_key_nids(graph, [graph.root], exp), True)
+
+
+def get_parent_nids(graph, nids, single, loc=None, exp=None, attr=None):
+    """
+    Node ID based equivalent of the `get_parent` path function
+    """
+
+    self_nids, self_single = filter_nids(graph, nids, single, exp=exp, attr=attr)
+
+    parents = []
+    for nid in self_nids:
+        if nid == graph.root:
+            parents.append(nid)
+        else:
+            parents.append(node_parent(graph.origin, nid, graph.root))
+
+    return getnodes_nids(graph, parents, single)
+
+
+def get_self_nids(graph, nids, single, loc=None, exp=None, attr=None):
+    """
+    Node ID based equivalent of the `get_self` path function
+    """
+
+    return filter_nids(graph, nids, single, exp=exp, attr=attr)
+
+
+def search_child_nids(graph, nids, single, loc=None, exp=None, attr=None):
+    """
+    Node ID based equivalent of the `search_child` path function
+    """
+
+    children = []
+    for nid in nids:
+        children.extend(node_children(graph.origin, nid, graph.root))
+
+    children, single = getnodes_nids(graph, children, _has_node_tools(graph.origin))
+    return filter_nids(graph, children, single, exp=exp, attr=attr)
+
+
+def search_descendants_nids(graph, nids, single, loc=None, exp=None, attr=None):
+    """
+    Node ID based equivalent of the `search_descendants` path function
+    """
+
+    nid = _resolve_nid(graph, nids, single)
+    descendants = node_descendants(graph.origin, nid, graph.root, include_self=True)
+
+    descendants, single = getnodes_nids(graph, descendants, single, add_node_tools=False)
+    return filter_nids(graph, descendants, single, exp=exp, attr=attr)
+
+
+def search_siblings_nids(graph, nids, single, loc=None, exp=None, attr=None):
+    """
+    Node ID based equivalent of the `search_siblings` path function
+    """
+
+    nid = _resolve_nid(graph, nids, single)
+    siblings = node_siblings(graph.origin, nid, graph.root)
+
+    siblings, single = getnodes_nids(graph, siblings, single, add_node_tools=False)
+    return filter_nids(graph, siblings, single, exp=exp, attr=attr)
+
+
+def search_ancestors_nids(graph, nids, single, loc=None, exp=None, attr=None):
+    """
+    Node ID based equivalent of the `search_ancestors` path function
+    """
+
+    ancestors = []
+    for nid in nids:
+        ancestors.extend(node_ancestors(graph.origin, nid, graph.root))
+
+    ancestors, single = getnodes_nids(graph, unique_nids(ancestors), _has_node_tools(graph.origin))
+    return filter_nids(graph, ancestors, single, exp=exp, attr=attr)
+
+
+# Node ID based equivalents of the path functions
+NID_PATH_FUNCTIONS = {get_root: get_root_nids, get_parent: get_parent_nids, get_self: get_self_nids,
+                      search_child: search_child_nids, search_descendants: search_descendants_nids,
+                      search_siblings: search_siblings_nids, search_ancestors: search_ancestors_nids}
+
+
+class XpathQueryPlan(object):
+    """
+    Compiled XPath expression
+
+    A query plan is the parsed representation of an XPath expression as an
+    ordered list of path steps each bound to the path function evaluating it.
+    The plan does not depend on the graph it is evaluated against and is
+    reused for every evaluation of the same expression. Plans are created by
+    the `XpathExpressionEvaluator.compile` method.
+    """
+
+    __slots__ = ('expression', 'sep', 'steps')
+
+    def __init__(self, expression, sep, steps):
+        """
+        Implement class __init__
+
+        :param expression:  XPath expression
+        :type expression:   :py:str
+        :param sep:         path separator character
+        :type sep:          :py:str
+        :param steps:       path steps as tuples of path function and
+                            path function keyword arguments (loc, exp, attr)
+        :type steps:        :py:tuple
+        """
+
+        self.expression = expression
+        self.sep = sep
+        self.steps = steps
+
+    def __call__(self, graph, nid_sets=False):
+        """
+        Implement class __call__
+
+        Evaluate the query plan against a graph. See `resolve` method
+        """
+
+        return self.resolve(graph, nid_sets=nid_sets)
+
+    def __repr__(self):
+        """
+        Implement class __repr__
+
+        :rtype: :py:str
+        """
+
+        return '<{0} "{1}": {2} steps>'.format(type(self).__name__, self.expression, len(self.steps))
+
+    def _evaluate_nids(self, graph):
+        """
+        Evaluate the query plan on node ID's
+
+        :param graph:       GraphAxis instance to apply XPath evaluation on
+        :type graph:        :graphit:GraphAxis
+
+        :return:            node ID's and NodeTools flag or None for
+                            node ID's in case of syntax errors
+        :rtype:             :py:tuple
+        """
+
+        nids = list(graph.nodes.keys())
+        single = _has_node_tools(graph)
+
+        for i, (func, evald) in enumerate(self.steps):
+
+            # Stop if previous evaluation failed
+            if i > 0 and not nids:
+                break
+
+            if func is None:
+                self._log_syntax_error(evald)
+                return None, False
+
+            nids, single = NID_PATH_FUNCTIONS[func](graph, nids, single, **evald)
+
+        return nids, single
+
+    def _log_syntax_error(self, evald):
+        """
+        Log invalid path location in expression
+
+        :param evald:   path step
+        :type evald:    :py:dict
+        """
+
+        logger.warning('XPath syntax error: "{0}" no valid expression in {1}'.format(evald['loc'], self.expression))
+
+    def resolve(self, graph, nid_sets=False):
+        """
+        Evaluate the query plan against a graph
+
+        Always returns a graph that can be empty if the XPath evaluation
+        failed.
+
+        By default every path step is evaluated by a path function returning
+        a sub graph as input for the next step. Enabling `nid_sets` evaluates
+        the path steps on lists of node ID's instead and only builds the
+        result graph after the last step (see `resolve_nids`).
+
+        :param graph:       GraphAxis instance to apply XPath evaluation on
+        :type graph:        :graphit:GraphAxis
+        :param nid_sets:    evaluate path steps on node ID's
+        :type nid_sets:     :py:bool
+
+        :return:            Graph nodes or attributes
+        """
+
+        if nid_sets and not graph.masked:
+            nids, single = self._evaluate_nids(graph)
+            if nids is None:
+                return graph.getnodes(None)
+
+            # Prevent the result to inherit NodeTools from the graph
+            if not single and _has_node_tools(graph):
+                graph = graph.origin
+            return graph.getnodes(nids, add_node_tools=single)
+
+        target = graph
+        for i, (func, evald) in enumerate(self.steps):
+
+            # Stop if previous evaluation failed (empty graph, attribute)
+            if i > 0 and (not isinstance(target, Graph) or target.empty()):
+                return target
+
+            # Parse path segment using appropriate path function
+            if func is None:
+                self._log_syntax_error(evald)
+                target = graph.getnodes(None)
+            else:
+                target = func(target, **evald)
+
+        return target
+
+    def resolve_nids(self, graph):
+        """
+        Evaluate the query plan against a graph returning node ID's
+
+        Path steps are evaluated on lists of node ID's without building
+        intermediate sub graphs. Attribute filters use node attribute indexes
+        when available. Evaluation of masked graphs is delegated to the graph
+        based evaluation.
+
+        :param graph:       GraphAxis instance to apply XPath evaluation on
+        :type graph:        :graphit:GraphAxis
+
+        :return:            matching node ID's
+        :rtype:             :py:list
+        """
+
+        if graph.masked:
+            return list(self.resolve(graph).nodes.keys())
+
+        nids, single = self._evaluate_nids(graph)
+        if nids is None:
+            return list(graph.getnodes(None).nodes.keys())
+
+        return nids
+
+
 class XpathExpressionEvaluator(object):
 
+    # Least recently used (LRU) cache of compiled query plans per evaluator
+    # class shared by all instances of the class. The cache size is a class
+    # setting, define it in a subclass to change it.
+    cache_size = 1000
+    _plan_caches = {}
+    _plan_cache_lock = threading.Lock()
+
     def __init__(self, sep='/'):
         """
         XpathExpressionEvaluator class
@@ -320,6 +809,46 @@ class XpathExpressionEvaluator(object):
         self.path_root_dict.update(self.path_axis_dict)
         self.path_func_dict.update(self.path_axis_dict)
 
+    def compile(self, expression):
+        """
+        Compile XPath expression to a reusable query plan
+
+        Compiled plans are kept in a least recently used (LRU) cache of
+        `cache_size` plans per evaluator class keyed by expression and path
+        separator. Repeated evaluation of the same expression thereby only
+        parses it once. The cache is safe to use from multiple threads.
+
+        :param expression:  XPath expression to compile
+        :type expression:   :py:str
+
+        :rtype:             :graphit:graph_query:XpathQueryPlan
+        """
+
+        cls = type(self)
+        cache_key = (expression, self.sep)
+        with self._plan_cache_lock:
+            cache = self._plan_caches.setdefault(cls, OrderedDict())
+            plan = cache.pop(cache_key, None)
+
+        if plan is None:
+            steps = []
+            for i, evald in sorted(self.parse_xpath_expression(expression).items()):
+                if i == 1 and evald['loc'] in self.path_func_dict:
+                    steps.append((self.path_root_dict[evald['loc']], evald))
+                elif evald['loc'] in self.path_func_dict:
+                    steps.append((self.path_func_dict[evald['loc']], evald))
+                else:
+                    steps.append((None, evald))
+
+            plan = XpathQueryPlan(expression, self.sep, tuple(steps))
+
+        with self._plan_cache_lock:
+            cache[cache_key] = plan
+            while len(cache) > cls.cache_size:
+                cache.popitem(last=False)
+
+        return plan
+
     @staticmethod
     def parse_attr(attr):
         """
@@ -376,41 +905,25 @@ class XpathExpressionEvaluator(object):
 
         return groups
 
-    def resolve(self, expression, graph):
+    def resolve(self, expression, graph, nid_sets=False):
         """
         Resolve XPath expression
 
         Always returns a graph that can be empty if the XPath evaluation
         failed.
 
-        :param expression:  XPath expression to evaluate
-        :type expression:   :py:str
+        :param expression:  XPath expression to evaluate or compiled query plan
+        :type expression:   :py:str or XpathQueryPlan
         :param graph:       GraphAxis instance to apply XPath evaluation on
         :type graph:        :graphit:GraphAxis
+        :param nid_sets:    evaluate path steps on node ID's building the
+                            result graph only after the last step
+        :type nid_sets:     :py:bool
 
         :return:            Graph nodes or attributes
         """
 
-        evaluator = self.parse_xpath_expression(expression)
-
-        # Iteratively evaluate
-        target = graph
-
-        for i, evald in sorted(evaluator.items()):
+        if not isinstance(expression, XpathQueryPlan):
+            expression = self.compile(expression)
 
-            if i == 1 and evald['loc'] in self.path_func_dict:
-                target = self.path_root_dict[evald['loc']](target, **evald)
-                continue
-
-            # Stop if previous evaluation failed (empty graph, attribute)
-            if not isinstance(target, Graph) or target.empty():
-                return target
-
-            # Parse path segment using appropriate path function
-            if evald['loc'] in self.path_func_dict:
-                target = self.path_func_dict.get(evald['loc'])(target, **evald)
-            else:
-                logger.warning('XPath syntax error: "{0}" no valid expression in {1}'.format(evald['loc'], expression))
-                target = graph.getnodes(None)
-
-        return target
+        return expression.resolve(graph, nid_sets=nid_sets)
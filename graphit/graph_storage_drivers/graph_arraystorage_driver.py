@@ -3,18 +3,27 @@
 """
 file: graph_arraystorage_driver.py
 
-Classes that store nodes, edges and their attributes as numpy arrays using the
-Pandas package
+Classes that store nodes, edges and their attributes as numpy arrays with
+access to the data as Pandas DataFrame.
+
+Every node or edge is a row in a column store with a typed numpy array for
+every attribute (column). Arrays are allocated with spare capacity so rows
+are appended in amortized constant time. The Pandas DataFrame representation
+of the store is build on request and cached until the next change.
 """
 
+import copy
 import weakref
 import logging
 
-from collections import MutableMapping
+import numpy
+
+from collections import OrderedDict
 from numpy import nan as Nan
-from pandas import DataFrame, Series
+from pandas import DataFrame, Index, Series
 
 from graphit import __module__
+from graphit.graph_py2to3 import colabc, to_unicode
 from graphit.graph_storage_drivers.graph_driver_baseclass import GraphDriverBaseClass
 from graphit.graph_storage_drivers.graph_dictstorage_driver import DictStorage
 from graphit.graph_storage_drivers.graph_storage_views import AdjacencyView
@@ -22,6 +31,8 @@ from graphit.graph_storage_drivers.graph_storage_views import AdjacencyView
 __all__ = ['ArrayStorage', 'init_arraystorage_driver']
 logger = logging.getLogger(__module__)
 
+_REMOVED = object()
+
 
 def init_arraystorage_driver(nodes, edges, data):
     """
@@ -51,49 +62,350 @@ def init_arraystorage_driver(nodes, edges, data):
     return node_storage, edge_storage, adjacency_storage, data_storage
 
 
-class SeriesStorage(MutableMapping):
+def column_dtype(value):
+    """
+    Return the numpy data type for a column storing value
+
+    Booleans, integers and floats are stored in typed columns, all other
+    values in object columns.
+
+    :param value:   attribute value
+
+    :return:        numpy data type
+    """
+
+    if isinstance(value, (bool, numpy.bool_)):
+        return numpy.dtype(numpy.bool_)
+    if isinstance(value, (int, numpy.integer)) and -2**63 <= value < 2**63:
+        return numpy.dtype(numpy.int64)
+    if isinstance(value, (float, numpy.floating)):
+        return numpy.dtype(numpy.float64)
+
+    return numpy.dtype(object)
+
+
+class ColumnStore(object):
+    """
+    Row per node or edge column store
+
+    Stores the attributes of nodes or edges (keys) as rows in typed numpy
+    arrays, one for every attribute name (column), together with a boolean
+    array marking the rows for which the attribute is defined.
+    Arrays have spare capacity that grows by doubling. Removed rows are
+    marked and dropped when they exceed half of the rows.
+
+    A column is typed by the first values stored in it and converted to an
+    object column if a value of another type is stored later on so values
+    are returned as stored.
+
+    Values that are not a dictionary are stored in the 'key' column and the
+    key is registered in `scalars` to return the value as is.
+    """
+
+    def __init__(self):
+        """
+        Implement class __init__
+        """
+
+        self.keys = []
+        self.index = {}
+        self.columns = OrderedDict()
+        self.capacity = 0
+        self.removed = 0
+        self.scalars = set()
+        self.frame = None
+
+    def __len__(self):
+        """
+        Implement class __len__
+
+        :return:    number of rows not removed
+        :rtype:     :py:int
+        """
+
+        return len(self.index)
+
+    @staticmethod
+    def _resize(array, capacity):
+        """
+        Return a copy of array with a new capacity
+
+        :param array:       numpy array to resize
+        :type array:        :numpy:ndarray
+        :param capacity:    new array size
+        :type capacity:     :py:int
+
+        :rtype:             :numpy:ndarray
+        """
+
+        resized = numpy.zeros(capacity, dtype=array.dtype)
+        size = min(capacity, len(array))
+        resized[:size] = array[:size]
+
+        return resized
+
+    def _column(self, name, dtype):
+        """
+        Return the data and mask array of column name able to store values
+        of dtype. The column is created if needed or converted to an object
+        column if it has another type.
+
+        :param name:    column name
+        :param dtype:   numpy data type of the values to store
+
+        :return:        data and mask array
+        :rtype:         :py:tuple
+        """
+
+        if name not in self.columns:
+            self.columns[name] = (numpy.zeros(self.capacity, dtype=dtype),
+                                  numpy.zeros(self.capacity, dtype=numpy.bool_))
+        elif self.columns[name][0].dtype != dtype and self.columns[name][0].dtype != object:
+            data, mask = self.columns[name]
+            self.columns[name] = (data.astype(object), mask)
+
+        return self.columns[name]
+
+    def append(self, key):
+        """
+        Add a new row for key
+
+        :param key: node or edge key
+
+        :return:    row number
+        :rtype:     :py:int
+        """
+
+        row = len(self.keys)
+        self.reserve(row + 1)
+        self.keys.append(key)
+        self.index[key] = row
+
+        return row
+
+    def clear_row(self, row):
+        """
+        Remove all attributes of a row
+
+        :param row: row number
+        :type row:  :py:int
+        """
+
+        for data, mask in self.columns.values():
+            mask[row] = False
+        self.frame = None
+
+    def compact(self):
+        """
+        Drop removed rows and columns without values
+        """
+
+        rows = numpy.array([row for row, key in enumerate(self.keys) if key is not _REMOVED], dtype=numpy.int64)
+
+        columns = OrderedDict()
+        for name, (data, mask) in self.columns.items():
+            if mask[rows].any():
+                columns[name] = (data[rows], mask[rows])
+
+        self.keys = [self.keys[row] for row in rows]
+        self.index = dict([(key, row) for row, key in enumerate(self.keys)])
+        self.columns = columns
+        self.capacity = len(self.keys)
+        self.removed = 0
+        self.frame = None
+
+    def dataframe(self):
+        """
+        Return the column store as Pandas DataFrame
+
+        Rows are indexed by key. Undefined attributes are Nan. The DataFrame
+        is cached until the next change to the store.
+
+        :rtype: :pandas:DataFrame
+        """
+
+        if self.frame is None:
+            rows = [row for row, key in enumerate(self.keys) if key is not _REMOVED]
+
+            data = OrderedDict()
+            for name, (values, mask) in self.columns.items():
+                column = values[rows]
+                present = mask[rows]
+                if not present.all():
+                    column = column.astype(float if column.dtype == numpy.float64 else object)
+                    column[~present] = Nan
+                data[name] = column
+
+            self.frame = DataFrame(data, index=Index([self.keys[row] for row in rows], tupleize_cols=False,
+                                                     dtype=object))
+
+        return self.frame
+
+    def get_row(self, row, dropna=True):
+        """
+        Return the attributes of a row as dictionary
+
+        :param row:     row number
+        :type row:      :py:int
+        :param dropna:  drop undefined attributes instead of returning Nan
+        :type dropna:   :py:bool
+
+        :rtype:         :py:dict
+        """
+
+        values = {}
+        for name, (data, mask) in self.columns.items():
+            if mask[row]:
+                value = data[row]
+                values[name] = value.item() if isinstance(value, numpy.generic) else value
+            elif not dropna:
+                values[name] = Nan
+
+        return values
+
+    def get_value(self, row, name):
+        """
+        Return the value of attribute name for a row
+
+        :param row:     row number
+        :type row:      :py:int
+        :param name:    attribute name
+
+        :raises:        KeyError, attribute not defined
+        """
+
+        if name not in self.columns or not self.columns[name][1][row]:
+            raise KeyError(name)
+
+        value = self.columns[name][0][row]
+        return value.item() if isinstance(value, numpy.generic) else value
+
+    def iter_keys(self):
+        """
+        Iterate over the keys of rows not removed
+
+        :rtype: generator
+        """
+
+        for key in list(self.keys):
+            if key is not _REMOVED:
+                yield key
+
+    def remove(self, key):
+        """
+        Remove the row of key
+
+        :param key: node or edge key
+        """
+
+        row = self.index.pop(key)
+        self.scalars.discard(key)
+        self.clear_row(row)
+        self.keys[row] = _REMOVED
+        self.removed += 1
+
+        if self.removed > max(16, len(self.keys) // 2):
+            self.compact()
+
+    def reserve(self, rows):
+        """
+        Make sure the arrays have capacity for rows
+
+        :param rows:    number of rows
+        :type rows:     :py:int
+        """
+
+        if rows > self.capacity:
+            self.capacity = max(rows, 2 * self.capacity, 16)
+            for name, (data, mask) in self.columns.items():
+                self.columns[name] = (self._resize(data, self.capacity), self._resize(mask, self.capacity))
+
+    def set_column(self, name, rows, values):
+        """
+        Set the values of attribute name for multiple rows
+
+        :param name:    attribute name
+        :param rows:    row numbers
+        :type rows:     :py:list
+        :param values:  values with one value for every row
+        :type values:   :py:list
+        """
+
+        dtypes = set([column_dtype(value) for value in values])
+        dtype = dtypes.pop() if len(dtypes) == 1 else numpy.dtype(object)
+
+        data, mask = self._column(name, dtype)
+        if data.dtype == object:
+            for row, value in zip(rows, values):
+                data[row] = value
+        else:
+            data[rows] = values
+        mask[rows] = True
+        self.frame = None
+
+    def set_value(self, row, name, value):
+        """
+        Set the value of attribute name for a row
+
+        :param row:     row number
+        :type row:      :py:int
+        :param name:    attribute name
+        :param value:   attribute value
+        """
+
+        data, mask = self._column(name, column_dtype(value))
+        data[row] = value
+        mask[row] = True
+        self.frame = None
+
+
+class SeriesStorage(colabc.MutableMapping):
     """
     SeriesStorage class
 
-    Wrapper around the pandas Series object making it fully compliant with the
-    native Python dict API by using the `collections.MutableMapping` abstract
-    base class.
-    Access to the native pandas Series methods is preserved.
+    Dict-like access to the attributes of a single node or edge (row) in the
+    ArrayStorage column store, fully compliant with the native Python dict API
+    by using the `collections.MutableMapping` abstract base class.
+    Changes are written to the column store directly.
+    Access to the native pandas Series methods is preserved using a pandas
+    Series representation of the row.
     """
 
-    __slots__ = ('_storage', '_dropna')
+    __slots__ = ('_storage', '_key', '_dropna')
 
-    def __init__(self, series):
+    def __init__(self, storage, key):
         """
         Implement class __init__
 
-        Registers the Pandas series object in the _storage attribute.
-        The '_dropna' attribute controls if rows with Nan values are
-        removed before returning elements from the series
+        Registers the column store and the key of the row.
+        The '_dropna' attribute controls if undefined attributes (Nan values)
+        are skipped when iterating over the row.
 
-        :param series: Pandas Series instance
-        :type series:  :pandas:Series
+        :param storage: ArrayStorage column store
+        :type storage:  :graphit:graph_arraystorage_driver:ColumnStore
+        :param key:     node or edge key
         """
 
-        self._storage = series
+        self._storage = storage
+        self._key = key
         self._dropna = True
 
     def __getattr__(self, attr):
         """
         Implement class __getattr__
 
-        Exposes data by key as class attributes with support for calling
-        methods on the pandas Series instance.
-        If the key is not present, pass along to the default __getattribute__
-        method.
+        Exposes pandas Series methods and attributes using a Series
+        representation of the row.
+        If the attribute is not a Series attribute, pass along to the default
+        __getattribute__ method.
 
-        :param key: attribute name
+        :param attr: attribute name
 
         :return:    attribute value
         """
 
-        if hasattr(self._storage, attr):
-            return getattr(self._storage, attr)
+        if hasattr(Series, attr):
+            return getattr(self.series, attr)
 
         return object.__getattribute__(self, attr)
 
@@ -106,9 +418,12 @@ class SeriesStorage(MutableMapping):
         :return:    key value
         """
 
-        if self._dropna:
-            return self._storage.dropna()[key]
-        return self._storage[key]
+        try:
+            return self._storage.get_value(self._row, key)
+        except KeyError:
+            if not self._dropna and key in self._storage.columns:
+                return Nan
+            raise
 
     def __setitem__(self, key, value):
         """
@@ -118,94 +433,106 @@ class SeriesStorage(MutableMapping):
         :param value:   value to set
         """
 
-        self._storage.loc[key] = value
+        self._storage.set_value(self._row, to_unicode(key), to_unicode(value))
 
     def __delitem__(self, key):
         """
         Implement class __delitem__
 
-        Inplace removal (drop) of the key in the Series object.
-        The Series is a view on the origin DataFrame where the key will thus be
-        removed.
+        Removes the attribute from the row in the column store.
 
         :param key: key name
         """
 
-        self._storage.drop(labels=key, inplace=True)
+        row = self._row
+        self._storage.get_value(row, key)
+        self._storage.columns[key][1][row] = False
+        self._storage.frame = None
 
     def __iter__(self):
         """
         Implement class __iter__
 
-        Iterate over the keys of a Series after dropping rows with Nan values.
+        Iterate over the attribute names of the row skipping undefined
+        attributes (Nan values).
 
-        :return: Series keys
+        :return: attribute names
         """
 
-        if self._dropna:
-            return iter(self._storage.dropna().index)
-        return iter(self._storage.index)
+        return iter(self.to_dict(dropna=self._dropna))
 
     def __len__(self):
         """
         Implement class __len__
 
-        Return the number of key,value pairs in the Series after dropping Nan
-        values.
+        Return the number of attributes of the row skipping undefined
+        attributes (Nan values).
         """
 
-        if self._dropna:
-            return len(self._storage.dropna())
-        return len(self._storage)
+        return len(self.to_dict(dropna=self._dropna))
+
+    @property
+    def _row(self):
+        """
+        :return: row number of the node or edge in the column store
+        :rtype:  :py:int
+        """
+
+        row = self._storage.index.get(self._key)
+        if row is None:
+            raise KeyError(self._key)
+
+        return row
 
     @property
     def series(self):
         """
-        :return: the original pandas Series object
+        :return: pandas Series representation of the row
         :rtype:  :pandas:Series
         """
 
-        return self._storage
+        return Series(self.to_dict(dropna=False), name=self._key, dtype=object)
 
     def to_dict(self, dropna=True):
         """
-        Return a shallow copy of the Series as dictionary.
+        Return a shallow copy of the row as dictionary.
 
-        :param dropna: drop Series rows having Nan values
+        :param dropna: drop undefined attributes (Nan values)
         :type dropna:  :py:bool
 
         :rtype:        :py:dict
         """
 
-        if self._dropna or dropna:
-            return self._storage.dropna().to_dict()
-        return self._storage.to_dict()
+        return self._storage.get_row(self._row, dropna=self._dropna or dropna)
 
 
 class ArrayStorage(GraphDriverBaseClass):
     """
     ArrayStorage class
 
-    Provides a Pandas DataFrame based storage for nodes and edges.
-    The class supports weak referencing of the internal DataFrame (_storage)
-    using the weakref module to reduce memory footprint and enable true
-    synchronized views across different instances of the DictStorage class.
+    Provides a numpy array based column store for nodes and edges with one
+    row per node or edge accessible as Pandas DataFrame.
+    The class supports weak referencing of the internal column store
+    (_storage) using the weakref module to reduce memory footprint and enable
+    true synchronized views across different instances of the ArrayStorage
+    class.
     """
 
-    __slots__ = ('_storage', '_view')
+    __slots__ = ('_storage', '_view', '_data_pointer_key')
 
     def __init__(self, *args, **kwargs):
         """
         Implement class __init__
 
-        Initiate the internal _storage DataFrame.
-        If an ArrayStorage instance is provided, a _storage dictionary has been
-        created and we will setup a weak reference to it. Otherwise init
-        a new DataFrame using args and/or kwargs as input.
+        Initiate the internal _storage column store.
+        If an ArrayStorage instance is provided, a _storage column store has
+        been created and we will setup a weak reference to it. Otherwise add
+        the key, value pairs from args and/or kwargs as input.
         """
 
-        self._storage = DataFrame()
+        self._storage = ColumnStore()
         self._view = None
+        self._data_pointer_key = None
 
         if len(args):
             if not len(args) == 1:
@@ -216,30 +543,48 @@ class ArrayStorage(GraphDriverBaseClass):
             if isinstance(mappable, ArrayStorage):
                 self._storage = weakref.ref(mappable._storage)()
 
-            # mappable is any type accepted by the DataFrame constructor
+            # mappable is any type accepted by the dict constructor
             elif mappable is not None:
-                mappable = dict(mappable)
-                try:
-                    self._storage = DataFrame(mappable)
-                except:
-                    mappable = dict([(k, [v]) for k, v in mappable.items()])
-                    self._storage = DataFrame(mappable)
-
-            # no mappable, setup default DataFrame with optional kwargs
+                self.set_many(dict(mappable).items())
+
+            # no mappable, add optional kwargs
             else:
-                self._storage = DataFrame(kwargs)
+                self.set_many(kwargs.items())
         else:
-            self._storage = DataFrame(kwargs)
+            self.set_many(kwargs.items())
+
+    def __contains__(self, key):
+        """
+        Implement class __contains__
+
+        :param key: key to check existence for
+
+        :rtype:     :py:bool
+        """
+
+        if self.is_view:
+            return key in self._view
+        return key in self._storage.index
 
     def __delitem__(self, key):
+        """
+        Implement class __delitem__
+
+        If the storage class defines a data 'view' on the parent, remove the
+        key from the view.
+
+        :param key: key to remove
+
+        :raises:    KeyError, key not found
+        """
 
         if key not in self:
             raise KeyError(key)
 
         if self.is_view:
-            self._view.remove(key)
+            del self._view[key]
 
-        self._storage.drop([key], axis=1, inplace=True)
+        self._storage.remove(key)
 
     def __getitem__(self, key):
         """
@@ -248,21 +593,22 @@ class ArrayStorage(GraphDriverBaseClass):
         :param key: key name
 
         :return:    key value
+        :rtype:     SeriesStorage
         """
 
-        view = self._view_select()
-        result = view.loc[:, key]
-        if isinstance(result, Series):
-            return SeriesStorage(result)
+        if key not in self:
+            raise KeyError(key)
 
-        return result
+        if key in self._storage.scalars:
+            return self._storage.get_value(self._storage.index[key], u'key')
+        return SeriesStorage(self._storage, key)
 
     def __getattr__(self, key):
         """
         Implement class __getattr__
 
-        Exposes data by key as class attributes with support for calling
-        methods on the DataFrame instance.
+        Expose data by key as class attributes and DataFrame methods and
+        attributes on the DataFrame representation of the storage (view).
         If the key is not present, pass along to the default __getattribute__
         method.
 
@@ -271,13 +617,14 @@ class ArrayStorage(GraphDriverBaseClass):
         :return:    attribute value
         """
 
-        if hasattr(self._storage, key):
-            view_selection = self._view_select()
+        if key.startswith('_'):
+            return object.__getattribute__(self, key)
 
-            result = getattr(view_selection, key)
-            if isinstance(result, Series):
-                return SeriesStorage(result)
-            return result
+        if key in self:
+            return self[key]
+
+        if hasattr(DataFrame, key):
+            return getattr(self._view_select(), key)
 
         return object.__getattribute__(self, key)
 
@@ -288,38 +635,54 @@ class ArrayStorage(GraphDriverBaseClass):
         Iterate over keys in _storage
         """
 
-        view = self._view_select()
-        for key in view.keys():
-            yield key
+        if self.is_view:
+            return iter(list(self._view))
+
+        return self._storage.iter_keys()
 
     def __len__(self):
+        """
+        Implement class __len__
+
+        Returns the number of rows in the _storage or the selective view on it.
+        """
 
         if self.is_view:
             return len(self._view)
-        return len(self.keys())
+        return len(self._storage)
 
     def __setitem__(self, key, value):
+        """
+        Implement class __setitem__
+
+        :param key:     key name
+        :param value:   value to set
+        """
 
         self.set(key, value)
 
     @property
     def dataframe(self):
         """
-        :return: the original pandas DataFrame object
+        :return: DataFrame representation of the full storage
         :rtype:  :pandas:DataFrame
         """
 
-        return self._storage
+        return self._storage.dataframe()
 
     def _view_select(self):
+        """
+        Return the DataFrame representation of the storage or the selective
+        view on it.
+
+        :rtype: :pandas:DataFrame
+        """
 
-        view = self._storage
+        frame = self._storage.dataframe()
         if self.is_view:
-            view = self._storage.loc[:, self._storage.columns.intersection(self._view)]
+            frame = frame.iloc[frame.index.get_indexer(Index(list(self._view), tupleize_cols=False, dtype=object))]
 
-        if isinstance(view, Series):
-            return SeriesStorage(view)
-        return view
+        return frame
 
     def copy(self):
         """
@@ -330,7 +693,8 @@ class ArrayStorage(GraphDriverBaseClass):
         :rtype:     ArrayStorage
         """
 
-        deepcopy = ArrayStorage(self._storage.copy(deep=True))
+        deepcopy = ArrayStorage()
+        deepcopy._storage = copy.deepcopy(self._storage)
         if self.is_view:
             deepcopy.set_view(self._view)
 
@@ -357,39 +721,72 @@ class ArrayStorage(GraphDriverBaseClass):
         return None
 
     def get(self, key, default=None):
+        """
+        Implement dict-like `get` method
 
-        view_selection = self._view_select()
-        result = view_selection.get(key, default=default)
+        :param key:     key name
+        :param default: default value to return if key not found
 
-        if isinstance(result, Series):
-            return SeriesStorage(result)
-        return result
+        :return:        key value
+        :rtype:         SeriesStorage
+        """
 
-    def set(self, key, value):
+        if key in self:
+            return self[key]
+        return default
 
-        try:
-            value = dict(value)
-        except (ValueError, TypeError):
-            logging.debug('Unable to convert value to dictionary: {0}'.format(type(value)))
+    def pop(self, key, *default):
+        """
+        Implement dict-like `pop` method
+
+        Returns a dictionary copy of the removed row as the row no longer
+        exists in the column store after removal.
+
+        :param key:     key to remove
+        :param default: value to return if key not found
+
+        :raises:        KeyError, key not found and no default
+        """
 
-        index = ['key']
-        if isinstance(value, dict):
-            index = value.keys()
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
 
-        # Convert input dict to Series
-        s = Series(value, index=index)
+        value = self[key]
+        if isinstance(value, SeriesStorage):
+            value = value.to_dict()
+        del self[key]
 
-        # Add new series keys as row to DataFrame
-        for name in s.index:
-            if name not in self._storage.index:
-                self._storage.loc[name, :] = Nan
+        return value
 
-        # Update DataFrame
-        self._storage[key] = s
+    def popitem(self):
+        """
+        Implement dict-like `popitem` method
 
-        # If new key and is_view, add to view
-        if self.is_view:
-            self._view.append(key)
+        :return:    key and dictionary copy of the removed row
+        :rtype:     :py:tuple
+
+        :raises:    KeyError, storage is empty
+        """
+
+        for key in self:
+            return key, self.pop(key)
+
+        raise KeyError('popitem(): storage is empty')
+
+    def set(self, key, value):
+        """
+        Implement dictionary setter
+
+        A value that cannot be converted to a dictionary is stored as 'key'
+        attribute.
+
+        :param key:   dictionary key to add or update
+        :param value: key value
+        """
+
+        self.set_many([(key, value)])
 
     def set_data_reference(self, source, target):
         """
@@ -401,10 +798,57 @@ class ArrayStorage(GraphDriverBaseClass):
         """
 
         if source in self:
-            self[target] = self.get(source)
+            self[target] = self.get(source).to_dict()
         else:
             logging.error('Unable to set reference from source {0} to target {1}. Source does not exist.')
 
+    def set_many(self, items):
+        """
+        Implement batched dictionary setter
+
+        Rows for new keys are allocated in one go after which the values are
+        stored column by column. The value of existing keys is replaced.
+
+        :param items: key, value pairs to add or update
+        :type items:  iterable of :py:tuple
+        """
+
+        storage = self._storage
+
+        rows = OrderedDict()
+        for key, value in items:
+            key = to_unicode(key)
+            try:
+                value = dict(value)
+                storage.scalars.discard(key)
+            except (ValueError, TypeError):
+                logging.debug('Unable to convert value to dictionary: {0}'.format(type(value)))
+                value = {u'key': value}
+                storage.scalars.add(key)
+            rows[key] = value
+
+        storage.reserve(len(storage.keys) + len([key for key in rows if key not in storage.index]))
+
+        columns = OrderedDict()
+        for key, value in rows.items():
+            if key in storage.index:
+                row = storage.index[key]
+                storage.clear_row(row)
+            else:
+                row = storage.append(key)
+
+            # If new key and is_view, add to view
+            if self.is_view:
+                self._view[key] = None
+
+            for name, attr in value.items():
+                column = columns.setdefault(to_unicode(name), ([], []))
+                column[0].append(row)
+                column[1].append(to_unicode(attr))
+
+        for name, (column_rows, values) in columns.items():
+            storage.set_column(name, column_rows, values)
+
     def to_dict(self, return_full=False):
         """
         Return a shallow copy of the full dictionary.
@@ -419,18 +863,16 @@ class ArrayStorage(GraphDriverBaseClass):
         :rtype:             :py:dict
         """
 
-        view = self._storage
-        if not return_full:
-            view = self._view_select()
-
-        # Single row then single value per column index
-        if len(view.index) == 1:
-            row = view.loc[view.index[0], :]
-            return dict(zip(view.columns, row.values))
+        storage = self._storage
+        keys = storage.iter_keys() if return_full or not self.is_view else self._view
 
         return_dict = {}
-        for k, v in view.items():
-            return_dict[k] = v.dropna().to_dict()
+        for key in keys:
+            row = storage.index[key]
+            if key in storage.scalars:
+                return_dict[key] = storage.get_value(row, u'key')
+            else:
+                return_dict[key] = storage.get_row(row)
 
         return return_dict
 
@@ -438,29 +880,36 @@ class ArrayStorage(GraphDriverBaseClass):
         """
         Implements a Python dict style 'keys' method
 
-        Returns the keys of the DataFrame which equal the columns returned as
-        pandas Index object. This is subsequently returned as plain list.
-
-        :return:    dataframe column indexes (keys)
+        :return:    node or edge keys
         :rtype:     :py:list
         """
 
-        view = self._view_select()
-        return list(view.keys())
+        return list(self)
 
     iterkeys = keys
     viewkeys = keys
 
     def items(self):
+        """
+        Implements a Python dict style 'items' method
+
+        :return:    key, value pairs
+        :rtype:     generator
+        """
 
-        view = self._view_select()
-        for k, v in view.items():
-            yield (k, SeriesStorage(v))
+        for key in self:
+            yield (key, self[key])
 
     iteritems = items
     viewitems = items
 
     def values(self):
+        """
+        Implements a Python dict style 'values' method
+
+        :return:    value for every key
+        :rtype:     generator
+        """
 
         for item in self.items():
             yield item[1]
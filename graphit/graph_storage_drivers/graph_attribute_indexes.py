@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""
+file: graph_attribute_indexes.py
+
+Attribute indexes used by storage drivers to resolve node or edge attribute
+queries without evaluating all nodes or edges.
+
+* HashIndex: maps attribute values to the keys having them for constant time
+  equality lookup.
+* RangeIndex: keeps attribute values sorted for O(log N + k) range lookups
+  using the bisect module. Only numeric and date/time values are sorted,
+  other values are compared one by one on lookup.
+"""
+
+import bisect
+import datetime
+import numbers
+import operator
+
+from collections import OrderedDict
+
+__all__ = ['HashIndex', 'RangeIndex']
+
+
+class HashIndex(dict):
+    """
+    Hash index of attribute values to an insertion ordered dictionary of the
+    keys having the value.
+
+    Unhashable attribute values are not indexed.
+    """
+
+    __slots__ = ()
+
+    def add(self, value, key):
+        """
+        Register key for attribute value
+
+        :param value:   attribute value
+        :param key:     key having the attribute value
+        """
+
+        try:
+            self.setdefault(value, OrderedDict())[key] = None
+        except TypeError:
+            pass
+
+    def add_many(self, items):
+        """
+        Register keys for attribute values
+
+        :param items:   value, key pairs
+        :type items:    iterable of :py:tuple
+        """
+
+        for value, key in items:
+            self.add(value, key)
+
+    def lookup(self, value):
+        """
+        Return keys having the attribute value
+
+        :param value:   attribute value
+
+        :return:        keys or None if value is unhashable
+        :rtype:         :py:list
+        """
+
+        try:
+            return list(self.get(value, ()))
+        except TypeError:
+            return None
+
+    def remove(self, value, key):
+        """
+        Remove key for attribute value
+
+        :param value:   attribute value
+        :param key:     key having the attribute value
+        """
+
+        try:
+            keys = self.get(value)
+        except TypeError:
+            return
+
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del self[value]
+
+
+class RangeIndex(object):
+    """
+    Sorted index of attribute values and the keys having them
+
+    Values are kept sorted in a list together with a list of keys in the same
+    order. Lookup uses binary search (bisect) to find the bounds of a value
+    range.
+
+    All sorted values need to be mutually comparable. The index therefore
+    only sorts values of the same kind as the first value indexed: real
+    numbers, datetimes, dates, times or time deltas. Other values, booleans
+    and NaN are kept by key in `skipped` and compared to the bounds on every
+    lookup so that lookup results are complete.
+    """
+
+    __slots__ = ('values', 'keys', 'kind', 'skipped')
+
+    kinds = (datetime.datetime, datetime.date, datetime.time, datetime.timedelta, numbers.Real)
+
+    def __init__(self):
+        """
+        Implement class __init__
+        """
+
+        self.values = []
+        self.keys = []
+        self.kind = None
+        self.skipped = OrderedDict()
+
+    def __len__(self):
+
+        return len(self.values)
+
+    def _accepts(self, value):
+        """
+        Check if value can be compared to the indexed values
+
+        :param value:   attribute value
+
+        :rtype:         :py:bool
+        """
+
+        kind = self._kind(value)
+        return kind is not None and (self.kind is None or kind is self.kind)
+
+    def _kind(self, value):
+        """
+        Return the kind of value or None if it cannot be indexed
+
+        :param value:   attribute value
+        """
+
+        if isinstance(value, bool):
+            return None
+
+        for kind in self.kinds:
+            if isinstance(value, kind):
+                if value != value:
+                    return None
+                return kind
+
+        return None
+
+    def add(self, value, key):
+        """
+        Register key for attribute value
+
+        :param value:   attribute value
+        :param key:     key having the attribute value
+        """
+
+        if not self._accepts(value):
+            self.skipped[key] = value
+            return
+
+        self.kind = self._kind(value)
+        i = bisect.bisect_right(self.values, value)
+        self.values.insert(i, value)
+        self.keys.insert(i, key)
+
+    def add_many(self, items):
+        """
+        Register keys for attribute values
+
+        The pairs are sorted once together with the indexed values instead of
+        being inserted one by one, which costs O(N) per insert. Keys having
+        equal values keep the order in which they are added as for `add`.
+
+        :param items:   value, key pairs
+        :type items:    iterable of :py:tuple
+        """
+
+        accepted = []
+        for value, key in items:
+            if self._accepts(value):
+                self.kind = self._kind(value)
+                accepted.append((value, key))
+            else:
+                self.skipped[key] = value
+
+        if not accepted:
+            return
+
+        pairs = list(zip(self.values, self.keys)) + accepted
+        pairs.sort(key=operator.itemgetter(0))
+        self.values = [value for value, key in pairs]
+        self.keys = [key for value, key in pairs]
+
+    def lookup(self, value):
+        """
+        Return keys having the attribute value
+
+        :param value:   attribute value
+
+        :return:        keys or None if value cannot be indexed
+        :rtype:         :py:list
+        """
+
+        return self.range(lower=value, upper=value)
+
+    def range(self, lower=None, upper=None, include_lower=True, include_upper=True):
+        """
+        Return keys with attribute values in the range between lower and upper
+
+        :param lower:           lower bound of the range, no bound if None
+        :param upper:           upper bound of the range, no bound if None
+        :param include_lower:   include values equal to the lower bound
+        :type include_lower:    :py:bool
+        :param include_upper:   include values equal to the upper bound
+        :type include_upper:    :py:bool
+
+        :return:                keys sorted by attribute value followed by
+                                the keys of matching skipped values or None
+                                if the bounds cannot be compared to the
+                                sorted values
+        :rtype:                 :py:list
+        """
+
+        for bound in (lower, upper):
+            if bound is not None and not self._accepts(bound):
+                return None
+
+        start = 0
+        if lower is not None:
+            start = (bisect.bisect_left if include_lower else bisect.bisect_right)(self.values, lower)
+
+        end = len(self.values)
+        if upper is not None:
+            end = (bisect.bisect_right if include_upper else bisect.bisect_left)(self.values, upper)
+
+        keys = self.keys[start:end]
+        for key, value in self.skipped.items():
+            try:
+                if lower is not None and not (value >= lower if include_lower else value > lower):
+                    continue
+                if upper is not None and not (value <= upper if include_upper else value < upper):
+                    continue
+            except TypeError:
+                continue
+            keys.append(key)
+
+        return keys
+
+    def remove(self, value, key):
+        """
+        Remove key for attribute value
+
+        :param value:   attribute value
+        :param key:     key having the attribute value
+        """
+
+        if not self._accepts(value):
+            self.skipped.pop(key, None)
+            return
+
+        i = bisect.bisect_left(self.values, value)
+        end = bisect.bisect_right(self.values, value)
+        while i < end:
+            if self.keys[i] == key:
+                del self.values[i]
+                del self.keys[i]
+                return
+            i += 1
@@ -0,0 +1,942 @@
+# -*- coding: utf-8 -*-
+
+"""
+file: graph_csrstorage_driver.py
+
+Compact edge storage keeping the graph topology as integer indexed numpy
+arrays in Compressed Sparse Row (CSR) format.
+
+Node ID's are mapped to an integer index. The outgoing edges of a node are
+stored as a consecutive slice (`indptr`) of target node indices (`indices`).
+Edge attributes and data references are kept in side tables so an edge
+without attributes only costs a few bytes of array space instead of a tuple
+key and a dictionary. New edges are collected in a pending buffer that is
+merged into the CSR arrays when it grows large. Removed edges are masked until
+the next merge.
+
+Nodes and graph data are stored using the DictStorage driver as their number
+is typically small compared to the number of edges.
+"""
+
+import copy
+import weakref
+import logging
+
+import numpy
+
+from graphit import __module__
+from graphit.graph_py2to3 import to_unicode
+from graphit.graph_storage_drivers.graph_driver_baseclass import GraphDriverBaseClass
+from graphit.graph_storage_drivers.graph_dictstorage_driver import (DictStorage, DictAdjacencyView, KeysView,
+                                                                    ItemsView, ValuesView)
+
+__all__ = ['CSRStorage', 'CSRAdjacencyView', 'init_csrstorage_driver']
+
+logger = logging.getLogger(__module__)
+
+DATA_POINTER_KEY = u'$data_ref'
+
+
+def init_csrstorage_driver(nodes, edges, data):
+    """
+    CSRStorage specific driver initiation method
+
+    Returns a DictStorage instance for nodes, a CSRStorage instance for edges
+    and a CSRAdjacencyView for adjacency based on the initiated nodes and
+    edges stores.
+
+    :param nodes: Nodes to initiate nodes DictStorage instance
+    :type nodes:  :py:list, :py:dict,
+                  :graphit:graph_dictstorage_driver:DictStorage
+    :param edges: Edges to initiate edges CSRStorage instance
+    :type edges:  :py:list, :py:dict,
+                  :graphit:graph_csrstorage_driver:CSRStorage
+    :param data:  graph data attributes to initiate data DictStorage instance
+    :type data:   :py:list, :py:dict,
+                  :graphit:graph_dictstorage_driver:DictStorage
+
+    :return:      Nodes and edges storage instances and Adjacency view.
+    """
+
+    node_storage = DictStorage(nodes)
+    edge_storage = CSRStorage(edges)
+    data_storage = DictStorage(data)
+    adjacency_storage = CSRAdjacencyView(node_storage, edge_storage)
+
+    return node_storage, edge_storage, adjacency_storage, data_storage
+
+
+class CSRArrays(object):
+    """
+    Edge topology in Compressed Sparse Row format
+
+    Edges are identified by a position. Positions below the number of edges
+    in the CSR arrays refer to the CSR arrays, higher positions to the pending
+    buffer of new edges. Positions are stable until the next call to
+    `compact` that merges the pending buffer into the CSR arrays and drops
+    removed edges.
+
+    Side tables:
+
+    * values: edge position to edge value. Empty values are not stored.
+    * refs: position of the edge holding the data of the edge (data
+      reference) or -1.
+    """
+
+    compact_threshold = 4096
+
+    def __init__(self):
+        """
+        Implement class __init__
+
+        Initiate empty CSR arrays and pending buffer
+        """
+
+        self.nodes = []
+        self.node_index = {}
+
+        self.indptr = numpy.zeros(1, dtype=numpy.int64)
+        self.indices = numpy.zeros(0, dtype=numpy.int64)
+        self.alive = numpy.zeros(0, dtype=numpy.bool_)
+        self.refs = numpy.zeros(0, dtype=numpy.int64)
+        self.reverse = None
+
+        self.values = {}
+        self.size = 0
+        self.dead = 0
+        self.referenced = 0
+        self.unpaired = 0
+
+        self._reset_pending()
+
+    def __len__(self):
+        """
+        Implement class __len__
+
+        :return:    number of edges
+        :rtype:     :py:int
+        """
+
+        return self.size
+
+    def _reset_pending(self):
+        """
+        Clear the pending buffer of new edges
+        """
+
+        self.pending_src = []
+        self.pending_dst = []
+        self.pending_refs = []
+        self.pending_alive = []
+        self.pending_index = {}
+        self.pending_successors = {}
+        self.pending_predecessors = {}
+
+    def _edge(self, position):
+        """
+        Return the (source, target) node index tuple of the edge at position
+
+        :param position:    edge position
+        :type position:     :py:int
+
+        :rtype:             :py:tuple
+        """
+
+        m = len(self.indices)
+        if position < m:
+            return int(numpy.searchsorted(self.indptr, position, side='right')) - 1, int(self.indices[position])
+        return self.pending_src[position - m], self.pending_dst[position - m]
+
+    def _is_pair(self, position, other):
+        """
+        Check if the edges at position and other connect the same nodes in
+        opposite direction.
+
+        :param position:    edge position
+        :type position:     :py:int
+        :param other:       edge position
+        :type other:        :py:int
+
+        :rtype:             :py:bool
+        """
+
+        return self._edge(position) == self._edge(other)[::-1]
+
+    def _position(self, s, t):
+        """
+        Return the position of the edge between node indices s and t
+
+        :param s:   source node index
+        :type s:    :py:int
+        :param t:   target node index
+        :type t:    :py:int
+
+        :return:    edge position or -1 if not found
+        :rtype:     :py:int
+        """
+
+        if s < len(self.indptr) - 1:
+            start, stop = self.indptr[s], self.indptr[s + 1]
+            if start < stop:
+                for hit in (self.indices[start:stop] == t).nonzero()[0]:
+                    if self.alive[start + hit]:
+                        return int(start + hit)
+
+        return self.pending_index.get((s, t), -1)
+
+    def _reverse_index(self):
+        """
+        Return the reverse (predecessor) index of the CSR arrays
+
+        The index is build on first request after a `compact`.
+
+        :return:    index pointer, CSR positions and source node indices
+                    sorted by target node index
+        :rtype:     :py:tuple
+        """
+
+        if self.reverse is None:
+            rows = numpy.repeat(numpy.arange(len(self.indptr) - 1, dtype=numpy.int64), numpy.diff(self.indptr))
+            rpos = numpy.argsort(self.indices, kind='mergesort')
+            counts = numpy.bincount(self.indices, minlength=len(self.indptr) - 1)
+            rindptr = numpy.concatenate(([0], numpy.cumsum(counts))).astype(numpy.int64)
+            self.reverse = (rindptr, rpos, rows[rpos])
+
+        return self.reverse
+
+    def append(self, source, target):
+        """
+        Add a new edge to the pending buffer
+
+        :param source:  source node ID
+        :param target:  target node ID
+
+        :return:        position of the new edge
+        :rtype:         :py:int
+        """
+
+        s = self.index(source, create=True)
+        t = self.index(target, create=True)
+        position = len(self.indices) + len(self.pending_src)
+
+        self.pending_src.append(s)
+        self.pending_dst.append(t)
+        self.pending_refs.append(-1)
+        self.pending_alive.append(True)
+        self.pending_index[(s, t)] = position
+        self.pending_successors.setdefault(s, []).append(position)
+        self.pending_predecessors.setdefault(t, []).append(position)
+        self.size += 1
+
+        return position
+
+    def compact(self):
+        """
+        Merge the pending buffer into the CSR arrays and drop removed edges
+
+        Edges are ordered by source node index preserving the insertion order
+        of the edges of a node. Edge positions change.
+        """
+
+        src = numpy.concatenate((numpy.repeat(numpy.arange(len(self.indptr) - 1, dtype=numpy.int64),
+                                              numpy.diff(self.indptr)),
+                                 numpy.array(self.pending_src, dtype=numpy.int64)))
+        dst = numpy.concatenate((self.indices, numpy.array(self.pending_dst, dtype=numpy.int64)))
+        alive = numpy.concatenate((self.alive, numpy.array(self.pending_alive, dtype=numpy.bool_)))
+        refs = numpy.concatenate((self.refs, numpy.array(self.pending_refs, dtype=numpy.int64)))
+
+        order = numpy.flatnonzero(alive)
+        order = order[numpy.argsort(src[order], kind='mergesort')]
+        new_positions = numpy.full(len(src), -1, dtype=numpy.int64)
+        new_positions[order] = numpy.arange(len(order), dtype=numpy.int64)
+
+        counts = numpy.bincount(src[order], minlength=len(self.nodes))
+        self.indptr = numpy.concatenate(([0], numpy.cumsum(counts))).astype(numpy.int64)
+        self.indices = dst[order]
+        self.alive = numpy.ones(len(order), dtype=numpy.bool_)
+
+        refs = refs[order]
+        linked = refs >= 0
+        refs[linked] = new_positions[refs[linked]]
+        self.refs = refs
+
+        self.values = dict([(int(new_positions[position]), value) for position, value in self.values.items()])
+        self.reverse = None
+        self.dead = 0
+        self._reset_pending()
+
+    def get_ref(self, position):
+        """
+        Return the position of the edge holding the data of the edge at
+        position or -1 if there is no data reference.
+
+        :param position:    edge position
+        :type position:     :py:int
+
+        :rtype:             :py:int
+        """
+
+        m = len(self.indices)
+        if position < m:
+            return int(self.refs[position])
+        return self.pending_refs[position - m]
+
+    def index(self, node, create=False):
+        """
+        Return the integer index of a node ID
+
+        :param node:    node ID
+        :param create:  register the node ID if not known
+        :type create:   :py:bool
+
+        :return:        node index or None
+        :rtype:         :py:int
+        """
+
+        idx = self.node_index.get(node)
+        if idx is None and create:
+            idx = len(self.nodes)
+            self.nodes.append(node)
+            self.node_index[node] = idx
+
+        return idx
+
+    def iter_edges(self):
+        """
+        Iterate over all edges as (source, target) node ID tuples
+
+        :rtype: generator
+        """
+
+        nodes = self.nodes
+        rows = numpy.repeat(numpy.arange(len(self.indptr) - 1, dtype=numpy.int64), numpy.diff(self.indptr))
+        for s, t in zip(rows[self.alive].tolist(), self.indices[self.alive].tolist()):
+            yield nodes[s], nodes[t]
+
+        for s, t, alive in list(zip(self.pending_src, self.pending_dst, self.pending_alive)):
+            if alive:
+                yield nodes[s], nodes[t]
+
+    def key(self, position):
+        """
+        Return the (source, target) node ID tuple of the edge at position
+
+        :param position:    edge position
+        :type position:     :py:int
+
+        :rtype:             :py:tuple
+        """
+
+        s, t = self._edge(position)
+        return self.nodes[s], self.nodes[t]
+
+    def maybe_compact(self):
+        """
+        Compact the arrays when the pending buffer or the number of removed
+        edges grows large relative to the number of edges in the CSR arrays.
+        """
+
+        m = len(self.indices)
+        if len(self.pending_src) > max(self.compact_threshold, m // 4) or \
+                self.dead > max(self.compact_threshold, m // 2):
+            self.compact()
+
+    def position(self, source, target):
+        """
+        Return the position of the edge between source and target
+
+        :param source:  source node ID
+        :param target:  target node ID
+
+        :return:        edge position or -1 if not found
+        :rtype:         :py:int
+        """
+
+        s = self.node_index.get(source)
+        t = self.node_index.get(target)
+        if s is None or t is None:
+            return -1
+
+        return self._position(s, t)
+
+    def predecessors(self, t):
+        """
+        Return the source node indices of the edges to a node
+
+        :param t:   node index
+        :type t:    :py:int
+
+        :rtype:     :py:list
+        """
+
+        sources = []
+        rindptr, rpos, rsrc = self._reverse_index()
+        if t < len(rindptr) - 1:
+            start, stop = rindptr[t], rindptr[t + 1]
+            sources = rsrc[start:stop][self.alive[rpos[start:stop]]].tolist()
+
+        m = len(self.indices)
+        sources.extend([self.pending_src[position - m] for position in self.pending_predecessors.get(t, ())])
+
+        return sources
+
+    def referrers(self, position):
+        """
+        Return the positions of edges with a data reference to the edge at
+        position.
+
+        Data references are typically defined between the two edges of an
+        undirected edge pair. If all references are of this type only the
+        reverse edge is checked, otherwise all references are scanned.
+
+        :param position:    edge position
+        :type position:     :py:int
+
+        :rtype:             :py:list
+        """
+
+        if not self.referenced:
+            return []
+
+        if not self.unpaired:
+            s, t = self._edge(position)
+            reverse = self._position(t, s)
+            if reverse >= 0 and self.get_ref(reverse) == position:
+                return [reverse]
+            return []
+
+        m = len(self.indices)
+        referrers = numpy.flatnonzero(self.refs == position).tolist()
+        referrers.extend([m + i for i, ref in enumerate(self.pending_refs) if ref == position])
+
+        return referrers
+
+    def remove(self, position):
+        """
+        Remove the edge at position
+
+        :param position:    edge position
+        :type position:     :py:int
+        """
+
+        self.set_ref(position, -1)
+        self.values.pop(position, None)
+
+        m = len(self.indices)
+        if position < m:
+            self.alive[position] = False
+        else:
+            i = position - m
+            s, t = self.pending_src[i], self.pending_dst[i]
+            self.pending_alive[i] = False
+            del self.pending_index[(s, t)]
+            self.pending_successors[s].remove(position)
+            self.pending_predecessors[t].remove(position)
+
+        self.size -= 1
+        self.dead += 1
+
+    def set_ref(self, position, source):
+        """
+        Set the position of the edge holding the data of the edge at position
+
+        :param position:    edge position
+        :type position:     :py:int
+        :param source:      position of edge holding the data or -1 to remove
+                            the data reference.
+        :type source:       :py:int
+        """
+
+        current = self.get_ref(position)
+        self.referenced += (source >= 0) - (current >= 0)
+        self.unpaired += (source >= 0 and not self._is_pair(position, source)) - \
+            (current >= 0 and not self._is_pair(position, current))
+
+        m = len(self.indices)
+        if position < m:
+            self.refs[position] = source
+        else:
+            self.pending_refs[position - m] = source
+
+    def successors(self, s):
+        """
+        Return the target node indices of the edges from a node
+
+        :param s:   node index
+        :type s:    :py:int
+
+        :rtype:     :py:list
+        """
+
+        targets = []
+        if s < len(self.indptr) - 1:
+            start, stop = self.indptr[s], self.indptr[s + 1]
+            targets = self.indices[start:stop][self.alive[start:stop]].tolist()
+
+        m = len(self.indices)
+        targets.extend([self.pending_dst[position - m] for position in self.pending_successors.get(s, ())])
+
+        return targets
+
+
+class CSREdgeValue(dict):
+    """
+    Attribute dictionary of an edge without stored value
+
+    Returned on access to edges without attributes. The dictionary is only
+    added to the values side table of the CSR arrays when it is changed, so
+    reading edges does not allocate a stored dictionary for every edge.
+    Copies and pickles are native Python dictionaries.
+    """
+
+    __slots__ = ('_storage', '_key')
+
+    def __init__(self, storage, key):
+        """
+        Implement class __init__
+
+        :param storage: CSR arrays storing the edge
+        :type storage:  CSRArrays
+        :param key:     (source, target) node ID tuple of the edge
+        :type key:      :py:tuple
+        """
+
+        super(CSREdgeValue, self).__init__()
+        self._storage = storage
+        self._key = key
+
+    def __copy__(self):
+
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+
+        super(CSREdgeValue, self).__setitem__(key, value)
+        self._store()
+
+    def _store(self):
+        """
+        Add the dictionary to the values side table if the edge still exists.
+        If a value was stored for the edge in the mean time, the changes are
+        added to that value.
+        """
+
+        position = self._storage.position(*self._key)
+        if position < 0:
+            return
+
+        value = self._storage.values.get(position)
+        if value is None:
+            self._storage.values[position] = self
+        elif value is not self:
+            value.update(self)
+
+    def setdefault(self, key, default=None):
+
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def update(self, *args, **kwargs):
+
+        super(CSREdgeValue, self).update(*args, **kwargs)
+        self._store()
+
+
+class CSRAdjacencyView(DictAdjacencyView):
+    """
+    Adjacency View class for the CSRStorage driver
+
+    Resolves node neighbours and predecessors from the CSR arrays of the edge
+    CSRStorage.
+    """
+
+    def _neighbours(self, node, reverse=False):
+        """
+        Return the neighbour nodes of node in the full edge storage
+
+        :param node:    node to return neighbours for
+        :param reverse: return predecessor nodes instead
+        :type reverse:  :py:bool
+
+        :rtype:         :py:list
+        """
+
+        return self.edges.neighbours(node, reverse=reverse)
+
+
+class CSRStorage(GraphDriverBaseClass):
+    """
+    CSRStorage class
+
+    Provides a Python dict like edge storage with (source, target) node ID
+    tuples as keys backed by compact CSR arrays (CSRArrays).
+    The class supports weak referencing of the internal CSRArrays (_storage)
+    using the `weakref` module enabling true synchronized views across
+    different instances of the CSRStorage class.
+
+    Edge values are stored in a side table. Edges without attributes have no
+    value stored. Accessing them returns an empty attribute dictionary
+    (CSREdgeValue) that is only stored when it is updated in place.
+    """
+
+    __slots__ = ('_storage', '_view', '_data_pointer_key')
+
+    def __init__(self, *args, **kwargs):
+        """
+        Implement class __init__
+
+        Initiate the internal _storage CSRArrays.
+        If a CSRStorage instance is provided, setup a weak reference to its
+        _storage. Otherwise add the edges from any mapping accepted by the
+        native Python dict constructor.
+        """
+
+        self._view = None
+        self._storage = CSRArrays()
+        self._data_pointer_key = DATA_POINTER_KEY
+
+        if len(args):
+            if not len(args) == 1:
+                raise TypeError('update expected at most 1 arguments, got {0}'.format(len(args)))
+            mappable = args[0]
+
+            # mappable is CSRStorage instance, setup weakref to _storage
+            if isinstance(mappable, CSRStorage):
+                self._storage = weakref.ref(mappable._storage)()
+
+            # mappable is any type accepted by the dict class constructor
+            elif mappable is not None:
+                self.set_many(dict(mappable).items())
+        elif kwargs:
+            self.set_many(kwargs.items())
+
+    def __contains__(self, item):
+        """
+        Implement class __contains__
+
+        :param item: edge key to check existence for
+
+        :rtype:      :py:bool
+        """
+
+        if self.is_view:
+            return item in self._view
+        return isinstance(item, tuple) and len(item) == 2 and self._storage.position(*item) >= 0
+
+    def __delitem__(self, key):
+        """
+        Implement class abstract method __delitem__
+
+        If the storage class defines a data 'view' on the parent, remove the
+        key from the view.
+
+        Prevent orphan data pointers by copying the value of the edge to all
+        edges that have a data reference to it.
+
+        :param key: key to remove
+
+        :raises:    KeyError, key not found
+        """
+
+        if key not in self:
+            raise KeyError(key)
+
+        if self.is_view:
+            del self._view[key]
+
+        storage = self._storage
+        position = storage.position(*key)
+
+        # resolve orphan data pointers
+        if self._data_pointer_key is not None:
+            value = storage.values.get(position)
+            for target in storage.referrers(position):
+                storage.set_ref(target, -1)
+                if value:
+                    storage.values[target] = copy.copy(value)
+
+        storage.remove(position)
+        storage.maybe_compact()
+
+    def __getitem__(self, key):
+        """
+        Implement class abstract method __getitem__
+
+        Resolve data references to the value of the referred edge.
+        Within the data reference free context (with storage) an edge with a
+        data reference returns a value with the self._data_pointer_key.
+
+        :param key: edge to return value for
+
+        :raises:    KeyError, key not found
+        """
+
+        if key not in self:
+            raise KeyError(key)
+
+        storage = self._storage
+        position = storage.position(*key)
+
+        ref = storage.get_ref(position)
+        if ref >= 0:
+            if self._data_pointer_key is None:
+                return {DATA_POINTER_KEY: storage.key(ref)}
+            position = ref
+
+        value = storage.values.get(position)
+        if value is None:
+            return CSREdgeValue(storage, storage.key(position))
+        return value
+
+    def __getstate__(self):
+        """
+        Implement class __getstate__
+
+        Enables the class to be pickled. Required because the class uses
+        __slots__
+
+        :return:    object content for pickling
+        :rtype:     :py:dict
+        """
+
+        state = {}
+        for key in self.__slots__:
+            state[key] = getattr(self, key)
+
+        return state
+
+    def __setitem__(self, key, value):
+        """
+        Implement class abstract method __setitem__
+
+        If the storage class defines a data 'view' on the parent, add the new
+        key to the view.
+        Resolve data references and set new value on the referred edge.
+        A value with a self._data_pointer_key defines a data reference.
+
+        :param key:     edge to set value for
+        :param value:   value to set
+
+        :raises:        TypeError, key not a (source, target) tuple
+        """
+
+        key = to_unicode(key)
+        if not (isinstance(key, tuple) and len(key) == 2):
+            raise TypeError('CSRStorage key should be a (source, target) tuple, got: {0}'.format(repr(key)))
+
+        storage = self._storage
+        position = storage.position(*key)
+        if position >= 0 and (not self.is_view or key in self._view):
+            if self._data_pointer_key is not None:
+                ref = storage.get_ref(position)
+                position = ref if ref >= 0 else position
+        else:
+            if self.is_view:
+                self._view[key] = None
+            if position < 0:
+                position = storage.append(*key)
+
+        value = to_unicode(value)
+
+        storage.set_ref(position, -1)
+        if isinstance(value, dict) and DATA_POINTER_KEY in value:
+            source = value[DATA_POINTER_KEY]
+            source_position = storage.position(*source) if isinstance(source, tuple) and len(source) == 2 else -1
+            if 0 <= source_position != position:
+                storage.set_ref(position, source_position)
+                storage.values.pop(position, None)
+                storage.maybe_compact()
+                return
+
+            logging.warning('"{0}" defines a reference ({1}) to non-existing "{2}"'.format(
+                key, DATA_POINTER_KEY, source))
+            value = dict([(k, v) for k, v in value.items() if k != DATA_POINTER_KEY])
+
+        if isinstance(value, dict) and not value:
+            storage.values.pop(position, None)
+        else:
+            storage.values[position] = value
+
+        storage.maybe_compact()
+
+    def __setstate__(self, state):
+        """
+        Implement class __setstate__
+
+        Enables the class to be unpickled. Required because the class uses
+        __slots__
+
+        :param state:    object content for unpickling
+        :type state:     :py:dict
+        """
+
+        for key, value in state.items():
+            if key in self.__slots__:
+                setattr(self, key, value)
+
+    def __iter__(self):
+        """
+        Implement class __iter__
+
+        Iterate over edges in _storage
+        """
+
+        if self.is_view:
+            return iter(self._view)
+
+        return self._storage.iter_edges()
+
+    def __len__(self):
+        """
+        Implement class __len__
+
+        Returns the number of edges in the _storage or the selective view on it.
+        """
+
+        if self.is_view:
+            return len(self._view)
+
+        return len(self._storage)
+
+    def compact(self):
+        """
+        Merge pending edges into the CSR arrays and drop removed edges
+        """
+
+        self._storage.compact()
+
+    def copy(self):
+        """
+        Return a deep copy of the storage class with the same view as
+        the parent instance.
+
+        :return:    deep copy of storage instance
+        :rtype:     CSRStorage
+        """
+
+        deepcopy = self._get_class_object()()
+        deepcopy._storage = copy.deepcopy(self._storage)
+        if self.is_view:
+            deepcopy.set_view(self._view)
+
+        return deepcopy
+
+    def del_data_reference(self, target):
+        """
+        Remove data reference in target
+
+        :param target: key of target to remove the data reference from
+        """
+
+        if target in self:
+            self._storage.set_ref(self._storage.position(*target), -1)
+
+    def get_data_reference(self, target, default=None):
+        """
+        Check if the edge defines a reference to the data of another edge.
+
+        :param target:  key to check
+        :param default: default to return if there is no data reference
+
+        :return:        referred key or default
+        :raises:        KeyError, key not found
+        """
+
+        position = self._storage.position(*target)
+        if position < 0:
+            raise KeyError(target)
+
+        ref = self._storage.get_ref(position)
+        if ref >= 0:
+            return self._storage.key(ref)
+        return default
+
+    def neighbours(self, node, reverse=False):
+        """
+        Return the neighbour nodes of node in the full storage
+
+        :param node:    node ID to return neighbours for
+        :param reverse: return predecessor nodes instead
+        :type reverse:  :py:bool
+
+        :return:        node ID's
+        :rtype:         :py:list
+        """
+
+        storage = self._storage
+        idx = storage.node_index.get(node)
+        if idx is None:
+            return []
+
+        if reverse:
+            return [storage.nodes[s] for s in storage.predecessors(idx)]
+        return [storage.nodes[t] for t in storage.successors(idx)]
+
+    def set_many(self, items):
+        """
+        Implement batched dictionary setter
+
+        Data references are set after all other items so they may refer to
+        edges defined later on in the batch.
+
+        :param items: key, value pairs to add or update
+        :type items:  iterable of :py:tuple
+        """
+
+        references = []
+        for key, value in items:
+            if isinstance(value, dict) and DATA_POINTER_KEY in value:
+                references.append((value[DATA_POINTER_KEY], key))
+            else:
+                self.__setitem__(key, value)
+
+        self.set_data_references(references)
+
+    def items(self):
+        """
+        Implement Python 3 dictionary like 'items' method that returns a
+        DictView class.
+
+        :return: dictionary items as tuple of key/value pairs
+        :rtype:  ItemsView instance
+        """
+
+        return ItemsView(self)
+
+    iteritems = items
+
+    def keys(self):
+        """
+        Implement Python 3 dictionary like 'keys' method that returns a DictView
+        class.
+
+        :return: dictionary keys
+        :rtype:  KeysView instance
+        """
+
+        return KeysView(self)
+
+    iterkeys = keys
+
+    def values(self):
+        """
+        Implement Python 3 dictionary like 'values' method that returns a DictView
+        class.
+
+        :return: dictionary values
+        :rtype:  ValuesView instance
+        """
+
+        return ValuesView(self)
+
+    itervalues = values
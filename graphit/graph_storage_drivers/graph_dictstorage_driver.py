@@ -8,18 +8,35 @@ and adjacency information.
 
 Based on GraphDriverBaseClass it implements key, value and items abstract
 methods using the Python 3.x concept of view based representations with the
-added feature to define views as data mask on the storage level.
+added feature to define views as data mask on the storage level. A view is
+stored as an insertion ordered dictionary of keys allowing constant time
+membership tests and key removal while preserving the order of the keys.
+
+Edge storage maintains an adjacency and a reverse (predecessor) adjacency index
+that are updated in place when edges are added or removed. The
+DictAdjacencyView uses these indexes to resolve node neighbours and
+predecessors without scanning all edges in the graph.
+
+Optional hash or range indexes on node or edge attributes map attribute values
+to the keys having them. Values of an indexed storage are stored as
+IndexedRecord dictionaries that update the indexes when their attributes
+change.
 """
 
+import copy
 import weakref
 import logging
 
+from collections import OrderedDict
+
 from graphit import __module__
 from graphit.graph_py2to3 import colabc, to_unicode
+from graphit.graph_exceptions import GraphitNodeNotFound
 from graphit.graph_storage_drivers.graph_driver_baseclass import GraphDriverBaseClass
+from graphit.graph_storage_drivers.graph_attribute_indexes import HashIndex, RangeIndex
 from graphit.graph_storage_drivers.graph_storage_views import AdjacencyView
 
-__all__ = ['DictStorage', 'init_dictstorage_driver']
+__all__ = ['DictStorage', 'DictAdjacencyView', 'init_dictstorage_driver']
 
 logger = logging.getLogger(__module__)
 
@@ -28,8 +45,10 @@ def init_dictstorage_driver(nodes, edges, data):
     """
     DictStorage specific driver initiation method
 
-    Returns a DictStorage instance for nodes and edges and a AdjacencyView
-    for adjacency based on the initiated nodes and edges stores.
+    Returns a DictStorage instance for nodes and edges and a
+    DictAdjacencyView for adjacency based on the initiated nodes and edges
+    stores. The adjacency index of the edge store is shared by all storage
+    instances (views) derived from it and updated in place.
 
     :param nodes: Nodes to initiate nodes DictStorage instance
     :type nodes:  :py:list, :py:dict,
@@ -47,7 +66,9 @@ def init_dictstorage_driver(nodes, edges, data):
     node_storage = DictStorage(nodes)
     edge_storage = DictStorage(edges)
     data_storage = DictStorage(data)
-    adjacency_storage = AdjacencyView(node_storage, edge_storage)
+
+    edge_storage.adjacency_index()
+    adjacency_storage = DictAdjacencyView(node_storage, edge_storage)
 
     return node_storage, edge_storage, adjacency_storage, data_storage
 
@@ -56,8 +77,321 @@ class DictWrapper(dict):
     """
     Dummy wrapper around Python's native dict class to allow it to be weakly
     referenced by the weakref module.
+
+    The wrapper also holds the (optional) adjacency and predecessor indexes
+    of an edge store together with a cache of data derived from them, the
+    reverse data reference index and the attribute indexes so they are
+    shared by every DictStorage instance referring to it.
+    Attribute indexes and the adjacency cache are not copied or pickled.
+    """
+
+    adjacency = None
+    adjacency_cache = None
+    predecessors = None
+    references = None
+    indexes = None
+
+    def __getstate__(self):
+
+        state = dict(self.__dict__)
+        state.pop('indexes', None)
+        state.pop('adjacency_cache', None)
+
+        return state
+
+
+class IndexedRecord(dict):
+    """
+    Dictionary value of a key in a DictStorage with attribute indexes
+
+    Changes made to indexed attributes update the attribute indexes. Every
+    change increments the record `version` allowing results derived from the
+    record to be cached until it changes. In place changes to mutable
+    attribute values are not detected.
+    Copies and pickles of the record are native Python dictionaries.
+    """
+
+    __slots__ = ('_indexes', '_key', 'version')
+
+    def __init__(self, indexes, key, *args, **kwargs):
+        """
+        Implement class __init__
+
+        :param indexes: attribute indexes of the storage
+        :type indexes:  :py:dict
+        :param key:     key of the record in the storage
+        """
+
+        super(IndexedRecord, self).__init__(*args, **kwargs)
+        self._indexes = indexes
+        self._key = key
+        self.version = 0
+
+    def __copy__(self):
+
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+
+        index = self._indexes.get(key)
+        if index is not None:
+            if key in self:
+                index.remove(self[key], self._key)
+            index.add(value, self._key)
+
+        super(IndexedRecord, self).__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+
+        index = self._indexes.get(key)
+        if index is not None and key in self:
+            index.remove(self[key], self._key)
+
+        super(IndexedRecord, self).__delitem__(key)
+        self.version += 1
+
+    def clear(self):
+
+        self.unindex()
+        super(IndexedRecord, self).clear()
+        self.version += 1
+
+    def index(self):
+        """
+        Register all indexed attributes of the record in the indexes
+        """
+
+        for key, index in self._indexes.items():
+            if key in self:
+                index.add(self[key], self._key)
+
+    def pop(self, key, *args):
+
+        index = self._indexes.get(key)
+        if index is not None and key in self:
+            index.remove(self[key], self._key)
+
+        self.version += 1
+        return super(IndexedRecord, self).pop(key, *args)
+
+    def popitem(self):
+
+        key, value = super(IndexedRecord, self).popitem()
+        self.version += 1
+        index = self._indexes.get(key)
+        if index is not None:
+            index.remove(value, self._key)
+
+        return key, value
+
+    def setdefault(self, key, default=None):
+
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def unindex(self):
+        """
+        Remove all indexed attributes of the record from the indexes
+        """
+
+        for key, index in self._indexes.items():
+            if key in self:
+                index.remove(self[key], self._key)
+
+    def update(self, *args, **kwargs):
+
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class DictAdjacencyView(AdjacencyView):
+    """
+    Adjacency View class for the DictStorage driver
+
+    Resolves node adjacency using the adjacency index maintained by the edge
+    DictStorage instead of building it from all edges in the graph. A node
+    neighbour lookup thereby scales with the node degree rather than with the
+    number of edges in the graph. The same is true for predecessor lookup and
+    indegree using the reverse adjacency index.
+
+    Neighbour lookup is delegated to the `_neighbours` method that may be
+    overloaded by drivers using another type of adjacency index.
     """
-    pass
+
+    def _neighbours(self, node, reverse=False):
+        """
+        Return the neighbour nodes of node from the adjacency index of the
+        full edge storage.
+
+        :param node:    node to return neighbours for
+        :param reverse: return predecessor nodes from the reverse index
+        :type reverse:  :py:bool
+
+        :rtype:         iterable of nodes
+        """
+
+        return self.edges.adjacency_index(reverse=reverse).get(node, ())
+
+    def _get_predecessors(self, node):
+        """
+        Return predecessor nodes of node from the reverse adjacency index
+        considering only edges in the edge 'view' if any.
+
+        :param node:    node to return predecessors for
+
+        :rtype:         :py:list
+        """
+
+        predecessors = self._neighbours(node, reverse=True)
+        if self.edges.is_view:
+            return [n for n in predecessors if (n, node) in self.edges]
+
+        return list(predecessors)
+
+    def _build_adjacency(self, nodes):
+        """
+        Build the adjacency dictionary for all nodes or a selection using the
+        edge storage adjacency index unless self._adj is set.
+
+        If the edge storage represents a 'view', only neighbours connected by
+        edges in the view are considered.
+
+        :param nodes:   Nodes to determine adjacency for
+        :type nodes:    :py:list
+
+        :return:        adjacency
+        :rtype:         :py:dict
+        """
+
+        if self.adj:
+            return self.adj
+
+        is_view = self.edges.is_view
+
+        adj = {}
+        for node in nodes:
+            if node not in self.nodes:
+                raise GraphitNodeNotFound(node)
+
+            neighbours = self._neighbours(node)
+            if is_view:
+                adj[node] = [n for n in neighbours if (node, n) in self.edges]
+            else:
+                adj[node] = list(neighbours)
+
+        return adj
+
+    def degree(self, nodes=None, method='degree', weight=None):
+        """
+        Return the degree of nodes in the graph
+
+        Reports a dictionary with for every node in the graph the number of
+        connected edges of type:
+
+        * indegree: edges from others to self
+        * outdegree: edges from self to others
+        * degree: indegree and outdegree combined
+
+        Edges connected to self are counted twice when using 'degree' as method.
+        The indegree is resolved using the reverse adjacency index.
+
+        :param nodes:   Nodes to return degree for
+        :type nodes:    :py:list
+        :param method:  degree type as 'indegree', 'outdegree' or both 'degree'
+        :type method:   :py:str
+        :param weight:  Name of edge weight attribute. If None, then each edge
+                        has weight 1. The degree is the sum of the edge weights
+                        adjacent to the node.
+        :type weight:   :py:str
+
+        :return:        Degree
+        :rtype:         :py:dict
+        """
+
+        adj = self._build_adjacency(nodes or self.nodes)
+
+        degree = dict.fromkeys(adj, 0)
+        for node in adj:
+
+            # outdegree
+            if method in ('degree', 'outdegree'):
+                if weight is None:
+                    degree[node] += len(adj[node])
+                else:
+                    degree[node] += sum([self.edges[(node, n)].get(weight, 1) for n in adj[node]])
+
+            # indegree including self loops
+            if method in ('degree', 'indegree'):
+                predecessors = [n for n in self._get_predecessors(node) if n in adj]
+                if weight is None:
+                    degree[node] += len(predecessors)
+                else:
+                    degree[node] += sum([self.edges[(n, node)].get(weight, 1) for n in predecessors])
+
+        return degree
+
+    def incident_edges(self, nodes, method='degree'):
+        """
+        Return the edges connected to one or more nodes
+
+        Reports the edges of type:
+
+        * indegree: edges from others to the nodes
+        * outdegree: edges from the nodes to others
+        * degree: indegree and outdegree combined
+
+        Edges are resolved from the adjacency and predecessor indexes so only
+        the edges connected to the nodes are visited. Every edge is reported
+        once, also when it connects two of the nodes.
+
+        :param nodes:   Nodes to return connected edges for
+        :type nodes:    :py:list
+        :param method:  edge type as 'indegree', 'outdegree' or both 'degree'
+        :type method:   :py:str
+
+        :return:        connected edges
+        :rtype:         :py:list
+        """
+
+        edges = OrderedDict()
+        for node in nodes:
+            if method in ('degree', 'outdegree'):
+                for neighbour in self._neighbours(node):
+                    edges[(node, neighbour)] = None
+            if method in ('degree', 'indegree'):
+                for neighbour in self._neighbours(node, reverse=True):
+                    edges[(neighbour, node)] = None
+
+        if self.edges.is_view:
+            return [edge for edge in edges if edge in self.edges]
+        return list(edges)
+
+    def predecessors(self, node):
+        """
+        Return a list for all predecessors nodes of 'node'.
+
+        These are all nodes for which there exist an edge from other
+        nodes to self (node).
+
+        :return:  predecessors nodes
+        :rtype:   :py:list
+        """
+
+        if node in self.nodes:
+            return self._get_predecessors(node)
+
+        raise GraphitNodeNotFound(node)
 
 
 class KeysView(colabc.KeysView):
@@ -277,9 +611,10 @@ class DictStorage(GraphDriverBaseClass):
         key from the view.
 
         Prevent orphan data pointers by:
-        Checking all key/value pairs in the storage for pairs that have a data
-        reference (_data_pinter_key) to the current key and update the values
-        with data from the current value store and remove the data pointer.
+        Looking up all keys that have a data reference (_data_pointer_key) to
+        the current key in the reverse data reference index and update their
+        values with data from the current value store and remove the data
+        pointer.
 
         :param key: key to remove
 
@@ -290,15 +625,32 @@ class DictStorage(GraphDriverBaseClass):
             raise KeyError(key)
 
         if self.is_view:
-            self._view.remove(key)
+            del self._view[key]
+
+        # Update adjacency indexes
+        if self._storage.adjacency is not None and isinstance(key, tuple) and len(key) == 2:
+            self._storage.adjacency_cache = None
+            for index, source, target in ((self._storage.adjacency, key[0], key[1]),
+                                          (self._storage.predecessors, key[1], key[0])):
+                neighbours = index.get(source, {})
+                neighbours.pop(target, None)
+                if not neighbours:
+                    index.pop(source, None)
 
         # resolve orphan data pointers
-        # TODO: this may be a performance bottle neck in large graphs
-        for target_key, target_value in self._storage.items():
-            if target_value.get(self._data_pointer_key) == key:
+        if self._data_pointer_key is not None:
+            references = self.data_reference_index()
+            self._unregister_data_reference(key)
+
+            for target_key in references.pop(key, ()):
+                target_value = self._storage.get(target_key)
+                if isinstance(target_value, dict) and target_value.get(self._data_pointer_key) == key:
+                    target_value.update(self._storage[key])
+                    del target_value[self._data_pointer_key]
 
-                self._storage[target_key].update(self._storage[key])
-                del self._storage[target_key][self._data_pointer_key]
+        # Update attribute indexes
+        if self._storage.indexes is not None:
+            self._unindex(key)
 
         del self._storage[key]
 
@@ -374,9 +726,33 @@ class DictStorage(GraphDriverBaseClass):
             key = self.get_data_reference(key, default=key)
         else:
             if self.is_view:
-                self._view.append(key)
+                self._view[key] = None
+
+            # Update adjacency indexes
+            if self._storage.adjacency is not None and key not in self._storage and \
+                    isinstance(key, tuple) and len(key) == 2:
+                self._storage.adjacency.setdefault(key[0], {})[key[1]] = None
+                self._storage.predecessors.setdefault(key[1], {})[key[0]] = None
+                self._storage.adjacency_cache = None
+
+        value = to_unicode(value)
+
+        # Update reverse data reference index. Rebuild it on next use if data
+        # referencing is temporarily disabled.
+        if self._storage.references is not None:
+            if self._data_pointer_key is None:
+                self._storage.references = None
+            else:
+                self._unregister_data_reference(key)
+                if isinstance(value, dict) and self._data_pointer_key in value:
+                    self._storage.references.setdefault(value[self._data_pointer_key], {})[key] = None
+
+        # Update attribute indexes
+        if self._storage.indexes is not None:
+            self._unindex(key)
+            value = self._index(key, value)
 
-        self._storage[key] = to_unicode(value)
+        self._storage[key] = value
 
     def __setstate__(self, state):
         """
@@ -417,6 +793,169 @@ class DictStorage(GraphDriverBaseClass):
 
         return len(self._storage)
 
+    def add_index(self, key, ordered=False):
+        """
+        Add an index on the `key` attribute of the stored values
+
+        By default a hash index is added mapping attribute values to the keys
+        having them. If `ordered`, a sorted range index is added instead that
+        supports range lookup of numeric or date/time attribute values in
+        addition to equality lookup.
+
+        The index is updated when values are added, changed or removed. It is
+        shared with all instances, including views, referring to the same
+        storage.
+
+        Dictionary values are replaced by IndexedRecord dictionaries when the
+        first index is added. References to the original dictionaries held
+        elsewhere will therefore no longer update the storage.
+
+        :param key:     attribute to index
+        :param ordered: add a sorted range index
+        :type ordered:  :py:bool
+        """
+
+        self.track_changes()
+        storage = self._storage
+
+        index_cls = RangeIndex if ordered else HashIndex
+        if isinstance(storage.indexes.get(key), index_cls):
+            return
+
+        index = storage.indexes[key] = index_cls()
+        items = []
+        for k, value in storage.items():
+            if isinstance(value, IndexedRecord) and key in value:
+                items.append((value[key], k))
+
+        index.add_many(items)
+
+    def adjacency_cache(self):
+        """
+        Return the cache for data derived from the adjacency index of an edge
+        storage
+
+        The cache is a dictionary shared with all instances, including views,
+        referring to the same storage. It is cleared when edges are added to
+        or removed from the storage.
+
+        :return:        adjacency cache or None if the storage has no
+                        adjacency index
+        :rtype:         :py:dict
+        """
+
+        if self._storage.adjacency is None:
+            return None
+
+        if self._storage.adjacency_cache is None:
+            self._storage.adjacency_cache = {}
+
+        return self._storage.adjacency_cache
+
+    def adjacency_index(self, reverse=False):
+        """
+        Return the adjacency index of an edge storage
+
+        The index is a dictionary with for every node that has outgoing edges
+        an insertion ordered dictionary of its neighbour nodes as keys.
+        If `reverse` is True, the reverse (predecessor) index is returned
+        instead having for every node with incoming edges the nodes connecting
+        to it.
+
+        Both indexes are build from the full storage on first request and
+        updated in place by `__setitem__` and `__delitem__` thereafter. The
+        indexes are shared with all instances, including views, referring to
+        the same storage.
+
+        :param reverse: return the predecessor index
+        :type reverse:  :py:bool
+
+        :return:        adjacency index
+        :rtype:         :py:dict
+        """
+
+        if self._storage.adjacency is None:
+            adjacency = {}
+            predecessors = {}
+            for key in self._storage:
+                if isinstance(key, tuple) and len(key) == 2:
+                    adjacency.setdefault(key[0], {})[key[1]] = None
+                    predecessors.setdefault(key[1], {})[key[0]] = None
+
+            self._storage.adjacency = adjacency
+            self._storage.predecessors = predecessors
+
+        if reverse:
+            return self._storage.predecessors
+        return self._storage.adjacency
+
+    def _index(self, key, value):
+        """
+        Register the attributes of a new value for key in the attribute
+        indexes.
+
+        :param key:     storage key
+        :param value:   new value for key
+
+        :return:        value as IndexedRecord if value is a dictionary
+        """
+
+        if isinstance(value, dict):
+            value = IndexedRecord(self._storage.indexes, key, value)
+            value.index()
+
+        return value
+
+    def _unindex(self, key):
+        """
+        Remove the attributes of the current value of key from the attribute
+        indexes.
+
+        :param key:     storage key
+        """
+
+        value = self._storage.get(key)
+        if isinstance(value, IndexedRecord):
+            value.unindex()
+
+    def _unregister_data_reference(self, target):
+        """
+        Remove target from the reverse data reference index if the current
+        value of target defines a data reference.
+
+        :param target: key of target to unregister
+        """
+
+        value = self._storage.get(target)
+        if isinstance(value, dict) and self._data_pointer_key in value:
+            referring = self._storage.references.get(value[self._data_pointer_key], {})
+            referring.pop(target, None)
+            if not referring:
+                self._storage.references.pop(value[self._data_pointer_key], None)
+
+    def data_reference_index(self):
+        """
+        Return the reverse data reference index
+
+        The index is a dictionary with for every key that is referred to by
+        other keys using the self._data_pointer_key an insertion ordered
+        dictionary of the referring keys. It is build from the full storage on
+        first request and updated in place by `__setitem__`, `__delitem__` and
+        the data reference methods thereafter.
+
+        :return:    reverse data reference index
+        :rtype:     :py:dict
+        """
+
+        if self._storage.references is None:
+            references = {}
+            for key, value in self._storage.items():
+                if isinstance(value, dict) and self._data_pointer_key in value:
+                    references.setdefault(value[self._data_pointer_key], {})[key] = None
+            self._storage.references = references
+
+        return self._storage.references
+
     def del_data_reference(self, target):
         """
         Remove self._data_pointer_key data reference in target
@@ -425,6 +964,9 @@ class DictStorage(GraphDriverBaseClass):
         """
 
         if target in self:
+            if self._storage.references is not None:
+                self._unregister_data_reference(target)
+
             target = self._storage[target]
             if self._data_pointer_key in target:
                 del target[self._data_pointer_key]
@@ -445,6 +987,213 @@ class DictStorage(GraphDriverBaseClass):
             return target.get(self._data_pointer_key, default)
         return default
 
+    def index_lookup(self, key, value):
+        """
+        Return the keys for which the `key` attribute equals `value` using an
+        attribute index
+
+        Keys referring to the data of matching keys using the
+        self._data_pointer_key are included while keys having a data
+        reference to non-matching keys are excluded. Only keys part of the
+        current view are returned.
+
+        Keys lacking the attribute are not indexed. A lookup of None, which
+        matches them in a scan using `dict.get`, therefore returns None to
+        have the caller fall back to a scan.
+
+        :param key:     indexed attribute
+        :param value:   attribute value to lookup
+
+        :return:        matching keys or None if `key` is not indexed or
+                        `value` is None
+        :rtype:         :py:list
+        """
+
+        indexes = self._storage.indexes
+        if not indexes or key not in indexes or value is None:
+            return None
+
+        keys = indexes[key].lookup(value)
+        if keys is None:
+            return None
+
+        if keys and self._data_pointer_key is not None:
+            references = self.data_reference_index()
+            for source in list(keys):
+                keys.extend(references.get(source, ()))
+
+            return [k for k in keys if k in self and self[k].get(key) == value]
+
+        return [k for k in keys if k in self]
+
+    @property
+    def indexes(self):
+        """
+        Return the indexed attributes
+
+        :rtype: :py:list
+        """
+
+        return list(self._storage.indexes or [])
+
+    @property
+    def ordered_indexes(self):
+        """
+        Return the attributes with a sorted range index
+
+        :rtype: :py:list
+        """
+
+        indexes = self._storage.indexes or {}
+        return [key for key, index in indexes.items() if isinstance(index, RangeIndex)]
+
+    def range_lookup(self, key, lower=None, upper=None, include_lower=True, include_upper=True):
+        """
+        Return the keys for which the `key` attribute is within the range
+        between `lower` and `upper` using a range index.
+
+        Keys referring to the data of matching keys using the
+        self._data_pointer_key are included while keys having a data
+        reference to non-matching keys are excluded. Only keys part of the
+        current view are returned.
+
+        :param key:             indexed attribute
+        :param lower:           lower bound of the range, no bound if None
+        :param upper:           upper bound of the range, no bound if None
+        :param include_lower:   include values equal to the lower bound
+        :type include_lower:    :py:bool
+        :param include_upper:   include values equal to the upper bound
+        :type include_upper:    :py:bool
+
+        :return:                matching keys sorted by attribute value,
+                                values the index could not sort last, or
+                                None if `key` has no range index
+        :rtype:                 :py:list
+        """
+
+        indexes = self._storage.indexes
+        if not indexes or not isinstance(indexes.get(key), RangeIndex):
+            return None
+
+        keys = indexes[key].range(lower=lower, upper=upper, include_lower=include_lower,
+                                  include_upper=include_upper)
+        if keys is None:
+            return None
+
+        if keys and self._data_pointer_key is not None:
+            references = self.data_reference_index()
+            if references:
+                sources = [k for k in keys if self.get_data_reference(k) is None]
+                keys = list(sources)
+                for source in sources:
+                    keys.extend(references.get(source, ()))
+
+        return [k for k in keys if k in self]
+
+    def remove_index(self, key):
+        """
+        Remove the hash or range index on the `key` attribute
+
+        :param key: indexed attribute
+        """
+
+        if self._storage.indexes is not None:
+            self._storage.indexes.pop(key, None)
+
+    def set_many(self, items):
+        """
+        Implement batched dictionary setter
+
+        New keys are written to the storage directly updating the view, the
+        adjacency indexes and the reverse data reference index in the same
+        pass. Existing keys are set using `__setitem__` to resolve their data
+        references.
+
+        :param items: key, value pairs to add or update
+        :type items:  iterable of :py:tuple
+        """
+
+        storage = self._storage
+        view = self._view
+        adjacency = storage.adjacency
+        predecessors = storage.predecessors
+
+        # Rebuild the reverse data reference index on next use if data
+        # referencing is temporarily disabled.
+        if self._data_pointer_key is None:
+            storage.references = None
+        references = storage.references
+        indexes = storage.indexes
+
+        for key, value in items:
+            key = to_unicode(key)
+            if key in storage:
+                self.__setitem__(key, value)
+                continue
+
+            if view is not None:
+                view[key] = None
+
+            if adjacency is not None and isinstance(key, tuple) and len(key) == 2:
+                adjacency.setdefault(key[0], {})[key[1]] = None
+                predecessors.setdefault(key[1], {})[key[0]] = None
+                storage.adjacency_cache = None
+
+            value = to_unicode(value)
+            if references is not None and isinstance(value, dict) and self._data_pointer_key in value:
+                references.setdefault(value[self._data_pointer_key], {})[key] = None
+
+            if indexes is not None:
+                value = self._index(key, value)
+
+            storage[key] = value
+
+    def set_data_references(self, references):
+        """
+        Batched version of the `set_data_reference` method
+
+        :param references:  source, target key pairs to set a reference for
+                            having the target refer to the data of the source
+        :type references:   iterable of :py:tuple
+        """
+
+        items = []
+        for source, target in references:
+            if source in self:
+                items.append((target, {self._data_pointer_key: source}))
+            else:
+                logging.error('Unable to set reference from source {0} to target {1}. Source does not exist.'.format(
+                    source, target))
+
+        self.set_many(items)
+
+    def track_changes(self):
+        """
+        Track changes to the stored values
+
+        Dictionary values are replaced by IndexedRecord dictionaries that
+        count changes made to them in their `version` attribute. Values added
+        later on are stored as IndexedRecord as well. Attribute indexes use
+        the same records.
+
+        As for `add_index`, references to the original dictionaries held
+        elsewhere will no longer update the storage.
+
+        :return:    True, change tracking supported
+        :rtype:     :py:bool
+        """
+
+        storage = self._storage
+        if storage.indexes is not None:
+            return True
+
+        storage.indexes = {}
+        for k, value in storage.items():
+            if isinstance(value, dict) and not isinstance(value, IndexedRecord):
+                dict.__setitem__(storage, k, IndexedRecord(storage.indexes, k, value))
+
+        return True
+
     def items(self):
         """
         Implement Python 3 dictionary like 'items' method that returns a
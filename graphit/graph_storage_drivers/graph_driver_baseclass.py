@@ -19,8 +19,9 @@ referencing through Pythons `weakref` module.
 
 The `GraphDriverBaseClass` uses data 'views' to allow instances of the driver
 class to represent a subset of nodes/edges while still having the same weak
-reference to the full data storage object. A 'view' is a simple list (_view)
-storing the node/edge primary keys.
+reference to the full data storage object. A 'view' is an insertion ordered
+dictionary (_view) with the node/edge primary keys as keys for fast
+membership tests.
 
 The `GraphDriverBaseClass` facilitates easy creation of different storage
 backends that can be transparently used as Python dictionaries in graphit
@@ -35,14 +36,21 @@ graphs.
 import abc
 import copy
 import logging
+import operator
+
+from collections import OrderedDict
 
 from graphit import __module__
-from graphit.graph_py2to3 import to_unicode, colabc
-from graphit.graph_storage_drivers.graph_storage_views import DataView
+from graphit.graph_py2to3 import to_unicode, colabc, PY_STRING
+from graphit.graph_exceptions import GraphitException
+from graphit.graph_storage_drivers.graph_storage_views import DataView, LazyView
 
 __all__ = ['GraphDriverBaseClass']
 logger = logging.getLogger(__module__)
 
+# Attribute key suffixes for range comparison in attribute queries
+RANGE_OPERATORS = {'__lt': operator.lt, '__le': operator.le, '__gt': operator.gt, '__ge': operator.ge}
+
 
 class GraphDriverBaseClass(colabc.MutableMapping):
     """
@@ -74,8 +82,8 @@ class GraphDriverBaseClass(colabc.MutableMapping):
         please note that the 'GraphDriverBaseClass' uses data 'views' to
         allow instances of the driver class to represent a subset of nodes
         edges while still having the same weak reference to the full data
-        storage object. A 'view' is a simple list (_view) storing the node
-        edge primary keys.
+        storage object. A 'view' is an ordered dictionary (_view) with the
+        node edge primary keys as keys, set using `set_view`.
         The empty '_view' list needs to be initialized by the storage driver
         and support for 'views' needs to be implemented for the abstract
         methods.
@@ -369,6 +377,30 @@ class GraphDriverBaseClass(colabc.MutableMapping):
 
         return cls
 
+    def index_lookup(self, key, value):
+        """
+        Return the keys for which the `key` attribute equals `value` using an
+        attribute index
+
+        :param key:     indexed attribute
+        :param value:   attribute value to lookup
+
+        :return:        matching keys or None if `key` is not indexed
+        :rtype:         :py:list
+        """
+
+        return None
+
+    @property
+    def indexes(self):
+        """
+        Return the indexed attributes
+
+        :rtype: :py:list
+        """
+
+        return []
+
     @property
     def is_view(self):
         """
@@ -410,6 +442,38 @@ class GraphDriverBaseClass(colabc.MutableMapping):
         else:
             logging.error('Unable to set reference from source {0} to target {1}. Source does not exist.')
 
+    def adjacency_cache(self):
+        """
+        Return the cache for data derived from the edges in the storage
+
+        Storage drivers able to detect edge addition and removal may return
+        a dictionary shared by all instances referring to the same storage
+        that is cleared on every such change. By default there is no cache.
+
+        :return:        adjacency cache or None if not supported
+        :rtype:         :py:dict
+        """
+
+        return None
+
+    def add_index(self, key, ordered=False):
+        """
+        Add an index on the `key` attribute of the stored values
+
+        Attribute indexes are used by `index_lookup` and `query_attributes`
+        for constant time equality lookup. Ordered (range) indexes are used
+        by `range_lookup` for range queries. Storage drivers supporting
+        attribute indexes need to overload this method.
+
+        :param key:     attribute to index
+        :param ordered: add a sorted range index
+        :type ordered:  :py:bool
+
+        :raises:         GraphitException, indexes not supported
+        """
+
+        raise GraphitException('Storage driver {0} does not support attribute indexes'.format(type(self).__name__))
+
     def copy(self):
         """
         Return a deep copy of the storage class with the same view as
@@ -521,6 +585,134 @@ class GraphDriverBaseClass(colabc.MutableMapping):
 
         del self[key]
 
+    @property
+    def ordered_indexes(self):
+        """
+        Return the attributes with a sorted range index
+
+        :rtype: :py:list
+        """
+
+        return []
+
+    def query_attributes(self, attributes, range_query=False):
+        """
+        Return the keys for which the value attributes match all key/value
+        pairs in `attributes`.
+
+        Attributes are matched by equality. If `range_query` is True, a range
+        comparison is defined by adding one of the operator suffixes '__lt'
+        (<), '__le' (<=), '__gt' (>) or '__ge' (>=) to the attribute key:
+
+            {'key': 'one', 'weight__gt': 0.9}
+
+        An attribute index is used if defined for one of the attributes, a
+        range index if defined for one of the range comparisons. Otherwise all
+        values are evaluated using the `query` method.
+
+        :param attributes:  attribute key/value pairs to match
+        :type attributes:   :py:dict
+        :param range_query: parse range comparison suffixes in attribute keys
+        :type range_query:  :py:bool
+
+        :return:            list of primary storage identifiers (keys) matching
+                            the attributes
+        :rtype:             :py:list
+        """
+
+        predicates = []
+        bounds = {}
+        for key, value in attributes.items():
+            op = None
+            if range_query and isinstance(key, PY_STRING) and key[-4:] in RANGE_OPERATORS:
+                key, op = key[:-4], key[-4:]
+                bound = bounds.setdefault(key, {})
+                if op in ('__gt', '__ge'):
+                    bound.setdefault('lower', value)
+                    bound.setdefault('include_lower', op == '__ge')
+                else:
+                    bound.setdefault('upper', value)
+                    bound.setdefault('include_upper', op == '__le')
+            predicates.append((key, RANGE_OPERATORS.get(op, operator.eq), value))
+
+        def match(value):
+            for attr, op, other in predicates:
+                try:
+                    if not op(value.get(attr), other):
+                        return False
+                except TypeError:
+                    return False
+            return True
+
+        # Candidate keys from equality or range index
+        keys = None
+        for key, op, value in predicates:
+            if op is operator.eq:
+                keys = self.index_lookup(key, value)
+                if keys is not None:
+                    break
+        else:
+            for key, bound in bounds.items():
+                keys = self.range_lookup(key, **bound)
+                if keys is not None:
+                    break
+
+        if keys is None:
+            return self.query(lambda k, v: match(v))
+
+        results = []
+        for k in keys:
+            try:
+                if match(self[k]):
+                    results.append(k)
+            except Exception as e:
+                logger.warning('Error in attribute query: {0}'.format(e))
+
+        return results
+
+    def range_lookup(self, key, lower=None, upper=None, include_lower=True, include_upper=True):
+        """
+        Return the keys for which the `key` attribute is within the range
+        between `lower` and `upper` using a range index.
+
+        :param key:             indexed attribute
+        :param lower:           lower bound of the range, no bound if None
+        :param upper:           upper bound of the range, no bound if None
+        :param include_lower:   include values equal to the lower bound
+        :type include_lower:    :py:bool
+        :param include_upper:   include values equal to the upper bound
+        :type include_upper:    :py:bool
+
+        :return:                matching keys or None if `key` has no range
+                                index
+        :rtype:                 :py:list
+        """
+
+        return None
+
+    def remove_index(self, key):
+        """
+        Remove the hash or range index on the `key` attribute
+
+        :param key: indexed attribute
+        """
+
+        return
+
+    def track_changes(self):
+        """
+        Track changes to the stored values
+
+        Storage drivers supporting it store values as dictionaries with a
+        `version` attribute that is incremented on every change and return
+        True.
+
+        :return:    change tracking supported
+        :rtype:     :py:bool
+        """
+
+        return False
+
     def reset_view(self):
         """
         Reset the selective view on the DataFrame
@@ -579,10 +771,45 @@ class GraphDriverBaseClass(colabc.MutableMapping):
 
         self.__setitem__(key, value)
 
+    def set_many(self, items):
+        """
+        Implement batched dictionary setter
+
+        Sets the values for multiple keys in one go. The base implementation
+        sets them one by one. Storage drivers may overload the method to write
+        the items to the storage directly.
+
+        ..  note::  Do not use this method directly to add new nodes or edges
+            to the graph. Use the graph load_nodes or load_edges methods for
+            this purpose instead.
+
+        :param items: key, value pairs to add or update
+        :type items:  iterable of :py:tuple
+        """
+
+        for key, value in items:
+            self.__setitem__(key, value)
+
+    def set_data_references(self, references):
+        """
+        Batched version of the `set_data_reference` method
+
+        :param references:  source, target key pairs to set a reference for
+                            having the target refer to the data of the source
+        :type references:   iterable of :py:tuple
+        """
+
+        for source, target in references:
+            self.set_data_reference(source, target)
+
     def set_view(self, keys):
         """
         Register keys to represent a selective view on the dictionary
 
+        The view is stored as insertion ordered dictionary with the keys as
+        dictionary keys. This preserves the order of the keys while allowing
+        for hash based membership test and removal of keys.
+
         :param keys: keys to set
         :type keys:  list or tuple
         """
@@ -591,8 +818,22 @@ class GraphDriverBaseClass(colabc.MutableMapping):
         if len(keys) == len(self):
             return
 
-        keys = [to_unicode(key) for key in keys if key in self]
-        self._view = keys
+        self._view = OrderedDict.fromkeys([to_unicode(key) for key in keys if key in self])
+
+    def set_lazy_view(self, resolver):
+        """
+        Register a function returning the keys that represent a selective
+        view on the dictionary.
+
+        The function is called and the view set using the `set_view` method
+        the first time the view is used. This avoids the cost of building
+        views that are never used.
+
+        :param resolver: function returning the keys of the view
+        :type resolver:  :py:func
+        """
+
+        self._view = LazyView(self, resolver)
 
     def symmetric_difference(self, other):
         """
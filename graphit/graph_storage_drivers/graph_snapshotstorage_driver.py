@@ -0,0 +1,827 @@
+# -*- coding: utf-8 -*-
+
+"""
+file: graph_snapshotstorage_driver.py
+
+Read-only storage of nodes and edges in a memory-mapped snapshot file.
+
+A snapshot stores the graph topology as packed integer arrays in Compressed
+Sparse Row (CSR) format together with a heap of pickled node and edge
+attributes. Opening a snapshot only maps the file in memory. Pages are read
+on first use and shared between all processes that open the same snapshot
+through the operating system page cache.
+
+Snapshot layout: a magic string, the length of a JSON header and the header
+followed by the arrays listed in the header, each aligned to 8 bytes:
+
+* node_key_offsets, node_keys: JSON encoded node keys
+* node_order: node indices sorted by encoded key for binary search
+* node_value_offsets, node_values: pickled node attributes
+* indptr, indices: outgoing edges of every node sorted by target node
+* rev_indptr, rev_edges: positions of the incoming edges of every node
+* edge_value_offsets, edge_values: pickled edge attributes
+* edge_refs: position of the edge referred to by a data reference or -1
+* graph_meta: pickled graph data and graph class attributes
+
+Node and edge storage is read-only. Changes to nodes or edges raise a
+GraphitReadOnlyError. Graph data is loaded in a DictStorage that can be
+changed but changes are not written to the snapshot. A deep copy of a graph
+stored in a snapshot uses the DictStorage driver and can be changed.
+"""
+
+import copy
+import json
+import pickle
+import logging
+
+import numpy
+
+from collections import OrderedDict
+from functools import partial
+
+from graphit import __module__
+from graphit.graph_py2to3 import colabc
+from graphit.graph_exceptions import GraphitException, GraphitReadOnlyError
+from graphit.graph_storage_drivers.graph_driver_baseclass import GraphDriverBaseClass
+from graphit.graph_storage_drivers.graph_dictstorage_driver import (DictStorage, DictAdjacencyView, KeysView,
+                                                                    ItemsView, ValuesView, init_dictstorage_driver)
+from graphit.graph_storage_drivers.graph_sqlitestorage_driver import encode_key, decode_key
+
+__all__ = ['SnapshotNodeStorage', 'SnapshotEdgeStorage', 'SnapshotAdjacencyView', 'init_snapshotstorage_driver',
+           'read_snapshot', 'write_snapshot']
+
+logger = logging.getLogger(__module__)
+
+DATA_POINTER_KEY = u'$data_ref'
+SNAPSHOT_MAGIC = b'GRAPHITSNAPSHOT1'
+
+
+def init_snapshotstorage_driver(nodes, edges, data, path=None):
+    """
+    SnapshotStorage specific driver initiation method
+
+    Returns read-only SnapshotNodeStorage and SnapshotEdgeStorage instances
+    for the nodes and edges in the snapshot file, a DictStorage for graph data
+    and a SnapshotAdjacencyView for adjacency. Use `functools.partial` to
+    define the path to the snapshot or use the `read_snapshot` function.
+
+    Storage instances derived from a snapshot (e.g. sub graphs) share the
+    snapshot. Other nodes and edges, for instance from a deep copy of the
+    graph, are stored using the DictStorage driver instead.
+
+    :param nodes: SnapshotNodeStorage to share or None to open the snapshot
+    :param edges: SnapshotEdgeStorage to share or None to open the snapshot
+    :param data:  graph data attributes to initiate data DictStorage instance.
+                  Defaults to the graph data stored in the snapshot.
+    :type data:   :py:list, :py:dict,
+                  :graphit:graph_dictstorage_driver:DictStorage
+    :param path:  path to the snapshot file
+    :type path:   :py:str
+
+    :return:      Nodes and edges storage instances and Adjacency view.
+    """
+
+    if isinstance(nodes, SnapshotNodeStorage) and isinstance(edges, SnapshotEdgeStorage):
+        node_storage = SnapshotNodeStorage(nodes)
+        edge_storage = SnapshotEdgeStorage(edges)
+    elif nodes is None and edges is None and path is not None:
+        snapshot = Snapshot(path)
+        node_storage = SnapshotNodeStorage(snapshot)
+        edge_storage = SnapshotEdgeStorage(snapshot)
+        if data is None:
+            data = snapshot.meta()['data']
+    else:
+        logging.debug('Nodes and edges not in snapshot, use DictStorage driver')
+        return init_dictstorage_driver(nodes, edges, data)
+
+    data_storage = DictStorage(data)
+    adjacency_storage = SnapshotAdjacencyView(node_storage, edge_storage)
+
+    return node_storage, edge_storage, adjacency_storage, data_storage
+
+
+def read_snapshot(path, graph=None):
+    """
+    Open a graph stored in a snapshot file
+
+    Returns a graph using the read-only snapshot storage driver. The graph is
+    of the same class as `graph` if defined. Otherwise a GraphAxis if the
+    snapshot defines a root node or a Graph.
+
+    :param path:    path to the snapshot file
+    :type path:     :py:str
+    :param graph:   graph object defining the graph class and ORM
+    :type graph:    :graphit:Graph
+
+    :return:        Graph object
+    :rtype:         Graph or GraphAxis object
+    """
+
+    # Local import to prevent circular imports
+    from graphit import Graph, GraphAxis
+
+    meta = Snapshot(path).meta()
+
+    if graph is None:
+        graph_class = GraphAxis if meta['graph'].get('root') is not None else Graph
+        orm = None
+    elif isinstance(graph, Graph):
+        graph_class = graph._get_class_object()
+        orm = graph.orm
+    else:
+        raise GraphitException('Unsupported graph type {0}'.format(type(graph)))
+
+    return graph_class(data=meta['data'], orm=orm, storagedriver=partial(init_snapshotstorage_driver, path=path),
+                       **meta['graph'])
+
+
+def write_snapshot(graph, path):
+    """
+    Write the nodes, edges and graph data of a graph to a snapshot file
+
+    Nodes are stored in the order of the graph node storage. Edges are
+    grouped by source node and sorted by the index of the target node.
+    Data references between edges are preserved.
+
+    :param graph:   graph to write
+    :type graph:    :graphit:Graph
+    :param path:    path to the snapshot file
+    :type path:     :py:str
+
+    :raises:        GraphitException, edge connects node not in graph
+    """
+
+    node_keys = []
+    node_values = []
+    node_index = {}
+    for key, value in graph.nodes.items():
+        node_index[key] = len(node_keys)
+        node_keys.append(encode_key(key).encode('utf-8'))
+        node_values.append(value)
+
+    # Edges as source and target index, sorted by source then target
+    with graph.edges as edges:
+        edge_items = []
+        for (source, target), value in edges.items():
+            if source not in node_index or target not in node_index:
+                raise GraphitException('Edge {0} connects node not in graph'.format((source, target)))
+            edge_items.append(((node_index[source], node_index[target]), (source, target), value))
+        edge_items.sort(key=lambda item: item[0])
+
+    sources = numpy.array([item[0][0] for item in edge_items], dtype=numpy.int64)
+    targets = numpy.array([item[0][1] for item in edge_items], dtype=numpy.int64)
+    positions = dict([(item[1], i) for i, item in enumerate(edge_items)])
+
+    # Data references to edges not in the snapshot are replaced by the data
+    edge_values = []
+    edge_refs = numpy.full(len(edge_items), -1, dtype=numpy.int64)
+    for i, (index, edge, value) in enumerate(edge_items):
+        ref = value.get(DATA_POINTER_KEY) if isinstance(value, colabc.Mapping) else None
+        if ref is not None:
+            if tuple(ref) in positions:
+                edge_refs[i] = positions[tuple(ref)]
+                value = {}
+            else:
+                value = graph.edges[edge]
+        edge_values.append(value)
+
+    n = len(node_keys)
+    indptr = numpy.zeros(n + 1, dtype=numpy.int64)
+    indptr[1:] = numpy.cumsum(numpy.bincount(sources, minlength=n))
+
+    rev_edges = numpy.lexsort((sources, targets)).astype(numpy.int64)
+    rev_indptr = numpy.zeros(n + 1, dtype=numpy.int64)
+    rev_indptr[1:] = numpy.cumsum(numpy.bincount(targets, minlength=n))
+
+    arrays = OrderedDict()
+    arrays['node_key_offsets'], arrays['node_keys'] = _heap(node_keys)
+    arrays['node_order'] = numpy.array(sorted(range(n), key=lambda i: node_keys[i]), dtype=numpy.int64)
+    arrays['node_value_offsets'], arrays['node_values'] = _heap([_pickle(value) for value in node_values])
+    arrays['indptr'] = indptr
+    arrays['indices'] = targets
+    arrays['rev_indptr'] = rev_indptr
+    arrays['rev_edges'] = rev_edges
+    arrays['edge_value_offsets'], arrays['edge_values'] = _heap([_pickle(value) for value in edge_values])
+    arrays['edge_refs'] = edge_refs
+
+    meta = {'data': graph.data.to_dict(), 'graph': {'directed': graph.directed, 'root': graph.root}}
+    arrays['graph_meta'] = numpy.frombuffer(pickle.dumps(meta, 2), dtype=numpy.uint8)
+
+    # Header with array offsets relative to the end of the header
+    header = {'nodes': n, 'edges': len(edge_items), 'arrays': OrderedDict()}
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = [offset, array.dtype.str, len(array)]
+        offset += _aligned(array.nbytes)
+    header = json.dumps(header).encode('utf-8')
+    header += b' ' * (_aligned(len(header)) - len(header))
+
+    with open(path, 'wb') as snapshot:
+        snapshot.write(SNAPSHOT_MAGIC)
+        snapshot.write(numpy.array([len(header)], dtype='<i8').tobytes())
+        snapshot.write(header)
+        for array in arrays.values():
+            snapshot.write(array.tobytes())
+            snapshot.write(b'\0' * (_aligned(array.nbytes) - array.nbytes))
+
+
+def _aligned(size):
+    """
+    Return size rounded up to a multiple of 8 bytes
+    """
+
+    return (size + 7) // 8 * 8
+
+
+def _heap(items):
+    """
+    Pack a list of byte strings in an offset and a byte array
+
+    :param items:   byte strings
+    :type items:    :py:list
+
+    :return:        offsets (n + 1) and packed bytes
+    :rtype:         :py:tuple
+    """
+
+    offsets = numpy.zeros(len(items) + 1, dtype=numpy.int64)
+    offsets[1:] = numpy.cumsum([len(item) for item in items])
+
+    return offsets, numpy.frombuffer(b''.join(items), dtype=numpy.uint8)
+
+
+def _pickle(value):
+    """
+    Pickle node or edge attributes. Empty attributes are stored as empty
+    byte string. Mappings of any storage driver are stored as dictionary.
+    """
+
+    if isinstance(value, colabc.Mapping):
+        if not value:
+            return b''
+        value = dict(value)
+    return pickle.dumps(value, 2)
+
+
+class SnapshotRecord(dict):
+    """
+    Read-only dictionary value of a node or edge in a snapshot
+
+    Changes raise a GraphitReadOnlyError. Copies and pickles of the record
+    are native Python dictionaries.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+
+        raise GraphitReadOnlyError('Node and edge attributes in a snapshot are read-only')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+
+        return dict, (dict(self),)
+
+
+class Snapshot(object):
+    """
+    Memory-mapped snapshot file
+
+    Provides access to the nodes and edges in the snapshot by index (node)
+    and position (edge). Node keys are decoded on first use.
+    """
+
+    def __init__(self, path):
+        """
+        Implement class __init__
+
+        Map the snapshot file in memory and setup the arrays in the header.
+
+        :param path:    path to the snapshot file
+        :type path:     :py:str
+
+        :raises:        GraphitException, not a snapshot file
+        """
+
+        self.path = path
+        self.buffer = numpy.memmap(path, dtype=numpy.uint8, mode='r')
+
+        magic = len(SNAPSHOT_MAGIC)
+        if self.buffer[:magic].tobytes() != SNAPSHOT_MAGIC:
+            raise GraphitException('Not a graphit snapshot file: {0}'.format(path))
+
+        size = int(self.buffer[magic:magic + 8].view('<i8')[0])
+        start = magic + 8 + size
+        header = json.loads(self.buffer[magic + 8:start].tobytes().decode('utf-8'))
+
+        self.size = header['nodes']
+        self.edge_count = header['edges']
+        for name, (offset, dtype, count) in header['arrays'].items():
+            dtype = numpy.dtype(str(dtype))
+            array = self.buffer[start + offset:start + offset + count * dtype.itemsize].view(dtype)
+            setattr(self, name, array)
+
+        self._keys = {}
+
+    def __reduce__(self):
+        """
+        Implement class __reduce__
+
+        Pickle the snapshot by path so unpickling maps the same file instead
+        of copying the data.
+        """
+
+        return Snapshot, (self.path,)
+
+    def edge_key(self, position):
+        """
+        Return the (source, target) key of the edge at position
+
+        :param position:    edge position
+        :type position:     :py:int
+
+        :rtype:             :py:tuple
+        """
+
+        source = int(numpy.searchsorted(self.indptr, position, side='right')) - 1
+        return self.node_key(source), self.node_key(int(self.indices[position]))
+
+    def edge_position(self, key):
+        """
+        Return the position of an edge
+
+        :param key: (source, target) edge key
+
+        :return:    edge position or -1 if not in snapshot
+        :rtype:     :py:int
+        """
+
+        if not (isinstance(key, tuple) and len(key) == 2):
+            return -1
+
+        source = self.node_index(key[0])
+        target = self.node_index(key[1])
+        if source < 0 or target < 0:
+            return -1
+
+        start, end = int(self.indptr[source]), int(self.indptr[source + 1])
+        position = start + int(numpy.searchsorted(self.indices[start:end], target))
+        if position < end and self.indices[position] == target:
+            return position
+        return -1
+
+    def edge_value(self, position):
+        """
+        Return the attributes of the edge at position
+
+        :param position:    edge position
+        :type position:     :py:int
+
+        :rtype:             SnapshotRecord
+        """
+
+        return self._value(self.edge_value_offsets, self.edge_values, position)
+
+    def iter_edges(self):
+        """
+        Iterate over all edge keys grouped by source node
+
+        :rtype: generator
+        """
+
+        for source in range(self.size):
+            start, end = int(self.indptr[source]), int(self.indptr[source + 1])
+            if start < end:
+                source_key = self.node_key(source)
+                for target in self.indices[start:end]:
+                    yield source_key, self.node_key(int(target))
+
+    def meta(self):
+        """
+        Return the graph data and graph class attributes
+
+        :rtype: :py:dict
+        """
+
+        return pickle.loads(self.graph_meta.tobytes())
+
+    def neighbours(self, index, reverse=False):
+        """
+        Return the indices of the target nodes of the outgoing edges of a node
+
+        :param index:   node index
+        :type index:    :py:int
+        :param reverse: return the source nodes of the incoming edges instead
+        :type reverse:  :py:bool
+
+        :rtype:         :py:list
+        """
+
+        if reverse:
+            edges = self.rev_edges[self.rev_indptr[index]:self.rev_indptr[index + 1]]
+            return (numpy.searchsorted(self.indptr, edges, side='right') - 1).tolist()
+
+        return self.indices[self.indptr[index]:self.indptr[index + 1]].tolist()
+
+    def node_index(self, key):
+        """
+        Return the index of a node using binary search on the sorted node keys
+
+        :param key: node key
+
+        :return:    node index or -1 if not in snapshot
+        :rtype:     :py:int
+        """
+
+        try:
+            encoded = encode_key(key).encode('utf-8')
+        except TypeError:
+            return -1
+
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            index = int(self.node_order[middle])
+            if self._encoded_key(index) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.size:
+            index = int(self.node_order[low])
+            if self._encoded_key(index) == encoded:
+                return index
+        return -1
+
+    def node_key(self, index):
+        """
+        Return the key of the node at index
+
+        :param index:   node index
+        :type index:    :py:int
+        """
+
+        key = self._keys.get(index)
+        if key is None:
+            key = self._keys[index] = decode_key(self._encoded_key(index).decode('utf-8'))
+
+        return key
+
+    def node_value(self, index):
+        """
+        Return the attributes of the node at index
+
+        :param index:   node index
+        :type index:    :py:int
+
+        :rtype:         SnapshotRecord
+        """
+
+        return self._value(self.node_value_offsets, self.node_values, index)
+
+    def _encoded_key(self, index):
+
+        return self.node_keys[self.node_key_offsets[index]:self.node_key_offsets[index + 1]].tobytes()
+
+    @staticmethod
+    def _value(offsets, heap, index):
+
+        value = heap[offsets[index]:offsets[index + 1]].tobytes()
+        if not value:
+            return SnapshotRecord()
+
+        value = pickle.loads(value)
+        return SnapshotRecord(value) if isinstance(value, dict) else value
+
+
+class SnapshotAdjacencyView(DictAdjacencyView):
+    """
+    Adjacency View class for the SnapshotStorage driver
+
+    Resolves node neighbours and predecessors from the CSR arrays in the
+    snapshot.
+    """
+
+    def _neighbours(self, node, reverse=False):
+        """
+        Return the neighbour nodes of node from the snapshot
+
+        :param node:    node to return neighbours for
+        :param reverse: return predecessor nodes instead
+        :type reverse:  :py:bool
+
+        :rtype:         :py:list
+        """
+
+        return self.edges.neighbours(node, reverse=reverse)
+
+
+class SnapshotStorage(GraphDriverBaseClass):
+    """
+    Base class for read-only node and edge storage in a snapshot
+
+    Supports data 'views' on the snapshot. Methods that change the storage
+    raise a GraphitReadOnlyError.
+    """
+
+    __slots__ = ('_storage', '_view', '_data_pointer_key')
+
+    def __init__(self, snapshot):
+        """
+        Implement class __init__
+
+        :param snapshot:    snapshot to provide access to or storage instance
+                            to share the snapshot with.
+        :type snapshot:     Snapshot or SnapshotStorage
+        """
+
+        self._view = None
+        self._data_pointer_key = DATA_POINTER_KEY
+        self._storage = snapshot._storage if isinstance(snapshot, SnapshotStorage) else snapshot
+
+    def __contains__(self, item):
+        """
+        Implement class __contains__
+
+        :param item: key to check existence for
+
+        :rtype:      :py:bool
+        """
+
+        if self.is_view:
+            return item in self._view
+        return self._index(item) >= 0
+
+    def __delitem__(self, key):
+
+        self._read_only()
+
+    def __getitem__(self, key):
+        """
+        Implement class abstract method __getitem__
+
+        :param key: key to return value for
+
+        :raises:    KeyError, key not found
+        """
+
+        if key not in self:
+            raise KeyError(key)
+
+        return self._value(self._index(key))
+
+    def __getstate__(self):
+        """
+        Implement class __getstate__
+
+        Enables the class to be pickled. Required because the class uses
+        __slots__
+
+        :return:    object content for pickling
+        :rtype:     :py:dict
+        """
+
+        state = {}
+        for key in SnapshotStorage.__slots__:
+            state[key] = getattr(self, key)
+
+        return state
+
+    def __iter__(self):
+        """
+        Implement class __iter__
+
+        Iterate over keys in the snapshot
+        """
+
+        if self.is_view:
+            return iter(self._view)
+
+        return self._iter_keys()
+
+    def __setitem__(self, key, value):
+
+        self._read_only()
+
+    def __setstate__(self, state):
+        """
+        Implement class __setstate__
+
+        Enables the class to be unpickled. Required because the class uses
+        __slots__
+
+        :param state:    object content for unpickling
+        :type state:     :py:dict
+        """
+
+        for key, value in state.items():
+            if key in SnapshotStorage.__slots__:
+                setattr(self, key, value)
+
+    def _read_only(self, *args, **kwargs):
+        """
+        Raise GraphitReadOnlyError for methods that change the storage
+        """
+
+        raise GraphitReadOnlyError('{0} is read-only, make a deep copy of the graph to change it'.format(
+            self.__class__.__name__))
+
+    set_many = set_data_reference = set_data_references = del_data_reference = _read_only
+
+    def copy(self):
+        """
+        Return a deep copy of the storage as DictStorage with the same view
+        as the parent instance.
+
+        :return:    deep copy of storage instance
+        :rtype:     DictStorage
+        """
+
+        with self:
+            deepcopy = DictStorage(dict([(key, dict(value)) for key, value in self._iter_items()]))
+        if self.is_view:
+            deepcopy.set_view(self._view)
+
+        return deepcopy
+
+    def _iter_items(self):
+        """
+        Iterate over key, value pairs in the storage or view
+
+        :rtype: generator
+        """
+
+        for key in self:
+            yield key, self._value(self._index(key))
+
+    def items(self):
+        """
+        Implement Python 3 dictionary like 'items' method that returns a
+        DictView class.
+
+        :return: dictionary items as tuple of key/value pairs
+        :rtype:  ItemsView instance
+        """
+
+        return ItemsView(self)
+
+    iteritems = items
+
+    def keys(self):
+        """
+        Implement Python 3 dictionary like 'keys' method that returns a DictView
+        class.
+
+        :return: dictionary keys
+        :rtype:  KeysView instance
+        """
+
+        return KeysView(self)
+
+    iterkeys = keys
+
+    def values(self):
+        """
+        Implement Python 3 dictionary like 'values' method that returns a DictView
+        class.
+
+        :return: dictionary values
+        :rtype:  ValuesView instance
+        """
+
+        return ValuesView(self)
+
+    itervalues = values
+
+
+class SnapshotNodeStorage(SnapshotStorage):
+    """
+    Read-only node storage in a snapshot
+    """
+
+    __slots__ = ()
+
+    def __len__(self):
+        """
+        Implement class __len__
+
+        Returns the number of nodes in the snapshot or the selective view on it.
+        """
+
+        if self.is_view:
+            return len(self._view)
+        return self._storage.size
+
+    def _index(self, key):
+
+        return self._storage.node_index(key)
+
+    def _iter_keys(self):
+
+        return (self._storage.node_key(index) for index in range(self._storage.size))
+
+    def _value(self, index):
+
+        return self._storage.node_value(index)
+
+    def get_data_reference(self, target, default=None):
+        """
+        Nodes do not define data references
+
+        :param target:  key to check
+        :param default: default to return
+
+        :raises:        KeyError, key not found
+        """
+
+        if target not in self:
+            raise KeyError(target)
+        return default
+
+
+class SnapshotEdgeStorage(SnapshotStorage):
+    """
+    Read-only edge storage in a snapshot
+
+    Edges referring to the data of another edge return the data of that edge.
+    Within the data reference free context (with storage) they return a value
+    with the self._data_pointer_key.
+    """
+
+    __slots__ = ()
+
+    def __len__(self):
+        """
+        Implement class __len__
+
+        Returns the number of edges in the snapshot or the selective view on it.
+        """
+
+        if self.is_view:
+            return len(self._view)
+        return self._storage.edge_count
+
+    def _index(self, key):
+
+        return self._storage.edge_position(key)
+
+    def _iter_keys(self):
+
+        return self._storage.iter_edges()
+
+    def _value(self, position):
+
+        ref = int(self._storage.edge_refs[position])
+        if ref >= 0:
+            if self._data_pointer_key is None:
+                return SnapshotRecord({DATA_POINTER_KEY: self._storage.edge_key(ref)})
+            position = ref
+
+        return self._storage.edge_value(position)
+
+    def get_data_reference(self, target, default=None):
+        """
+        Check if the edge defines a reference to the data of another edge.
+
+        :param target:  key to check
+        :param default: default to return if there is no data reference
+
+        :return:        referred key or default
+        :raises:        KeyError, key not found
+        """
+
+        position = self._storage.edge_position(target)
+        if position < 0:
+            raise KeyError(target)
+
+        ref = int(self._storage.edge_refs[position])
+        if ref >= 0:
+            return self._storage.edge_key(ref)
+        return default
+
+    def neighbours(self, node, reverse=False):
+        """
+        Return the neighbour nodes of node in the full storage
+
+        :param node:    node ID to return neighbours for
+        :param reverse: return predecessor nodes instead
+        :type reverse:  :py:bool
+
+        :return:        node ID's
+        :rtype:         :py:list
+        """
+
+        index = self._storage.node_index(node)
+        if index < 0:
+            return []
+
+        return [self._storage.node_key(i) for i in self._storage.neighbours(index, reverse=reverse)]
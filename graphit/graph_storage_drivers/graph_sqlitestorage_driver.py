@@ -0,0 +1,1199 @@
+# -*- coding: utf-8 -*-
+
+"""
+file: graph_sqlitestorage_driver.py
+
+Out-of-core storage of nodes, edges and graph data in a local SQLite database
+file for graphs that do not fit in memory.
+
+Every storage is a table in the database with a row for every key. Keys are
+stored as canonical JSON strings and values as pickled objects. The source and
+target node of edge keys are stored in separate indexed columns used by the
+SQLiteAdjacencyView to resolve node neighbours and predecessors using index
+lookups. Data references ($data_ref) are stored in an indexed column as well to
+resolve orphan data references when a key is removed.
+
+A bounded least recently used (LRU) cache keeps frequently used values in
+memory. Values are returned as `SQLiteRecord` dictionaries that merge changes
+to their own keys into the value stored in the database, also when the record
+was evicted from the cache in the mean time. In place changes to mutable objects
+stored in a value (e.g. appending to a list) are not detected and require
+setting the attribute again.
+
+Changes are committed to the database file in batches. Call `commit` on any of
+the storage instances to commit pending changes explicitly.
+
+Storages can be pickled. A database file is pickled by path after committing
+pending changes, unpickling opens the same file. Temporary databases are
+pickled as a SQL dump of their content restored in a new temporary database.
+"""
+
+import os
+import copy
+import json
+import pickle
+import sqlite3
+import weakref
+import logging
+import tempfile
+
+from collections import OrderedDict
+
+from graphit import __module__
+from graphit.graph_py2to3 import to_unicode
+from graphit.graph_exceptions import GraphitException
+from graphit.graph_storage_drivers.graph_driver_baseclass import GraphDriverBaseClass
+from graphit.graph_storage_drivers.graph_dictstorage_driver import (DictAdjacencyView, KeysView, ItemsView,
+                                                                    ValuesView)
+
+__all__ = ['SQLiteStorage', 'SQLiteAdjacencyView', 'init_sqlitestorage_driver']
+
+logger = logging.getLogger(__module__)
+
+DATA_POINTER_KEY = u'$data_ref'
+DEFAULT_CACHE_SIZE = 10000
+COMMIT_INTERVAL = 10000
+FETCH_SIZE = 1000
+
+
+def init_sqlitestorage_driver(nodes, edges, data, path=None, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    SQLiteStorage specific driver initiation method
+
+    Returns a SQLiteStorage instance for nodes, edges and graph data stored
+    as tables in the same SQLite database file and a SQLiteAdjacencyView for
+    adjacency based on the initiated nodes and edges stores.
+
+    The database is stored in a temporary file that is removed when the
+    storage is no longer used unless a `path` is defined. Use
+    `functools.partial` to define the path and cache size for a graph:
+
+        driver = partial(init_sqlitestorage_driver, path='graph.sqlite')
+        graph = Graph(storagedriver=driver)
+
+    :param nodes:      Nodes to initiate nodes SQLiteStorage instance
+    :type nodes:       :py:list, :py:dict,
+                       :graphit:graph_sqlitestorage_driver:SQLiteStorage
+    :param edges:      Edges to initiate edges SQLiteStorage instance
+    :type edges:       :py:list, :py:dict,
+                       :graphit:graph_sqlitestorage_driver:SQLiteStorage
+    :param data:       graph data attributes to initiate data SQLiteStorage
+                       instance
+    :type data:        :py:list, :py:dict,
+                       :graphit:graph_sqlitestorage_driver:SQLiteStorage
+    :param path:       path to the SQLite database file
+    :type path:        :py:str
+    :param cache_size: maximum number of values kept in memory per storage
+    :type cache_size:  :py:int
+
+    :return:           Nodes and edges storage instances and Adjacency view.
+    """
+
+    database = None
+
+    storages = []
+    for table, mappable in ((u'nodes', nodes), (u'edges', edges), (u'data', data)):
+
+        # mappable is SQLiteStorage instance, share the table
+        if isinstance(mappable, SQLiteStorage):
+            storages.append(SQLiteStorage(mappable))
+            continue
+
+        if database is None:
+            database = SQLiteDatabase(path)
+        storage = SQLiteStorage(SQLiteTable(database, table, cache_size=cache_size))
+        storage.update_from(mappable)
+        storages.append(storage)
+
+    node_storage, edge_storage, data_storage = storages
+    adjacency_storage = SQLiteAdjacencyView(node_storage, edge_storage)
+
+    return node_storage, edge_storage, adjacency_storage, data_storage
+
+
+def _restore_database(path, commit_interval=COMMIT_INTERVAL, dump=None):
+    """
+    Return the SQLiteDatabase for a pickled database
+
+    A database file is opened by path and shared with a database already
+    open in the current process. Otherwise, the SQL `dump` of a temporary
+    database is restored in a new temporary database.
+
+    :param path:            path to the SQLite database file
+    :type path:             :py:str
+    :param commit_interval: number of changes after which they are
+                            committed to file.
+    :type commit_interval:  :py:int
+    :param dump:            SQL dump of a temporary database
+    :type dump:             :py:str
+
+    :rtype:                 SQLiteDatabase
+    """
+
+    if dump is not None:
+        database = SQLiteDatabase(commit_interval=commit_interval)
+        database.connection.executescript(dump)
+        return database
+
+    database = SQLiteDatabase._open_files.get(path)
+    if database is not None and database.connection is not None:
+        return database
+
+    return SQLiteDatabase(path, commit_interval=commit_interval)
+
+
+def encode_key(key):
+    """
+    Encode a node or edge key as canonical JSON string
+
+    :param key: key to encode
+
+    :rtype:     :py:str
+    :raises:    TypeError, key cannot be encoded
+    """
+
+    try:
+        return json.dumps(key, separators=(',', ':'))
+    except (TypeError, ValueError):
+        raise TypeError('SQLiteStorage key should be a string, number or tuple thereof, got: {0}'.format(repr(key)))
+
+
+def decode_key(key):
+    """
+    Decode a JSON encoded node or edge key
+
+    :param key: JSON encoded key
+    :type key:  :py:str
+
+    :return:    key with JSON arrays as tuples
+    """
+
+    def to_tuple(value):
+        if isinstance(value, list):
+            return tuple([to_tuple(item) for item in value])
+        return value
+
+    return to_tuple(json.loads(key))
+
+
+class SQLiteDatabase(object):
+    """
+    SQLite database file shared by the storage tables of a graph
+
+    A database file is used by one graph at a time. Opening a file that is
+    already in use raises a GraphitException. Deep copies of a graph are
+    stored in a temporary file instead. Temporary files are removed when the
+    database is closed.
+    """
+
+    # Database files in use by open databases
+    _open_files = weakref.WeakValueDictionary()
+
+    def __init__(self, path=None, commit_interval=COMMIT_INTERVAL):
+        """
+        Implement class __init__
+
+        :param path:            path to the SQLite database file. Use a
+                                temporary file if not defined.
+        :type path:             :py:str
+        :param commit_interval: number of changes after which they are
+                                committed to file.
+        :type commit_interval:  :py:int
+
+        :raises:                GraphitException, database file in use
+        """
+
+        if path is not None:
+            path = os.path.abspath(path)
+            if path in self._open_files:
+                raise GraphitException('SQLite database {0} in use by another graph'.format(path))
+
+        self.temporary = path is None
+        if self.temporary:
+            handle, path = tempfile.mkstemp(suffix='.sqlite')
+            os.close(handle)
+
+        self.path = path
+        self.commit_interval = commit_interval
+        self.changes = 0
+        self.connection = sqlite3.connect(path)
+
+        # No need for durability of temporary files
+        if self.temporary:
+            self.connection.execute('PRAGMA journal_mode=OFF')
+            self.connection.execute('PRAGMA synchronous=OFF')
+        else:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+
+        self._open_files[path] = self
+
+    def __del__(self):
+        """
+        Implement class __del__
+
+        Close the database when no longer used
+        """
+
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __reduce__(self):
+        """
+        Implement class __reduce__
+
+        Pickle a database file by path after committing pending changes.
+        Temporary databases are pickled as SQL dump of their content.
+        """
+
+        if self.connection is None:
+            raise GraphitException('Unable to pickle closed SQLite database {0}'.format(self.path))
+
+        if self.temporary:
+            return _restore_database, (None, self.commit_interval, u'\n'.join(self.connection.iterdump()))
+
+        self.commit()
+        return _restore_database, (self.path, self.commit_interval)
+
+    def changed(self, count=1):
+        """
+        Register changes and commit them after `commit_interval` changes
+
+        :param count:   number of changes
+        :type count:    :py:int
+        """
+
+        self.changes += count
+        if self.changes >= self.commit_interval:
+            self.commit()
+
+    def close(self):
+        """
+        Commit pending changes and close the database.
+        Removes the database file if temporary.
+        """
+
+        if self.connection is None:
+            return
+
+        self.commit()
+        self.connection.close()
+        self.connection = None
+        if self._open_files.get(self.path) is self:
+            del self._open_files[self.path]
+
+        if self.temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def commit(self):
+        """
+        Commit pending changes to the database file
+        """
+
+        if self.connection is not None:
+            self.connection.commit()
+        self.changes = 0
+
+
+class SQLiteRecord(dict):
+    """
+    Dictionary value of a key in a SQLiteTable
+
+    Changes made to the dictionary are written back to the database.
+    Copies and pickles of the record are native Python dictionaries.
+    """
+
+    __slots__ = ('_table', '_key')
+
+    def __init__(self, table, key, *args, **kwargs):
+        """
+        Implement class __init__
+
+        :param table:   table storing the record
+        :type table:    SQLiteTable
+        :param key:     key of the record in the table
+        """
+
+        super(SQLiteRecord, self).__init__(*args, **kwargs)
+        self._table = table
+        self._key = key
+
+    def __copy__(self):
+
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+
+        return dict, (dict(self),)
+
+    def _write(self, changed=None, removed=(), clear=False):
+        """
+        Write the changes made to the record back to its table
+
+        Only the changed keys are merged into the current value of the record
+        in the table. This keeps changes made through other records of the
+        same key, for instance after this record was evicted from the cache.
+
+        :param changed: changed key, value pairs
+        :type changed:  :py:dict
+        :param removed: removed keys
+        :type removed:  :py:list
+        :param clear:   all keys were removed
+        :type clear:    :py:bool
+        """
+
+        self._table.merge(self, changed=changed, removed=removed, clear=clear)
+
+    def __setitem__(self, key, value):
+
+        super(SQLiteRecord, self).__setitem__(key, value)
+        self._write(changed={key: value})
+
+    def __delitem__(self, key):
+
+        super(SQLiteRecord, self).__delitem__(key)
+        self._write(removed=[key])
+
+    def clear(self):
+
+        super(SQLiteRecord, self).clear()
+        self._write(clear=True)
+
+    def pop(self, key, *args):
+
+        if key not in self:
+            return super(SQLiteRecord, self).pop(key, *args)
+
+        value = super(SQLiteRecord, self).pop(key)
+        self._write(removed=[key])
+
+        return value
+
+    def popitem(self):
+
+        item = super(SQLiteRecord, self).popitem()
+        self._write(removed=[item[0]])
+
+        return item
+
+    def setdefault(self, key, default=None):
+
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def update(self, *args, **kwargs):
+
+        changed = dict(*args, **kwargs)
+        super(SQLiteRecord, self).update(changed)
+        self._write(changed=changed)
+
+
+class SQLiteTable(object):
+    """
+    Key/value table in a SQLite database with a LRU cache of recently used
+    values.
+
+    Rows are ordered by insertion. Keys that are a (source, target) tuple have
+    the source and target stored in indexed columns for adjacency lookup.
+    Data references are stored in an indexed column for reverse lookup.
+    """
+
+    def __init__(self, database, name, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Implement class __init__
+
+        Creates the table and its indexes if not yet in the database.
+
+        :param database:    database to store the table in
+        :type database:     SQLiteDatabase
+        :param name:        table name
+        :type name:         :py:str
+        :param cache_size:  maximum number of values kept in memory
+        :type cache_size:   :py:int
+        """
+
+        self.database = database
+        self.name = name
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+        execute = database.connection.execute
+        execute('CREATE TABLE IF NOT EXISTS "{0}" (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, value BLOB, '
+                'ref TEXT, source TEXT, target TEXT)'.format(name))
+        for column in ('ref', 'source', 'target'):
+            execute('CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ({1}) WHERE {1} IS NOT NULL'.format(name, column))
+
+        self.size = execute('SELECT COUNT(*) FROM "{0}"'.format(name)).fetchone()[0]
+
+    def __contains__(self, key):
+        """
+        Implement class __contains__
+
+        :param key: key to check existence for
+
+        :rtype:     :py:bool
+        """
+
+        if key in self.cache:
+            return True
+
+        try:
+            return self._select('SELECT 1 FROM "{0}" WHERE key=?', encode_key(key)).fetchone() is not None
+        except TypeError:
+            return False
+
+    def __deepcopy__(self, memo):
+        """
+        Implement class __deepcopy__
+
+        Copy the table to a table in a new temporary database
+
+        :rtype: SQLiteTable
+        """
+
+        table = SQLiteTable(SQLiteDatabase(), self.name, cache_size=self.cache_size)
+        table.set_many([(key, value) for key, value in self.iter_items()])
+
+        return table
+
+    def __len__(self):
+        """
+        Implement class __len__
+
+        :return:    number of rows in the table
+        :rtype:     :py:int
+        """
+
+        return self.size
+
+    def __reduce__(self):
+        """
+        Implement class __reduce__
+
+        Pickle the table by database and name. The LRU cache is not pickled.
+        """
+
+        return SQLiteTable, (self.database, self.name, self.cache_size)
+
+    def _cache(self, key, value):
+        """
+        Add value to the LRU cache removing the least recently used value if
+        the cache is full.
+        """
+
+        self.cache.pop(key, None)
+        self.cache[key] = value
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _record(self, key, value):
+        """
+        Return dictionary values as SQLiteRecord of key
+        """
+
+        if isinstance(value, dict):
+            return SQLiteRecord(self, key, value)
+        return value
+
+    def _row(self, key, value):
+        """
+        Return the table row for a key, value pair
+
+        :return:    key, value, ref, source and target column values
+        :rtype:     :py:tuple
+        """
+
+        ref = None
+        if isinstance(value, dict) and DATA_POINTER_KEY in value:
+            ref = encode_key(value[DATA_POINTER_KEY])
+
+        source = target = None
+        if isinstance(key, tuple) and len(key) == 2:
+            source, target = encode_key(key[0]), encode_key(key[1])
+
+        value = dict(value) if isinstance(value, dict) else value
+        return encode_key(key), sqlite3.Binary(pickle.dumps(value, 2)), ref, source, target
+
+    def _select(self, sql, *args):
+        """
+        Execute select statement for the table
+
+        :param sql: SQL statement with '{0}' as table name placeholder
+        :type sql:  :py:str
+        """
+
+        return self.database.connection.execute(sql.format(self.name), args)
+
+    def delete(self, key):
+        """
+        Remove key from the table
+
+        :param key: key to remove
+        """
+
+        cursor = self._select('DELETE FROM "{0}" WHERE key=?', encode_key(key))
+        self.cache.pop(key, None)
+        self.size -= cursor.rowcount
+        self.database.changed()
+
+    def get(self, key):
+        """
+        Return the value of key
+
+        :param key: key to return value for
+
+        :raises:    KeyError, key not found
+        """
+
+        if key in self.cache:
+            value = self.cache.pop(key)
+            self.cache[key] = value
+            return value
+
+        try:
+            row = self._select('SELECT value FROM "{0}" WHERE key=?', encode_key(key)).fetchone()
+        except TypeError:
+            row = None
+        if row is None:
+            raise KeyError(key)
+
+        value = self._record(key, pickle.loads(bytes(row[0])))
+        self._cache(key, value)
+
+        return value
+
+    def iter_items(self):
+        """
+        Iterate over key, value pairs in insertion order
+
+        Rows are fetched in batches of FETCH_SIZE without adding them to the
+        cache. Values that are cached are returned from the cache.
+
+        :rtype: generator
+        """
+
+        last = -1
+        while True:
+            rows = self._select('SELECT id, key, value FROM "{0}" WHERE id > ? ORDER BY id LIMIT ?',
+                                last, FETCH_SIZE).fetchall()
+            for last, key, value in rows:
+                key = decode_key(key)
+                if key in self.cache:
+                    yield key, self.cache[key]
+                else:
+                    yield key, self._record(key, pickle.loads(bytes(value)))
+
+            if len(rows) < FETCH_SIZE:
+                break
+
+    def iter_keys(self):
+        """
+        Iterate over keys in insertion order
+
+        Keys are fetched in batches of FETCH_SIZE so the table may be changed
+        while iterating.
+
+        :rtype: generator
+        """
+
+        last = -1
+        while True:
+            rows = self._select('SELECT id, key FROM "{0}" WHERE id > ? ORDER BY id LIMIT ?',
+                                last, FETCH_SIZE).fetchall()
+            for last, key in rows:
+                yield decode_key(key)
+
+            if len(rows) < FETCH_SIZE:
+                break
+
+    def merge(self, record, changed=None, removed=(), clear=False):
+        """
+        Merge the changes made to a record into the current value of its key
+
+        If the record is no longer the cached value of the key, the changes
+        are applied to the current value which is then copied to the record.
+        Nothing is written if the key no longer exists or its value is no
+        longer a dictionary.
+
+        :param record:  changed record
+        :type record:   SQLiteRecord
+        :param changed: changed key, value pairs
+        :type changed:  :py:dict
+        :param removed: removed keys
+        :type removed:  :py:list
+        :param clear:   all keys were removed
+        :type clear:    :py:bool
+        """
+
+        try:
+            current = self.get(record._key)
+        except KeyError:
+            return
+
+        if current is not record:
+            if not isinstance(current, dict):
+                return
+
+            if clear:
+                dict.clear(current)
+            for key in removed:
+                dict.pop(current, key, None)
+            dict.update(current, changed or {})
+
+            dict.clear(record)
+            dict.update(record, current)
+
+        self.set(record._key, current)
+
+    def neighbours(self, node, reverse=False):
+        """
+        Return target nodes of edges with node as source in insertion order
+
+        :param node:    node to return neighbours for
+        :param reverse: return source nodes of edges with node as target
+        :type reverse:  :py:bool
+
+        :rtype:         :py:list
+        """
+
+        if reverse:
+            sql = 'SELECT source FROM "{0}" WHERE target=? ORDER BY id'
+        else:
+            sql = 'SELECT target FROM "{0}" WHERE source=? ORDER BY id'
+
+        try:
+            return [decode_key(row[0]) for row in self._select(sql, encode_key(node))]
+        except TypeError:
+            return []
+
+    def referrers(self, key):
+        """
+        Return keys having a data reference to key
+
+        :param key: referred key
+
+        :rtype:     :py:list
+        """
+
+        return [decode_key(row[0]) for row in self._select('SELECT key FROM "{0}" WHERE ref=? ORDER BY id',
+                                                           encode_key(key))]
+
+    def set(self, key, value):
+        """
+        Set the value of key
+
+        :param key:     key to set value for
+        :param value:   value to set
+        """
+
+        self.set_many([(key, value)])
+
+    def set_many(self, items):
+        """
+        Set the values for multiple keys
+
+        New keys are inserted using a single batched statement.
+
+        :param items:   key, value pairs
+        :type items:    iterable of :py:tuple
+        """
+
+        insert = OrderedDict()
+        update = []
+        for key, value in items:
+            row = self._row(key, value)
+            if key in insert or key not in self:
+                insert[key] = row
+            else:
+                update.append(row[1:3] + row[:1])
+
+            if not (isinstance(value, SQLiteRecord) and value._table is self and value._key == key):
+                value = self._record(key, value)
+            self._cache(key, value)
+
+        connection = self.database.connection
+        if update:
+            connection.executemany('UPDATE "{0}" SET value=?, ref=? WHERE key=?'.format(self.name), update)
+        if insert:
+            connection.executemany('INSERT INTO "{0}" (key, value, ref, source, target) VALUES (?, ?, ?, ?, ?)'.format(
+                self.name), insert.values())
+
+        self.size += len(insert)
+        self.database.changed(len(insert) + len(update))
+
+
+class SQLiteAdjacencyView(DictAdjacencyView):
+    """
+    Adjacency View class for the SQLiteStorage driver
+
+    Resolves node neighbours and predecessors using index lookups on the
+    source and target columns of the SQLite edge table.
+    """
+
+    def _neighbours(self, node, reverse=False):
+        """
+        Return the neighbour nodes of node from the edge table of the full
+        edge storage.
+
+        :param node:    node to return neighbours for
+        :param reverse: return predecessor nodes instead
+        :type reverse:  :py:bool
+
+        :rtype:         :py:list
+        """
+
+        return self.edges.neighbours(node, reverse=reverse)
+
+
+class SQLiteStorage(GraphDriverBaseClass):
+    """
+    SQLiteStorage class
+
+    Provides a Python dict like storage backed by a table in a SQLite database
+    (SQLiteTable). The class supports weak referencing of the internal
+    SQLiteTable (_storage) using the `weakref` module enabling true
+    synchronized views across different instances of the SQLiteStorage class.
+    """
+
+    __slots__ = ('_storage', '_view', '_data_pointer_key')
+
+    def __init__(self, *args, **kwargs):
+        """
+        Implement class __init__
+
+        Initiate the internal _storage SQLiteTable.
+        If a SQLiteStorage instance is provided, setup a weak reference to its
+        _storage. A SQLiteTable instance is used as _storage directly.
+        Otherwise store the items of any mapping accepted by the native Python
+        dict constructor in a table in a new temporary database.
+        """
+
+        self._view = None
+        self._storage = None
+        self._data_pointer_key = DATA_POINTER_KEY
+
+        if len(args) > 1:
+            raise TypeError('update expected at most 1 arguments, got {0}'.format(len(args)))
+        mappable = args[0] if args else kwargs
+
+        # mappable is SQLiteStorage instance, setup weakref to _storage
+        if isinstance(mappable, SQLiteStorage):
+            self._storage = weakref.ref(mappable._storage)()
+
+        elif isinstance(mappable, SQLiteTable):
+            self._storage = mappable
+
+        # mappable is any type accepted by the dict class constructor
+        else:
+            self._storage = SQLiteTable(SQLiteDatabase(), u'storage')
+            self.update_from(mappable)
+
+    def __contains__(self, item):
+        """
+        Implement class __contains__
+
+        :param item: key to check existence for
+
+        :rtype:      :py:bool
+        """
+
+        if self.is_view:
+            return item in self._view
+        return item in self._storage
+
+    def __delitem__(self, key):
+        """
+        Implement class abstract method __delitem__
+
+        If the storage class defines a data 'view' on the parent, remove the
+        key from the view.
+
+        Prevent orphan data pointers by updating the values of all keys that
+        have a data reference (_data_pointer_key) to the current key with the
+        data of the current key.
+
+        :param key: key to remove
+
+        :raises:    KeyError, key not found
+        """
+
+        if key not in self:
+            raise KeyError(key)
+
+        if self.is_view:
+            del self._view[key]
+
+        # resolve orphan data pointers
+        if self._data_pointer_key is not None:
+            value = self._storage.get(key)
+            for target_key in self._storage.referrers(key):
+                target_value = dict(self._storage.get(target_key))
+                if target_value.get(self._data_pointer_key) == key:
+                    target_value.update(value)
+                    del target_value[self._data_pointer_key]
+                    self._storage.set(target_key, target_value)
+
+        self._storage.delete(key)
+
+    def __getitem__(self, key):
+        """
+        Implement class abstract method __getitem__
+
+        If the storage class defines a data 'view' on the parent, check if the
+        key is in the view.
+        Resolve data references defined using the self._data_pointer_key.
+
+        :param key: attribute to return value for
+
+        :raises:    KeyError, key not found
+        """
+
+        if self.is_view and key not in self._view:
+            raise KeyError(key)
+
+        return self._resolve(key, self._storage.get(key))
+
+    def __getstate__(self):
+        """
+        Implement class __getstate__
+
+        Enables the class to be pickled. Required because the class uses
+        __slots__
+
+        :return:    object content for pickling
+        :rtype:     :py:dict
+        """
+
+        state = {}
+        for key in self.__slots__:
+            state[key] = getattr(self, key)
+
+        return state
+
+    def __setitem__(self, key, value):
+        """
+        Implement class abstract method __setitem__
+
+        If the storage class defines a data 'view' on the parent, add the new
+        key to the view.
+        Resolve data references defined using the self._data_pointer_key and
+        set new value on the source attribute.
+
+        :param key:     attribute to set value for
+        :param value:   value to set
+        """
+
+        key = to_unicode(key)
+
+        if key in self:
+            key = self.get_data_reference(key, default=key)
+        elif self.is_view:
+            self._view[key] = None
+
+        self._storage.set(key, to_unicode(value))
+
+    def __setstate__(self, state):
+        """
+        Implement class __setstate__
+
+        Enables the class to be unpickled. Required because the class uses
+        __slots__
+
+        :param state:    object content for unpickling
+        :type state:     :py:dict
+        """
+
+        for key, value in state.items():
+            if key in self.__slots__:
+                setattr(self, key, value)
+
+    def __iter__(self):
+        """
+        Implement class __iter__
+
+        Iterate over keys in _storage
+        """
+
+        if self.is_view:
+            return iter(self._view)
+
+        return self._storage.iter_keys()
+
+    def __len__(self):
+        """
+        Implement class __len__
+
+        Returns the number of items in the _storage or the selective view on it.
+        """
+
+        if self.is_view:
+            return len(self._view)
+
+        return len(self._storage)
+
+    def _iter_items(self):
+        """
+        Iterate over key, value pairs resolving data references
+
+        Items of the full storage are read from the table in batches instead
+        of one key at the time.
+
+        :rtype: generator
+        """
+
+        if self.is_view:
+            for key in self._view:
+                yield key, self[key]
+        else:
+            for key, value in self._storage.iter_items():
+                yield key, self._resolve(key, value)
+
+    def _resolve(self, key, value):
+        """
+        Resolve a data reference defined in the value of key
+
+        :param key:     key of the value
+        :param value:   value of the key
+
+        :return:        value of the referred key or value
+        """
+
+        if self._data_pointer_key is None or not isinstance(value, dict):
+            return value
+
+        refkey = value.get(self._data_pointer_key)
+        if refkey is None:
+            return value
+
+        if refkey not in self._storage:
+            logger.warning('"{0}" defines a reference ({1}) to non-existing "{2}"'.format(
+                key, self._data_pointer_key, refkey))
+            return {}
+        return self._storage.get(refkey)
+
+    def commit(self):
+        """
+        Commit pending changes to the database file
+        """
+
+        self._storage.database.commit()
+
+    def copy(self):
+        """
+        Return a deep copy of the storage class with the same view as
+        the parent instance.
+
+        The copy is stored in a new temporary database.
+
+        :return:    deep copy of storage instance
+        :rtype:     SQLiteStorage
+        """
+
+        deepcopy = SQLiteStorage(self._storage.__deepcopy__({}))
+        if self.is_view:
+            deepcopy.set_view(self._view)
+
+        return deepcopy
+
+    def del_data_reference(self, target):
+        """
+        Remove self._data_pointer_key data reference in target
+
+        :param target: key of target to remove self._data_pointer_key from
+        """
+
+        if target in self:
+            value = self._storage.get(target)
+            if isinstance(value, dict) and self._data_pointer_key in value:
+                del value[self._data_pointer_key]
+
+    def get_data_reference(self, target, default=None):
+        """
+        Check if the key defines a reference to the data of another key using
+        the self._data_pointer_key.
+
+        :param target:  key to check
+        :param default: default to return if self._data_pointer_key not found
+
+        :return:        referred key or None
+        """
+
+        target = self._storage.get(target)
+        if isinstance(target, dict):
+            return target.get(self._data_pointer_key, default)
+        return default
+
+    def neighbours(self, node, reverse=False):
+        """
+        Return the neighbour nodes of node in the full storage
+
+        :param node:    node ID to return neighbours for
+        :param reverse: return predecessor nodes instead
+        :type reverse:  :py:bool
+
+        :return:        node ID's
+        :rtype:         :py:list
+        """
+
+        return self._storage.neighbours(node, reverse=reverse)
+
+    def query(self, match_func):
+        """
+        Storage query method
+
+        Same as the `GraphDriverBaseClass.query` method but reads the items
+        from the database in batches.
+
+        :param match_func:  lambda query function
+        :type match_func:   :py:lambda
+
+        :return:            list of primary storage identifiers (keys) matching
+                            the lambda query
+        :rtype:             :py:list
+        """
+
+        if not callable(match_func):
+            raise TypeError('"match_func" argument is not a function (got {0})'.format(match_func))
+
+        results = []
+        for k, v in self._iter_items():
+            try:
+                if match_func(k, v):
+                    results.append(k)
+            except Exception as e:
+                logger.warning('Error in lambda query function: {0}'.format(e))
+
+        return results
+
+    def set_many(self, items):
+        """
+        Implement batched dictionary setter
+
+        New keys are inserted in the table using a single batched statement.
+        Existing keys are set using `__setitem__` to resolve their data
+        references.
+
+        :param items: key, value pairs to add or update
+        :type items:  iterable of :py:tuple
+        """
+
+        new = []
+        for key, value in items:
+            key = to_unicode(key)
+            if key in self._storage:
+                self.__setitem__(key, value)
+                continue
+
+            if self.is_view:
+                self._view[key] = None
+            new.append((key, to_unicode(value)))
+
+        self._storage.set_many(new)
+
+    def set_data_references(self, references):
+        """
+        Batched version of the `set_data_reference` method
+
+        :param references:  source, target key pairs to set a reference for
+                            having the target refer to the data of the source
+        :type references:   iterable of :py:tuple
+        """
+
+        items = []
+        for source, target in references:
+            if source in self:
+                items.append((target, {self._data_pointer_key: source}))
+            else:
+                logger.error('Unable to set reference from source {0} to target {1}. Source does not exist.'.format(
+                    source, target))
+
+        self.set_many(items)
+
+    def update_from(self, mappable):
+        """
+        Add the items of a mapping to the storage
+
+        Data references of a graphit storage driver instance are copied as is.
+
+        :param mappable: any type accepted by the dict class constructor
+        """
+
+        if mappable is None:
+            return
+
+        if isinstance(mappable, GraphDriverBaseClass):
+            with mappable:
+                self.set_many(list(mappable.items()))
+        else:
+            self.set_many(dict(mappable).items())
+
+    def items(self):
+        """
+        Implement Python 3 dictionary like 'items' method that returns a
+        DictView class.
+
+        :return: dictionary items as tuple of key/value pairs
+        :rtype:  SQLiteItemsView instance
+        """
+
+        return SQLiteItemsView(self)
+
+    iteritems = items
+
+    def keys(self):
+        """
+        Implement Python 3 dictionary like 'keys' method that returns a DictView
+        class.
+
+        :return: dictionary keys
+        :rtype:  KeysView instance
+        """
+
+        return KeysView(self)
+
+    iterkeys = keys
+
+    def values(self):
+        """
+        Implement Python 3 dictionary like 'values' method that returns a DictView
+        class.
+
+        :return: dictionary values
+        :rtype:  SQLiteValuesView instance
+        """
+
+        return SQLiteValuesView(self)
+
+    itervalues = values
+
+
+class SQLiteItemsView(ItemsView):
+    """
+    Items view on a SQLiteStorage reading the items in batches
+    """
+
+    __slots__ = ()
+
+    def __iter__(self):
+
+        return self._mapping._iter_items()
+
+
+class SQLiteValuesView(ValuesView):
+    """
+    Values view on a SQLiteStorage reading the values in batches
+    """
+
+    __slots__ = ()
+
+    def __iter__(self):
+
+        return (value for key, value in self._mapping._iter_items())
@@ -11,10 +11,12 @@ therefor they should work for every storage driver. A driver can implement
 it's own version of a view for performance purposes for instance.
 """
 
+from collections import OrderedDict
+
 from graphit.graph_py2to3 import colabc
 from graphit.graph_exceptions import GraphitNodeNotFound
 
-__all__ = ['AdjacencyView', 'DataView']
+__all__ = ['AdjacencyView', 'DataView', 'LazyView']
 
 
 class AdjacencyView(object):
@@ -229,6 +231,33 @@ class AdjacencyView(object):
             return default
         return self.__getitem__(node)
 
+    def incident_edges(self, nodes, method='degree'):
+        """
+        Return the edges connected to one or more nodes
+
+        Reports the edges of type:
+
+        * indegree: edges from others to the nodes
+        * outdegree: edges from the nodes to others
+        * degree: indegree and outdegree combined
+
+        Every edge is reported once, also when it connects two of the nodes.
+
+        :param nodes:   Nodes to return connected edges for
+        :type nodes:    :py:list
+        :param method:  edge type as 'indegree', 'outdegree' or both 'degree'
+        :type method:   :py:str
+
+        :return:        connected edges
+        :rtype:         :py:list
+        """
+
+        nodes = set(nodes)
+        outgoing = method in ('degree', 'outdegree')
+        incoming = method in ('degree', 'indegree')
+
+        return [edge for edge in self.edges if (outgoing and edge[0] in nodes) or (incoming and edge[1] in nodes)]
+
     def items(self):
         """
         Implements dict-like `items` method
@@ -458,3 +487,96 @@ class DataView(colabc.Set):
         """
 
         return list(self)
+
+
+class LazyView(object):
+    """
+    Selective view on a storage resolved on first use
+
+    The keys of the view are obtained by calling `resolver` the first time
+    the view is used. The resolved keys are registered on the storage using
+    the `set_view` method of the storage driver replacing the LazyView.
+
+    The class is used as `_view` of a storage in which case the storage
+    driver methods operate on the LazyView as they would on a regular view
+    because the class delegates the container methods to the resolved view.
+    """
+
+    __slots__ = ('_storage', '_resolver', '_resolved')
+
+    def __init__(self, storage, resolver):
+        """
+        Implement class __init__
+
+        :param storage:  node or edge storage instance
+        :param resolver: function returning the keys of the view
+        :type resolver:  :py:func
+        """
+
+        self._storage = storage
+        self._resolver = resolver
+        self._resolved = None
+
+    def __contains__(self, key):
+
+        return key in self.resolve()
+
+    def __copy__(self):
+
+        return OrderedDict.fromkeys(self.resolve())
+
+    def __deepcopy__(self, memo):
+
+        return OrderedDict.fromkeys(self.resolve())
+
+    def __delitem__(self, key):
+
+        del self.resolve()[key]
+
+    def __getattr__(self, name):
+
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __iter__(self):
+
+        return iter(self.resolve())
+
+    def __len__(self):
+
+        return len(self.resolve())
+
+    def __reduce__(self):
+
+        return OrderedDict, (list((key, None) for key in self.resolve()),)
+
+    def __setitem__(self, key, value):
+
+        self.resolve()[key] = value
+
+    def resolve(self):
+        """
+        Resolve the view keys and register them with the storage
+
+        If the resolved keys cover the full storage, the storage is left
+        without a view and an ordered dictionary of all storage keys is
+        returned for the current operation.
+
+        :return:    resolved view
+        :rtype:     :py:class:`OrderedDict`
+        """
+
+        if self._resolved is None:
+            storage = self._storage
+            if storage._view is self:
+                storage._view = None
+                storage.set_view(self._resolver())
+
+            self._resolved = storage._view
+            if self._resolved is None:
+                self._resolved = OrderedDict.fromkeys(storage.keys())
+
+            self._storage = self._resolver = None
+
+        return self._resolved
@@ -8,17 +8,31 @@ Unit tests for the graphit component
 
 #import networkx
 
+import random
+import unittest
+
 from tests.module.unittest_baseclass import UnittestPythonCompatibility
 
 from graphit import Graph
 from graphit.graph_exceptions import GraphitAlgorithmError
 from graphit.graph_algorithms.path_traversal import dfs_nodes, dfs_paths, dfs_edges
-from graphit.graph_algorithms.shortest_path import dijkstra_shortest_path
+from graphit.graph_algorithms.shortest_path import (dijkstra_shortest_path, single_source_shortest_path,
+                                                    predecessor_path, bidirectional_shortest_path,
+                                                    astar_shortest_path)
 from graphit.graph_algorithms.connectivity import is_reachable
-from graphit.graph_algorithms.centrality import brandes_betweenness_centrality, eigenvector_centrality
+from graphit.graph_algorithms.centrality import brandes_betweenness_centrality, eigenvector_centrality, pagerank
 
 from graphit.graph_networkx import NetworkXGraph
 
+# Check if numpy and scipy are installed for sparse matrix centrality
+try:
+    import numpy
+    import scipy.sparse
+    del numpy, scipy
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
 
 class TestGraphAlgorithms(UnittestPythonCompatibility):
 
@@ -96,6 +110,90 @@ class TestGraphAlgorithms(UnittestPythonCompatibility):
 
         self.assertListEqual(dijkstra_shortest_path(self.graph, 1, 28), [1, 2, 3, 5, 8, 10, 11, 13, 28])
 
+    def test_algorithm_dijkstra_shortest_path_no_goal(self):
+        """
+        Test Dijkstra shortest path to the furthest node without goal node
+        """
+
+        self.assertListEqual(dijkstra_shortest_path(self.graph, 1), [1, 2, 4, 7, 17, 18, 20, 21, 22, 24])
+        self.assertListEqual(dijkstra_shortest_path(self.graph, 1, weight='weight'), [1, 2, 3, 5, 8, 10, 11])
+        self.assertListEqual(dijkstra_shortest_path(self.graph, 28), [28])
+
+        # Highest node ID of the nodes at the largest distance
+        graph = Graph()
+        graph.add_edges([(1, 3), (1, 2), (3, 4), (2, 5)], node_from_edge=True)
+        self.assertListEqual(dijkstra_shortest_path(graph, 1), [1, 2, 5])
+
+        graph.add_node(6)
+        self.assertListEqual(dijkstra_shortest_path(graph, 6), [6])
+
+    def test_algorithm_single_source_shortest_path(self):
+        """
+        Test single source shortest path distances and predecessors
+        """
+
+        # Unweighted, all reachable nodes
+        distances, predecessors = single_source_shortest_path(self.graph, 1)
+        self.assertEqual(distances[28], 7)
+        self.assertEqual(predecessor_path(predecessors, 28), dijkstra_shortest_path(self.graph, 1, 28))
+        self.assertTrue(24 in distances)
+        self.assertIsNone(predecessors[1])
+
+        # Weighted
+        distances, predecessors = single_source_shortest_path(self.graph, 1, weight='weight')
+        self.assertEqual(distances[28], 8.0)
+        self.assertEqual(predecessor_path(predecessors, 28), [1, 2, 3, 5, 8, 9, 12, 13, 28])
+
+        # Unreachable node
+        distances, predecessors = single_source_shortest_path(self.graph, 8)
+        self.assertFalse(1 in distances)
+        self.assertEqual(predecessor_path(predecessors, 1), [])
+
+        # Stop at target nodes
+        for weight in (None, 'weight'):
+            distances, predecessors = single_source_shortest_path(self.graph, 1, targets=[3, 4], weight=weight)
+            self.assertEqual(predecessor_path(predecessors, 4), [1, 2, 4])
+            self.assertFalse(28 in distances)
+
+    def test_algorithm_bidirectional_shortest_path(self):
+        """
+        Test bidirectional shortest path, weighted and non-weighted.
+        """
+
+        self.assertListEqual(bidirectional_shortest_path(self.graph, 1, 28), [1, 2, 3, 14, 15, 12, 13, 28])
+        self.assertListEqual(bidirectional_shortest_path(self.graph, 1, 28, weight='weight'),
+                             [1, 2, 3, 5, 8, 9, 12, 13, 28])
+        self.assertListEqual(bidirectional_shortest_path(self.graph, 1, 1), [1])
+
+        # Directed edges are not traversed in reverse
+        self.assertListEqual(bidirectional_shortest_path(self.graph, 28, 1), [])
+        self.assertListEqual(bidirectional_shortest_path(self.graph, 28, 1, weight='weight'), [])
+
+    def test_algorithm_astar_shortest_path(self):
+        """
+        Test A* shortest path with and without heuristic
+        """
+
+        self.assertListEqual(astar_shortest_path(self.graph, 1, 28), [1, 2, 3, 14, 15, 12, 13, 28])
+        self.assertListEqual(astar_shortest_path(self.graph, 1, 28, weight='weight'),
+                             [1, 2, 3, 5, 8, 9, 12, 13, 28])
+
+        # Admissible heuristic: remaining unweighted path length
+        distances = dict((n, len(dijkstra_shortest_path(self.graph, n, 28)) - 1) for n in self.graph.nodes)
+        path = astar_shortest_path(self.graph, 1, 28, heuristic=lambda node, goal: max(distances[node], 0))
+        self.assertEqual(len(path), 8)
+        self.assertListEqual(astar_shortest_path(self.graph, 28, 1), [])
+
+        # Admissible but inconsistent heuristic requires exploring 'b' again
+        graph = Graph(auto_nid=False)
+        graph.directed = True
+        for edge, weight in ((('s', 'a'), 1), (('a', 'b'), 1), (('s', 'b'), 3), (('b', 'g'), 3)):
+            graph.add_edge(node_from_edge=True, weight=weight, *edge)
+
+        estimates = {'s': 0, 'a': 4, 'b': 0, 'g': 0}
+        path = astar_shortest_path(graph, 's', 'g', heuristic=lambda node, goal: estimates[node], weight='weight')
+        self.assertListEqual(path, ['s', 'a', 'b', 'g'])
+
     def test_algorithm_dfs_paths(self):
         """
         Test depth-first search of all paths between two nodes
@@ -199,6 +297,38 @@ class TestGraphAlgorithms(UnittestPythonCompatibility):
                               12: 15.0, 13: 12.0, 14: 15.0, 15: 12.0, 16: 0.0, 17: 42.0, 18: 42.0, 19: 0.0, 20: 32.0,
                               21: 27.0, 22: 20.0, 23: 0.0, 24: 0.0, 25: 12.0, 26: 10.0, 27: 0.0, 28: 0.0})
 
+    def test_algorithm_brandes_betweenness_centrality_parallel(self):
+        """
+        Test parallel Brandes betweenness centrality equals serial calculation
+        """
+
+        for kwargs in ({}, {'weight': 'weight'}, {'endpoints': True}, {'nodes': [1, 2, 7, 17]}):
+            self.assertDictAlmostEqual(brandes_betweenness_centrality(self.graph, processes=3, **kwargs),
+                                       brandes_betweenness_centrality(self.graph, **kwargs))
+
+    def test_algorithm_brandes_betweenness_centrality_approximate(self):
+        """
+        Test approximate Brandes betweenness centrality using sampled pivots
+        """
+
+        # Sampling all nodes equals the exact betweenness
+        self.assertDictEqual(brandes_betweenness_centrality(self.graph, k=len(self.graph)),
+                             brandes_betweenness_centrality(self.graph))
+
+        # Same seed, same sample
+        approx = brandes_betweenness_centrality(self.graph, k=10, seed=1)
+        self.assertDictEqual(approx, brandes_betweenness_centrality(self.graph, k=10, seed=1))
+        self.assertDictAlmostEqual(approx, brandes_betweenness_centrality(self.graph, k=10, seed=1, processes=2))
+        self.assertEqual(set(approx.keys()), set(self.graph.nodes.keys()))
+
+        # Non-normalized values are rescaled by the sampling ratio
+        sample = random.Random(1).sample(list(self.graph.nodes), 10)
+        partial = brandes_betweenness_centrality(self.graph, nodes=sample, normalized=False)
+        approx = brandes_betweenness_centrality(self.graph, k=10, seed=1, normalized=False)
+        self.assertDictAlmostEqual(approx, dict((n, v * len(self.graph) / 10.0) for n, v in partial.items()))
+
+        self.assertRaises(GraphitAlgorithmError, brandes_betweenness_centrality, self.graph, k=0)
+
     def test_algorithm_eigenvector_centrality(self):
         """
         Test graph node eigenvector centrality
@@ -232,3 +362,45 @@ class TestGraphAlgorithms(UnittestPythonCompatibility):
 
         # Non-convergence exception
         self.assertRaises(GraphitAlgorithmError, eigenvector_centrality, self.graph, max_iter=100)
+
+    @unittest.skipIf(HAS_SCIPY is False, 'numpy and scipy packages not installed')
+    def test_algorithm_eigenvector_centrality_sparse(self):
+        """
+        Test sparse matrix eigenvector centrality equals the default
+        """
+
+        for weight in (None, 'weight'):
+            expected = eigenvector_centrality(self.graph, max_iter=1000, weight=weight)
+            result = eigenvector_centrality(self.graph, max_iter=1000, weight=weight, sparse=True)
+
+            self.assertEqual(set(result.keys()), set(expected.keys()))
+            for node, value in expected.items():
+                self.assertAlmostEqual(result[node] / value, 1.0, places=9)
+
+        self.assertRaises(GraphitAlgorithmError, eigenvector_centrality, self.graph, max_iter=100, sparse=True)
+
+    @unittest.skipIf(HAS_SCIPY is False, 'numpy and scipy packages not installed')
+    def test_algorithm_pagerank(self):
+        """
+        Test PageRank with damping and personalization
+        """
+
+        # Directed cycle, uniform rank
+        cycle = Graph(auto_nid=False)
+        cycle.directed = True
+        for eid in ((1, 2), (2, 3), (3, 1)):
+            cycle.add_edge(node_from_edge=True, *eid)
+        self.assertDictAlmostEqual(pagerank(cycle), {1: 1 / 3.0, 2: 1 / 3.0, 3: 1 / 3.0})
+
+        # Ranks sum to one, dangling sink nodes rank high
+        ranks = pagerank(self.graph, weight='weight')
+        self.assertAlmostEqual(sum(ranks.values()), 1.0)
+        self.assertTrue(ranks[23] > ranks[1])
+
+        # Without damping all rank goes to the personalization vector
+        self.assertDictAlmostEqual(pagerank(self.graph, damping=0, personalization={1: 1, 2: 3}),
+                                   dict((n, {1: 0.25, 2: 0.75}.get(n, 0.0)) for n in self.graph.nodes))
+
+        self.assertRaises(GraphitAlgorithmError, pagerank, self.graph, damping=1.5)
+        self.assertRaises(GraphitAlgorithmError, pagerank, self.graph, personalization={1: 0})
+        self.assertRaises(GraphitAlgorithmError, pagerank, self.graph, max_iter=1)
@@ -11,9 +11,13 @@ from tests.module.unittest_baseclass import UnittestPythonCompatibility
 
 from graphit.graph_exceptions import GraphitException
 from graphit.graph_io.io_jgf_format import read_jgf
+from graphit.graph_io.io_pydata_format import read_pydata
 from graphit.graph_axis.graph_axis_methods import (node_children, node_parent, node_all_parents, node_neighbors,
-                                                   node_ancestors, node_descendants, node_leaves, node_siblings)
+                                                   node_ancestors, node_descendants, node_leaves, node_siblings,
+                                                   node_is_ancestor)
 from graphit.graph_axis.graph_axis_mixin import NodeAxisTools
+from graphit.graph_axis.graph_axis_hierarchy import node_hierarchy
+from graphit.graph_algorithms.shortest_path import dijkstra_shortest_path
 
 
 class GraphAxisChildrenTests(UnittestPythonCompatibility):
@@ -844,6 +848,101 @@ class GraphAxisRootTests(UnittestPythonCompatibility):
         self.assertRaises(GraphitException, self.graph.children)
 
 
+class GraphAxisHierarchyTests(UnittestPythonCompatibility):
+    currpath = os.path.dirname(__file__)
+    _axis_graph = os.path.join(currpath, '../files/graph_axis.jgf')
+
+    def setUp(self):
+        """
+        Graph axis test class setup
+
+        Load graph from graph_axis.jgf in JSON format
+        """
+
+        self.graph = read_jgf(self._axis_graph)
+
+    def test_hierarchy_index(self):
+        """
+        Test parent and path from the hierarchy index equal the Dijkstra
+        shortest path from the root
+        """
+
+        hierarchy = node_hierarchy(self.graph, self.graph.root)
+
+        self.assertEqual(hierarchy.depth[self.graph.root], 0)
+        self.assertIsNone(hierarchy.parent[self.graph.root])
+        for nid in self.graph.nodes:
+            self.assertEqual(hierarchy.path(nid), dijkstra_shortest_path(self.graph, self.graph.root, nid))
+
+        # Index is cached per root and not available for views
+        self.assertTrue(node_hierarchy(self.graph, self.graph.root) is hierarchy)
+        self.assertIsNone(node_hierarchy(self.graph.getnodes([1, 2]), 1))
+
+    def test_hierarchy_index_change_root(self):
+        """
+        Test hierarchy index after root reassignment
+        """
+
+        self.assertEqual(self.graph.parent(27, return_nids=True), 24)
+
+        self.graph.root = 26
+        self.assertEqual(node_hierarchy(self.graph, 26).root, 26)
+        self.assertEqual(self.graph.parent(27, return_nids=True), 25)
+
+    def test_hierarchy_index_edge_change(self):
+        """
+        Test rebuild of the hierarchy index after edge addition or removal
+        """
+
+        hierarchy = node_hierarchy(self.graph, self.graph.root)
+        self.assertEqual(node_parent(self.graph, 21, self.graph.root), 20)
+
+        self.graph.add_edge(1, 21)
+        self.assertFalse(node_hierarchy(self.graph, self.graph.root) is hierarchy)
+        self.assertEqual(node_parent(self.graph, 21, self.graph.root), 1)
+        self.assertEqual(node_ancestors(self.graph, 21, self.graph.root), [1])
+
+        self.graph.remove_edge(1, 21)
+        self.assertEqual(node_parent(self.graph, 21, self.graph.root), 20)
+
+    def test_hierarchy_is_ancestor(self):
+        """
+        Test ancestor check using the interval labels of the hierarchy index
+        """
+
+        self.assertTrue(node_is_ancestor(self.graph, 15, 21, self.graph.root))
+        self.assertTrue(self.graph.is_ancestor(1, 21))
+        self.assertFalse(self.graph.is_ancestor(21, 21))
+        self.assertFalse(self.graph.is_ancestor(21, 15))
+        self.assertFalse(self.graph.is_ancestor(12, 21))
+
+        for nid in self.graph.nodes:
+            ancestors = node_ancestors(self.graph, nid, self.graph.root)
+            for other in self.graph.nodes:
+                self.assertEqual(self.graph.is_ancestor(other, nid), other in ancestors)
+
+    def test_hierarchy_tree_descendants(self):
+        """
+        Test descendants from the interval labels of tree shaped graphs equal
+        the descendants found by walking the graph
+        """
+
+        self.assertFalse(node_hierarchy(self.graph, self.graph.root).is_tree)
+
+        tree = read_pydata({'one': {'two': [1, 2], 'three': {'four': 4}}, 'five': 5})
+        hierarchy = node_hierarchy(tree, tree.root)
+        self.assertTrue(hierarchy.is_tree)
+
+        for nid in tree.nodes:
+            descendants = tree.descendants(nid, return_nids=True)
+            self.assertEqual(descendants, hierarchy.descendants(nid))
+
+            # Same order as the walk used for graphs that are not a tree
+            hierarchy.is_tree = False
+            self.assertEqual(descendants, tree.descendants(nid, return_nids=True))
+            hierarchy.is_tree = True
+
+
 class GraphAxisNodeToolsTests(UnittestPythonCompatibility):
     currpath = os.path.dirname(__file__)
     _axis_graph = os.path.join(currpath, '../files/graph_axis.jgf')
@@ -575,6 +575,69 @@ class TestGraphAddEdgesAttributes(UnittestPythonCompatibility):
             self.assertDictEqual(self.graph.edges[e[::-1]], attr)
 
 
+class TestGraphLoadEdges(UnittestPythonCompatibility):
+    """
+    Test Graph load_edges bulk loading method
+    """
+
+    def setUp(self):
+        """
+        Build Graph with a few nodes but no edges yet
+        """
+
+        self.graph = Graph(auto_nid=False)
+        self.graph.add_nodes('graph')
+
+    def test_load_edges_undirectional(self):
+        """
+        Undirected edges are loaded as pair with a data reference
+        """
+
+        edges = self.graph.load_edges([('g', 'r'), ('r', 'a', {'w': 2}), ('a', 'r')], arg=True)
+
+        self.assertEqual(edges, [('g', 'r'), ('r', 'a')])
+        self.assertEqual(len(self.graph.edges), 4)
+        self.assertEqual(self.graph.edges.get_data_reference(('r', 'g')), ('g', 'r'))
+        self.assertDictEqual(self.graph.edges[('a', 'r')], {'w': 2, 'arg': True})
+        self.assertEqual(sorted(self.graph.adjacency['r']), ['a', 'g'])
+
+        # Data reference resolved on removal of the source edge
+        self.graph.remove_edge('r', 'a', directed=True)
+        self.assertDictEqual(self.graph.edges[('a', 'r')], {'w': 2, 'arg': True})
+
+    def test_load_edges_directional(self):
+        """
+        Directed edges with attributes from column arrays
+        """
+
+        edges = self.graph.load_edges([('g', 'r'), ('r', 'a')], directed=True, attributes={'weight': [1, 2]})
+
+        self.assertEqual(edges, [('g', 'r'), ('r', 'a')])
+        self.assertEqual(len(self.graph.edges), 2)
+        self.assertTrue(('r', 'g') not in self.graph.edges)
+        self.assertEqual(self.graph.edges[('r', 'a')]['weight'], 2)
+
+        # Only edges with an added edge in their undirected pair are returned
+        edges = self.graph.load_edges([('r', 'a'), ('r', 'g'), ('g', 'r')])
+        self.assertEqual(edges, [('r', 'a'), ('r', 'g')])
+        self.assertEqual(len(self.graph.edges), 4)
+
+    def test_load_edges_node_from_edge(self):
+        """
+        Missing nodes are created or raise an exception
+        """
+
+        self.assertRaises(GraphitException, self.graph.load_edges, [('g', 'x')])
+        self.assertEqual(len(self.graph.edges), 0)
+
+        self.graph = Graph()
+        self.graph.load_edges([(1, 2), (2, 3)], node_from_edge=True)
+
+        self.assertEqual(list(self.graph.nodes.keys()), [1, 2, 3])
+        self.assertTrue(self.graph.data.auto_nid)
+        self.assertEqual(self.graph, self.graph.getnodes([1, 2, 3]))
+
+
 class TestGraphRemoveEdges(UnittestPythonCompatibility):
     """
     Test removal of edges in directed and undirected way
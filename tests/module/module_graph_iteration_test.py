@@ -11,6 +11,7 @@ import types
 from tests.module.unittest_baseclass import UnittestPythonCompatibility
 
 from graphit import Graph
+from graphit.graph_cursor import NodeCursor, EdgeCursor
 
 
 class TestGraphIteration(UnittestPythonCompatibility):
@@ -88,3 +89,39 @@ class TestGraphIteration(UnittestPythonCompatibility):
 
         self.assertListEqual([e.nid for e in self.graph.iteredges(reverse=True)],
                              [(5, 4), (5, 3), (4, 5), (4, 3), (3, 5), (3, 4), (3, 2), (2, 3), (2, 1), (1, 2)])
+
+    def test_iterators_iternodes_cursor(self):
+        """
+        Iternodes returns light weight node cursors with node tools API
+        """
+
+        sub = self.graph.getnodes([1, 3, 4])
+        cursors = list(sub.iternodes(cursor=True))
+
+        self.assertIsInstance(cursors[0], NodeCursor)
+        self.assertEqual([n.nid for n in cursors], [1, 3, 4])
+        self.assertEqual([n.get() for n in cursors], ['gr', 'ap', 'ph'])
+        self.assertEqual(cursors[1].weight, 2.0)
+        self.assertEqual(cursors[1]['key'], 'a')
+        self.assertEqual(cursors[2].get('nokey', defaultattr='weight'), 2.5)
+
+        cursors[0].set('weight', 5.0)
+        cursors[1]['extra'] = True
+        self.assertEqual(self.graph.nodes[1]['weight'], 5.0)
+        self.assertTrue(self.graph.nodes[3]['extra'])
+
+        self.assertEqual(cursors[0].getgraph().nid, 1)
+
+    def test_iterators_iteredges_cursor(self):
+        """
+        Iteredges returns light weight edge cursors with edge tools API
+        """
+
+        cursors = list(self.graph.iteredges(cursor=True))
+        self.assertIsInstance(cursors[0], EdgeCursor)
+        self.assertEqual([e.nid for e in cursors], sorted(self.graph.edges.keys(), key=str))
+        self.assertTrue(all(e.get() for e in cursors))
+
+        cursors = list(self.graph.iteredges(cursor=True, group_pairs=True))
+        self.assertEqual(len(cursors), 5)
+        self.assertEqual(cursors[0].get('weight'), 43.2)
@@ -12,6 +12,8 @@ from tests.module.unittest_baseclass import UnittestPythonCompatibility, UNICODE
 
 from graphit import Graph
 from graphit.graph_exceptions import GraphitException
+from graphit.graph_helpers import edges_between_nodes
+from graphit.graph_storage_drivers.graph_storage_views import LazyView
 
 
 class TestGraphAddNode(UnittestPythonCompatibility):
@@ -671,3 +673,129 @@ class TestGraphAddNodeConnected(UnittestPythonCompatibility):
         edge = self.graph.getedges(('two', self.node))
         self.assertTrue(all(e.get('arg', False) for e in edge.edges.values()))
         self.assertTrue(all(e.get('e') == 5.44 for e in edge.edges.values()))
+
+
+class TestGraphLoadNodes(UnittestPythonCompatibility):
+    """
+    Test Graph load_nodes bulk loading method
+    """
+
+    def setUp(self):
+        """
+        Build empty graph
+        """
+
+        self.graph = Graph()
+
+    def test_load_nodes_autonid(self):
+        """
+        Test bulk loading nodes with auto_nid equals True
+        """
+
+        nids = self.graph.load_nodes(['one', ('two', {'extra': True}), 'three'], arg=1.22)
+
+        self.assertEqual(nids, [1, 2, 3])
+        self.assertEqual(self.graph.data.nodeid, 4)
+        self.assertDictEqual(self.graph.nodes[2], {'key': 'two', 'extra': True, 'arg': 1.22, '_id': 2})
+        self.assertEqual(self.graph.add_node('four'), 4)
+
+    def test_load_nodes_columns(self):
+        """
+        Test bulk loading node attributes from column arrays
+        """
+
+        self.graph.load_nodes(['one', 'two', 'three'], attributes={'weight': [1, 2, 3], 'mark': 'abc'})
+
+        self.assertEqual([node['weight'] for node in self.graph.nodes.values()], [1, 2, 3])
+        self.assertEqual([node['mark'] for node in self.graph.nodes.values()], ['a', 'b', 'c'])
+        self.assertRaises(GraphitException, self.graph.load_nodes, ['one'], attributes={'weight': [1, 2]})
+
+    def test_load_nodes_shared_copy(self):
+        """
+        Mutable shared attributes are copied per node
+        """
+
+        self.graph.load_nodes(['one', 'two'], items=[])
+        self.graph.nodes[1]['items'].append(1)
+
+        self.assertEqual(self.graph.nodes[2]['items'], [])
+
+    def test_load_nodes_record_copy(self):
+        """
+        Mutable record and column attributes are copied per node
+        """
+
+        attrs = {'tags': ['a']}
+        columns = {'items': [[], []]}
+        self.graph.load_nodes([('one', attrs), ('two', attrs)], attributes=columns)
+        self.graph.nodes[1]['tags'].append('b')
+        self.graph.nodes[1]['items'].append(1)
+
+        self.assertEqual(self.graph.nodes[2]['tags'], ['a'])
+        self.assertEqual(attrs, {'tags': ['a']})
+        self.assertEqual(columns, {'items': [[], []]})
+
+    def test_load_nodes_duplicate(self):
+        """
+        Existing nodes are updated when auto_nid equals False
+        """
+
+        self.graph.data.auto_nid = False
+        self.graph.add_node('one', arg=1)
+
+        nids = self.graph.load_nodes(['one', 'two', 'two'], arg=2)
+
+        self.assertEqual(nids, ['one', 'two', 'two'])
+        self.assertEqual(len(self.graph), 2)
+        self.assertDictEqual(self.graph.nodes['one'], {'key': 'one', 'arg': 2, '_id': 1})
+        self.assertRaises(GraphitException, self.graph.load_nodes, [None])
+
+
+class TestGraphGetNodes(UnittestPythonCompatibility):
+    """
+    Test selection of nodes as sub graph using the `getnodes` method
+    """
+
+    def setUp(self):
+        """
+        Build undirected Graph
+        """
+
+        self.graph = Graph()
+        self.graph.add_edges([(1, 2), (2, 3), (3, 4), (4, 5)], node_from_edge=True)
+
+    def test_getnodes_lazy_edges(self):
+        """
+        The edge view of a node selection is resolved on first use
+        """
+
+        sub = self.graph.getnodes([1, 2, 3])
+        self.assertIsInstance(sub.edges._view, LazyView)
+
+        self.assertEqual(len(sub.edges), 4)
+        self.assertEqual(sorted(sub.edges), [(1, 2), (2, 1), (2, 3), (3, 2)])
+        self.assertFalse(isinstance(sub.edges._view, LazyView))
+
+        # Resolved in node adjacency and subgraph copies
+        sub = self.graph.getnodes([3, 4])
+        self.assertEqual(sub.adjacency[3], [4])
+
+        sub = self.graph.getnodes([4, 5])
+        self.assertEqual(sorted(sub.copy().edges), [(4, 5), (5, 4)])
+
+    def test_getnodes_edges_order(self):
+        """
+        Edges between nodes are returned in adjacency order
+        """
+
+        self.assertEqual(edges_between_nodes(self.graph, [3, 2, 1]), [(3, 2), (2, 1), (2, 3), (1, 2)])
+        self.assertEqual(edges_between_nodes(self.graph, iter([1, 2])), [(1, 2), (2, 1)])
+
+    def test_getnodes_lazy_edges_single(self):
+        """
+        Single node selection without self loops has no edges
+        """
+
+        node = self.graph.getnodes(3)
+        self.assertEqual(node.nid, 3)
+        self.assertEqual(len(node.edges), 0)
@@ -7,12 +7,18 @@ Unit tests for Graph query methods
 """
 
 import os
+import random
+import threading
+
+from decimal import Decimal
 
 from tests.module.unittest_baseclass import UnittestPythonCompatibility
 
+from graphit import Graph
 from graphit.graph_io.io_jgf_format import read_jgf
 from graphit.graph_axis.graph_axis_mixin import NodeAxisTools
-from graphit.graph_query.query_xpath import XpathExpressionEvaluator
+from graphit.graph_query.query_xpath import XpathExpressionEvaluator, XpathQueryPlan
+from graphit.graph_storage_drivers.graph_attribute_indexes import RangeIndex
 
 
 class TestXPathQuery(UnittestPythonCompatibility):
@@ -153,3 +159,401 @@ class TestXPathQuery(UnittestPythonCompatibility):
         xpath = XpathExpressionEvaluator(sep='.')
 
         xpath.resolve('system.segid.residue', self.graph)
+
+    def test_query_compile(self):
+        """
+        Test reuse of compiled XPath query plans
+        """
+
+        xpath = XpathExpressionEvaluator()
+
+        plan = xpath.compile('//residue[@extra]')
+        self.assertTrue(isinstance(plan, XpathQueryPlan))
+        self.assertEqual(set(plan(self.graph).nodes.keys()), {21, 28})
+        self.assertEqual(set(xpath.resolve(plan, self.graph).nodes.keys()), {21, 28})
+        self.assertEqual(set(self.graph.xpath(plan).nodes.keys()), {21, 28})
+
+        # Plans are cached by expression and separator
+        self.assertTrue(xpath.compile('//residue[@extra]') is plan)
+        self.assertTrue(XpathExpressionEvaluator().compile('//residue[@extra]') is plan)
+        self.assertFalse(XpathExpressionEvaluator(sep='.').compile('//residue[@extra]') is plan)
+
+    def test_query_compile_cache_size(self):
+        """
+        Test removal of least recently used query plans from the cache
+        """
+
+        class SmallCacheEvaluator(XpathExpressionEvaluator):
+            cache_size = 2
+
+        plan = XpathExpressionEvaluator().compile('//residue')
+        xpath = SmallCacheEvaluator()
+
+        first = xpath.compile('//segid')
+        xpath.compile('//residue')
+        xpath.compile('//segid')
+        xpath.compile('//atom')
+
+        cache = XpathExpressionEvaluator._plan_caches[SmallCacheEvaluator]
+        self.assertTrue(xpath.compile('//segid') is first)
+        self.assertTrue(('//residue', '/') not in cache)
+        self.assertEqual(len(cache), 2)
+
+        # Caches of other evaluator classes are not affected
+        self.assertTrue(XpathExpressionEvaluator().compile('//residue') is plan)
+        self.assertFalse(xpath.compile('//residue') is plan)
+
+    def test_query_compile_threads(self):
+        """
+        Test concurrent use of the query plan cache
+        """
+
+        class SmallCacheEvaluator(XpathExpressionEvaluator):
+            cache_size = 1
+
+        errors = []
+
+        def compile_plans(start):
+            xpath = SmallCacheEvaluator()
+            try:
+                for i in range(200):
+                    xpath.compile('//residue[{0}]'.format((start + i) % 7))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=compile_plans, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(XpathExpressionEvaluator._plan_caches[SmallCacheEvaluator]), 1)
+
+
+class TestXPathQueryIndexed(TestXPathQuery):
+    """
+    Run the XPath query tests using an attribute index on the node key_tag
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create a graph to query with attribute index
+        """
+
+        super(TestXPathQueryIndexed, cls).setUpClass()
+        cls.graph.add_index(cls.graph.data.key_tag)
+
+
+class TestXPathQueryNidSets(TestXPathQuery):
+    """
+    Run the XPath query tests evaluating path steps on node ID's
+    """
+
+    def setUp(self):
+        """
+        Evaluate queries on node ID's unless requested otherwise
+        """
+
+        resolve = XpathExpressionEvaluator.resolve
+
+        def resolve_nid_sets(xpath, expression, graph, nid_sets=True):
+            return resolve(xpath, expression, graph, nid_sets=nid_sets)
+
+        XpathExpressionEvaluator.resolve = resolve_nid_sets
+        self.addCleanup(setattr, XpathExpressionEvaluator, 'resolve', resolve)
+
+    def test_query_nid_sets_equivalence(self):
+        """
+        Test equal results for graph and node ID based evaluation
+        """
+
+        for expression in ('//residue[@extra]', '//atom[@value>620][3]', '/system/segid/residue/atom[@elem="H"]',
+                           '//residue/parent::*', '//atom/ancestor::segid', '//residue[3]/following-sibling::residue',
+                           '//segid[@value="A"]/residue[@value=1]/..', 'child::segid', '//residue[1]//atom',
+                           'system//atom[2]//*[@*]//residue', 'parent::*', '//parent::*', 'child::*/parent::*'):
+            plan = XpathExpressionEvaluator().compile(expression)
+            result = plan.resolve(self.graph, nid_sets=True)
+            self.assertEqual(set(result.nodes.keys()), set(plan.resolve(self.graph).nodes.keys()))
+            self.assertEqual(set(plan.resolve_nids(self.graph)), set(result.nodes.keys()))
+
+    def test_query_nid_sets_equivalence_generated(self):
+        """
+        Test equal results for graph and node ID based evaluation of randomly
+        combined path steps starting from different nodes
+        """
+
+        seps = ('/', '//', '.', '..')
+        names = ('system', 'segid', 'residue', 'atom', '*', 'parent::*', 'child::*', 'ancestor::*',
+                 'following-sibling::*')
+        filters = ('', '', '[@*]', '[1]', '[2]', '[@value]', '[@elem="H"]', '[@value>620]', '[@extra]')
+
+        xpath = XpathExpressionEvaluator()
+        starts = (self.graph, self.graph.getnodes(10), self.graph.getnodes(20))
+
+        rand = random.Random(2)
+        for i in range(300):
+            expression = ''.join(rand.choice(seps) + rand.choice(names) + rand.choice(filters)
+                                 for step in range(rand.randint(1, 4)))
+            if rand.random() < 0.3:
+                expression = expression.lstrip('/.')
+
+            for start in starts:
+                msg = '{0} from {1}'.format(expression, getattr(start, 'nid', None))
+
+                # Comparing attribute values of different type fails in both
+                try:
+                    expected = xpath.resolve(expression, start, nid_sets=False)
+                except TypeError:
+                    self.assertRaises(TypeError, xpath.resolve, expression, start)
+                    continue
+
+                result = xpath.resolve(expression, start)
+                self.assertEqual(set(result.nodes.keys()), set(expected.nodes.keys()), msg=msg)
+                if not expected.empty():
+                    self.assertEqual(hasattr(result, 'nid'), hasattr(expected, 'nid'), msg=msg)
+
+
+class TestXPathQueryRangeIndexed(TestXPathQuery):
+    """
+    Run the XPath query tests using a sorted range index on the node 'value'
+    attribute
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create a graph to query with range index
+        """
+
+        super(TestXPathQueryRangeIndexed, cls).setUpClass()
+        cls.graph.add_index('value', ordered=True)
+
+
+class TestGraphAttributeIndex(UnittestPythonCompatibility):
+    """
+    Test equality queries using attribute indexes
+    """
+
+    def setUp(self):
+        """
+        Build graph with attribute index on node 'key' and edge 'label'
+        """
+
+        self.graph = Graph()
+        self.graph.add_nodes(['one', 'two', 'three', 'four'], group='a')
+        self.graph.add_edges([(1, 2), (2, 3), (3, 4)], label='link')
+        self.graph.add_index('key')
+        self.graph.add_index('label', nodes=False, edges=True)
+
+    def test_index_query_nodes(self):
+        """
+        Test node query and containment using the index
+        """
+
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'two'), [2])
+        self.assertEqual(self.graph.query_nodes(key='two').nid, 2)
+        self.assertEqual(list(self.graph.query_nodes(key='two', group='b').nodes), [])
+        self.assertTrue('three' in self.graph)
+        self.assertFalse('five' in self.graph)
+
+        # Unindexed or unhashable query falls back to full evaluation
+        self.assertEqual(list(self.graph.query_nodes(group='a').nodes), [1, 2, 3, 4])
+        self.assertIsNone(self.graph.nodes.index_lookup('key', ['two']))
+
+        # Index respects views
+        sub = self.graph.getnodes([1, 2])
+        self.assertEqual(len(sub.query_nodes(key='three')), 0)
+        self.assertFalse('three' in sub)
+
+    def test_index_query_none(self):
+        """
+        Test None lookup matches nodes lacking the attribute with and without
+        index
+        """
+
+        self.graph.nodes[2]['color'] = None
+        self.graph.nodes[3]['color'] = 'red'
+        self.graph.nodes[4]['color'] = 'blue'
+        scan = sorted(self.graph.query_nodes(color=None).nodes)
+        self.assertEqual(scan, [1, 2])
+
+        self.graph.add_index('color')
+        self.assertIsNone(self.graph.nodes.index_lookup('color', None))
+        self.assertEqual(sorted(self.graph.query_nodes(color=None).nodes), scan)
+
+        self.graph.remove_index('color')
+        self.graph.add_index('color', ordered=True)
+        self.assertEqual(sorted(self.graph.query_nodes(color=None).nodes), scan)
+
+    def test_index_query_edges(self):
+        """
+        Test edge query using the index
+        """
+
+        self.assertEqual(len(self.graph.query_edges(label='link').edges), 6)
+        self.graph.edges[(1, 2)]['label'] = 'other'
+        self.assertEqual(sorted(self.graph.query_edges(label='other').edges), [(1, 2), (2, 1)])
+
+    def test_index_maintenance(self):
+        """
+        Test update of the index on node addition, change and removal
+        """
+
+        nid = self.graph.add_node('five')
+        self.assertEqual(self.graph.query_nodes(key='five').nid, nid)
+
+        self.graph.nodes[nid]['key'] = 'six'
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'five'), [])
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'six'), [nid])
+
+        self.graph.nodes[nid].update({'key': 'seven'})
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'seven'), [nid])
+        del self.graph.nodes[nid]['key']
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'seven'), [])
+
+        self.graph.nodes[nid] = {'key': 'eight'}
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'eight'), [nid])
+
+        self.graph.remove_node(nid)
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'eight'), [])
+
+    def test_index_data_reference(self):
+        """
+        Test index lookup of nodes referring to the data of other nodes
+        """
+
+        self.graph.nodes.set_data_reference(1, 4)
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'one'), [1, 4])
+        self.assertEqual(self.graph.nodes.index_lookup('key', 'four'), [])
+
+    def test_index_copy(self):
+        """
+        Test attribute index in graph copies and index removal
+        """
+
+        graph_copy = self.graph.copy()
+        self.assertEqual(graph_copy.nodes.indexes, ['key'])
+        self.assertEqual(graph_copy.edges.indexes, ['label'])
+        self.assertEqual(graph_copy.query_nodes(key='two').nid, 2)
+
+        self.graph.remove_index('key')
+        self.assertEqual(self.graph.nodes.indexes, [])
+        self.assertIsNone(self.graph.nodes.index_lookup('key', 'two'))
+        self.assertEqual(self.graph.query_nodes(key='two').nid, 2)
+
+
+class TestGraphRangeIndex(UnittestPythonCompatibility):
+    """
+    Test range queries using sorted range indexes
+    """
+
+    def setUp(self):
+        """
+        Build graph with range index on node 'weight'
+        """
+
+        self.graph = Graph()
+        for i, weight in enumerate([0.5, 0.95, 0.2, 0.95, 1.5], start=1):
+            self.graph.add_node(i, weight=weight)
+        self.graph.add_node(6, weight='heavy')
+        self.graph.add_index('weight', ordered=True)
+
+    def test_range_lookup(self):
+        """
+        Test range lookup bounds on the storage driver
+        """
+
+        self.assertEqual(self.graph.nodes.ordered_indexes, ['weight'])
+        self.assertEqual(self.graph.nodes.range_lookup('weight', lower=0.5), [1, 2, 4, 5])
+        self.assertEqual(self.graph.nodes.range_lookup('weight', lower=0.5, include_lower=False), [2, 4, 5])
+        self.assertEqual(self.graph.nodes.range_lookup('weight', upper=0.95, include_upper=False), [3, 1])
+        self.assertEqual(self.graph.nodes.index_lookup('weight', 0.95), [2, 4])
+
+        # Incomparable bounds or no range index
+        self.assertIsNone(self.graph.nodes.range_lookup('weight', lower='a'))
+        self.assertIsNone(self.graph.nodes.range_lookup('key', lower=1))
+
+    def test_range_query_nodes(self):
+        """
+        Test range comparison suffixes in node queries
+        """
+
+        self.assertEqual(sorted(self.graph.query_nodes(weight__gt=0.9, range_query=True).nodes), [2, 4, 5])
+        query = self.graph.query_nodes(weight__ge=0.5, weight__lt=1, range_query=True)
+        self.assertEqual(sorted(query.nodes), [1, 2, 4])
+        self.assertEqual(self.graph.query_nodes(weight='heavy').nid, 6)
+
+        # Same result without index
+        self.graph.remove_index('weight')
+        self.assertEqual(sorted(self.graph.query_nodes(weight__gt=0.9, range_query=True).nodes), [2, 4, 5])
+        query = self.graph.query_nodes(weight__ge=0.5, weight__lt=1, range_query=True)
+        self.assertEqual(sorted(query.nodes), [1, 2, 4])
+
+        # Without range_query suffixed keys are attribute names matched by equality
+        self.graph.nodes[1]['weight__gt'] = 0.9
+        self.assertEqual(self.graph.query_nodes(weight__gt=0.9).nid, 1)
+        self.assertEqual(self.graph.query_nodes({'weight__gt': 0.9}).nid, 1)
+
+    def test_range_index_bulk_build(self):
+        """
+        Test bulk build of a range index matches incremental insertion
+        """
+
+        random.seed(3)
+        items = [(random.choice([random.randint(0, 20), random.random() * 20, 'a', True, float('nan')]), k)
+                 for k in range(500)]
+
+        single = RangeIndex()
+        for value, key in items:
+            single.add(value, key)
+
+        bulk = RangeIndex()
+        bulk.add_many(items[:200])
+        bulk.add_many(items[200:])
+        self.assertEqual(bulk.values, single.values)
+        self.assertEqual(bulk.keys, single.keys)
+
+        # Index built by add_index matches the index maintained on node add
+        graph = Graph()
+        graph.add_index('weight', ordered=True)
+        for nid in self.graph.nodes:
+            graph.add_node(nid, weight=self.graph.nodes[nid]['weight'])
+        self.assertEqual(graph.nodes.range_lookup('weight'), self.graph.nodes.range_lookup('weight'))
+
+    def test_range_index_skipped_values(self):
+        """
+        Test range lookup includes matching values the index does not sort
+        """
+
+        for weights in ([1.0, Decimal('2.5'), 3], [1, 2.5, True], [1, None, 2.5]):
+            graph = Graph()
+            for nid, weight in enumerate(weights, start=1):
+                graph.add_node(nid, weight=weight)
+            scan = sorted(graph.query_nodes(weight__gt=0.5, range_query=True).nodes)
+
+            graph.add_index('weight', ordered=True)
+            self.assertEqual(sorted(graph.query_nodes(weight__gt=0.5, range_query=True).nodes), scan)
+            self.assertEqual(sorted(graph.nodes.range_lookup('weight', lower=0.5, include_lower=False)), scan)
+
+        # Skipped values are removed with their node
+        graph.remove_node(2)
+        self.assertEqual(graph.nodes.range_lookup('weight'), [1, 3])
+        self.assertEqual(len(graph.nodes._storage.indexes['weight'].skipped), 0)
+
+    def test_range_index_maintenance(self):
+        """
+        Test update of the range index on node change and removal
+        """
+
+        self.graph.nodes[3]['weight'] = 2.0
+        self.assertEqual(self.graph.nodes.range_lookup('weight', upper=0.5), [1])
+
+        self.graph.remove_node(5)
+        self.assertEqual(self.graph.nodes.range_lookup('weight', lower=1), [3])
+
+        # Index respects views and is preserved in copies
+        sub = self.graph.getnodes([1, 2, 3])
+        self.assertEqual(sorted(sub.query_nodes(weight__gt=0.9, range_query=True).nodes), [2, 3])
+        self.assertEqual(self.graph.copy().nodes.ordered_indexes, ['weight'])
@@ -7,6 +7,7 @@ Unit tests for the Graph Object Relations Mapper (orm)
 """
 
 import os
+import pickle
 
 from tests.module.unittest_baseclass import UnittestPythonCompatibility
 
@@ -150,6 +151,21 @@ class TestGraphORMRegistration(UnittestPythonCompatibility):
         self.orm.node_mapping.update(second_orm.node_mapping)
         self.assertEqual(len(self.orm.node_mapping), 3)
 
+    def test_graph_orm_mapping_add_declarative(self):
+        """
+        Test adding declarative attribute mapping for node/edge
+        """
+
+        idx = self.orm.node_mapping.add(ORMtestTgf6, {'key': 'six'})
+
+        self.assertEqual(self.orm.node_mapping[idx]['match_attr'], {'key': 'six'})
+        self.assertTrue(self.orm.node_mapping[idx]['match_func']({'key': 'six'}))
+        self.assertFalse(self.orm.node_mapping[idx]['match_func']({'key': 'nine'}))
+
+        # Duplicate declarative mapping, unhashable attribute value
+        self.assertEqual(self.orm.node_mapping.add(ORMtestTgf6, {'key': 'six'}), idx)
+        self.assertRaises(TypeError, self.orm.node_mapping.add, ORMtestTgf6, {'key': ['six']})
+
     def test_graph_orm_mapping_auto_increment_index(self):
         """
         Test automatic mapping index ID increment
@@ -201,6 +217,80 @@ class TestGraphORM(UnittestPythonCompatibility):
         d = self.graph.orm.node_mapping.match(self.graph, [6])
         self.assertEqual(d, [ORMtestTgf6, ORMtestTgf9])
 
+    def test_graph_orm_mapping_declarative(self):
+        """
+        Test the class list resolved for mixed declarative and function mapping
+        """
+
+        self.graph.orm.node_mapping.add(ORMtestBi, {'key': 'six', 'add': 6}, mro_pos=-1)
+        self.graph.orm.node_mapping.add(ORMtestMo, {'key': 'nine'})
+
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestBi, ORMtestTgf6, ORMtestTgf9])
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [9]), [ORMtestTgf9, ORMtestMo])
+
+    def test_graph_orm_mapping_cache(self):
+        """
+        Test reuse of match results until node attributes or mappings change
+        """
+
+        self.graph.nodes.track_changes()
+
+        calls = []
+        self.graph.orm.node_mapping.add(ORMtestBi, lambda x: calls.append(x.get('ids')) or x.get('ids') == 'edi')
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf6, ORMtestTgf9, ORMtestBi])
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf6, ORMtestTgf9, ORMtestBi])
+        self.assertEqual(calls, ['edi'])
+
+        # Attribute change or new node value
+        self.graph.nodes[6]['ids'] = 'other'
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf6])
+        self.graph.nodes[6] = {'ids': 'edi'}
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf9, ORMtestBi])
+        self.assertEqual(calls, ['edi', 'other', 'edi'])
+
+        # Least recently used results are evicted
+        self.graph.orm.node_mapping.match_cache_size = 2
+        self.graph.orm.node_mapping.match(self.graph, [1, 2, 6])
+        self.assertEqual(list(self.graph.orm.node_mapping._match_cache), [2, 6])
+
+    def test_graph_orm_mapping_no_tracking(self):
+        """
+        Test matching does not enable change tracking on the node storage
+        """
+
+        ref = self.graph.nodes[6]
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf6, ORMtestTgf9])
+        self.graph.getnodes(6)
+
+        self.assertIsNone(self.graph.nodes._storage.indexes)
+        self.assertEqual(self.graph.orm.node_mapping._match_cache, {})
+
+        ref['ids'] = 'other'
+        self.assertEqual(self.graph.nodes[6]['ids'], 'other')
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf6])
+
+    def test_graph_orm_mapping_attribute_change(self):
+        """
+        Test match results follow changes to node attributes and mappings
+        """
+
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf6, ORMtestTgf9])
+
+        self.graph.nodes[6]['ids'] = 'other'
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf6])
+
+        self.graph.orm.node_mapping[1]['mro_pos'] = 10
+        self.graph.nodes[6]['ids'] = 'edi'
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf9, ORMtestTgf6])
+
+        # Mutable attribute values need to be set again to be detected
+        self.graph.orm.node_mapping.add(ORMtestBi, lambda x: 'bi' in x.get('tags', []))
+        self.graph.nodes[6]['tags'] = []
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf9, ORMtestTgf6])
+
+        self.graph.nodes[6]['tags'] = self.graph.nodes[6]['tags'] + ['bi']
+        self.assertEqual(self.graph.orm.node_mapping.match(self.graph, [6]), [ORMtestTgf9, ORMtestBi, ORMtestTgf6])
+
     def test_graph_orm_node(self):
         """
         Test ORM class mapping for nodes
@@ -264,6 +354,69 @@ class TestGraphORM(UnittestPythonCompatibility):
         node9 = node6.getnodes(9)
         self.assertFalse(hasattr(node9, 'add'))
 
+    def test_graph_orm_class_cache(self):
+        """
+        Test reuse of ORM classes for identical class factory calls
+        """
+
+        node6 = self.graph.getnodes(6)
+        self.assertTrue(type(node6) is type(self.graph.getnodes(6)))
+        self.assertFalse(type(node6) is type(self.graph.getnodes(9)))
+
+    def test_graph_orm_class_cache_invalidate(self):
+        """
+        Test clearing of cached ORM classes after changes to the mapping
+        """
+
+        node6 = self.graph.getnodes(6)
+        self.graph.orm.node_mapping.add(ORMtestBi, lambda x: x.get('key') == 'six')
+
+        node6_new = self.graph.getnodes(6)
+        self.assertFalse(type(node6) is type(node6_new))
+        self.assertTrue(ORMtestBi in type(node6_new).mro())
+
+    def test_graph_orm_mapping_declarative_pickle(self):
+        """
+        Test pickle round trip of a graph with declarative mappings
+        """
+
+        graph = read_tgf(self._gpf_graph)
+        graph.orm.node_mapping.add(ORMtestTgf6, {'key': 'six'})
+        graph.nodes[6]['add'] = 6
+
+        graph = pickle.loads(pickle.dumps(graph))
+        self.assertEqual(graph.orm.node_mapping.match(graph, [6]), [ORMtestTgf6])
+        self.assertEqual(graph.getnodes(6).get_label(), 'tgf6 class 6')
+
+        # In place mapping changes are detected after unpickling
+        state = graph.orm.node_mapping.state()
+        graph.orm.node_mapping[1]['mro_pos'] = 1
+        self.assertNotEqual(graph.orm.node_mapping.state(), state)
+
+    def test_graph_orm_mapping_state(self):
+        """
+        Test the mapping state changes with every change to the mapping
+        """
+
+        mapping = self.graph.orm.node_mapping
+        state = mapping.state()
+
+        mapping.match(self.graph, [6])
+        self.assertEqual(mapping.state(), state)
+
+        changes = [lambda: mapping.add(ORMtestBi, {'key': 'six'}),
+                   lambda: mapping[1].__setitem__('mro_pos', 10),
+                   lambda: mapping[1].update({'mro_pos': 0}),
+                   lambda: mapping.__setitem__(4, dict(mapping[1])),
+                   lambda: mapping.__delitem__(4)]
+        for change in changes:
+            change()
+            self.assertNotEqual(mapping.state(), state)
+            state = mapping.state()
+
+        # State is shared by mappings referring to the same storage
+        self.assertEqual(GraphORM(node_mapping=mapping).node_mapping.state(), state)
+
     def test_graph_mro(self):
         """
         Test python Method Resolution Order management
@@ -6,12 +6,24 @@ file: module_storage_driver_test.py
 Unit tests graph nodes and edges storage drivers
 """
 
+import os
+import copy
+import pickle
 import random
+import tempfile
+
+from functools import partial
 
 from tests.module.unittest_baseclass import UnittestPythonCompatibility, MAJOR_PY_VERSION
 
+from graphit import Graph, GraphAxis
+from graphit.graph_exceptions import GraphitException, GraphitReadOnlyError
 from graphit.graph_storage_drivers.graph_dictstorage_driver import DictStorage
-from graphit.graph_storage_drivers.graph_arraystorage_driver import ArrayStorage
+from graphit.graph_storage_drivers.graph_arraystorage_driver import ArrayStorage, init_arraystorage_driver
+from graphit.graph_storage_drivers.graph_csrstorage_driver import CSRStorage, init_csrstorage_driver
+from graphit.graph_storage_drivers.graph_sqlitestorage_driver import SQLiteStorage, init_sqlitestorage_driver
+from graphit.graph_storage_drivers.graph_snapshotstorage_driver import (SnapshotEdgeStorage, SnapshotRecord,
+                                                                        read_snapshot, write_snapshot)
 from graphit.graph_storage_drivers.graph_storage_views import DataView
 
 
@@ -600,6 +612,21 @@ class TestDictStorageNodes(_BaseStorageDriverTests, UnittestPythonCompatibility)
             self.assertEqual(str(self.storage), "['one', 'three']")
         self.assertEqual(repr(self.storage), '<DictStorage object {0}: 2 items>'.format(id(self.storage)))
 
+    def test_dictstorage_view_order(self):
+        """
+        Test if a selective view preserves key order after adding and removing
+        keys
+        """
+
+        self.storage.set_view(['three', 'one', 'five'])
+        self.assertEqual(list(self.storage.keys()), ['three', 'one', 'five'])
+
+        del self.storage['one']
+        self.storage[self.new_key] = {'key': 6}
+        self.assertEqual(list(self.storage.keys()), ['three', 'five', 'six'])
+        self.assertTrue('six' in self.storage)
+        self.assertFalse('one' in self.storage)
+
     def test_dictstorage_keysview_comparison(self):
         """
         Test the DictStorage view based keys comparison methods
@@ -715,6 +742,649 @@ class TestDictStorageEdges(_BaseStorageDriverTests, UnittestPythonCompatibility)
         self.storage_instance = DictStorage
         self.storage = DictStorage(self.mapping)
 
+    def test_dictstorage_data_reference_index(self):
+        """
+        Test reverse data reference index used to resolve orphan data pointers
+        """
+
+        self.storage.set_data_reference((1, 2), (2, 1))
+        self.storage.set_data_reference((1, 2), (5, 4))
+        self.assertDictEqual(self.storage.data_reference_index(), {(1, 2): {(2, 1): None, (5, 4): None}})
+
+        # Removing the data reference removes it from the index
+        self.storage.del_data_reference((5, 4))
+        self.assertDictEqual(self.storage.data_reference_index(), {(1, 2): {(2, 1): None}})
+
+        # Removing the referred key copies its data to the referring key
+        del self.storage[(1, 2)]
+        self.assertDictEqual(self.storage[(2, 1)], {'key': 1})
+        self.assertFalse(self.storage.has_data_reference((2, 1)))
+        self.assertDictEqual(self.storage.data_reference_index(), {})
+
+
+class TestDictStorageAdjacencyIndex(UnittestPythonCompatibility):
+    """
+    Unit tests for the adjacency index maintained by the DictStorage driver
+    """
+
+    def setUp(self):
+
+        self.graph = Graph(auto_nid=False, directed=True)
+        self.graph.add_edges([(1, 2), (2, 3), (2, 4), (4, 5), (3, 5)], node_from_edge=True)
+        self.graph.add_node(6)
+
+    def test_adjacency_index_creation(self):
+        """
+        Adjacency index build from an existing edge dictionary
+        """
+
+        edges = DictStorage({(1, 2): {}, (2, 3): {}, (2, 4): {}})
+        self.assertDictEqual(edges.adjacency_index(), {1: {2: None}, 2: {3: None, 4: None}})
+
+    def test_adjacency_index_add_remove(self):
+        """
+        Adjacency is updated in place when edges are added or removed
+        """
+
+        self.assertEqual(self.graph.adjacency[2], [3, 4])
+        self.assertEqual(self.graph.adjacency[6], [])
+
+        self.graph.add_edge(6, 1)
+        self.assertEqual(self.graph.adjacency[6], [1])
+
+        self.graph.remove_edge(2, 3)
+        self.assertEqual(self.graph.adjacency[2], [4])
+
+        self.graph.remove_node(4)
+        self.assertEqual(self.graph.adjacency[2], [])
+        self.assertFalse(2 in self.graph.edges.adjacency_index())
+
+    def test_adjacency_index_predecessors(self):
+        """
+        Predecessors and indegree are resolved using the reverse index
+        """
+
+        self.assertEqual(self.graph.adjacency.predecessors(5), [4, 3])
+        self.assertEqual(self.graph.adjacency.predecessors(1), [])
+        self.assertDictEqual(self.graph.adjacency.degree(method='indegree'), {1: 0, 2: 1, 3: 1, 4: 1, 5: 2, 6: 0})
+
+        self.graph.remove_edge(4, 5)
+        self.assertEqual(self.graph.adjacency.predecessors(5), [3])
+
+        # Only edges in the subgraph view are considered
+        sub = self.graph.getnodes([2, 3])
+        self.assertEqual(sub.adjacency.predecessors(3), [2])
+        self.assertEqual(sub.adjacency.predecessors(2), [])
+
+    def test_adjacency_index_view(self):
+        """
+        Adjacency of a subgraph only includes edges in the edge view
+        """
+
+        sub = self.graph.getnodes([1, 2, 3])
+        self.assertDictEqual(sub.adjacency(), {1: [2], 2: [3], 3: []})
+
+        # Shared index between origin and subgraph
+        self.graph.add_edge(3, 1)
+        self.assertEqual(self.graph.adjacency[3], [5, 1])
+        self.assertEqual(sub.adjacency[3], [])
+
+    def test_adjacency_incident_edges(self):
+        """
+        Incident edges of nodes are resolved from the adjacency index
+        """
+
+        adjacency = self.graph.adjacency
+        self.assertEqual(adjacency.incident_edges([2]), [(2, 3), (2, 4), (1, 2)])
+        self.assertEqual(adjacency.incident_edges([2], method='outdegree'), [(2, 3), (2, 4)])
+        self.assertEqual(adjacency.incident_edges([2], method='indegree'), [(1, 2)])
+        self.assertEqual(adjacency.incident_edges([6]), [])
+
+        # Edges between the nodes are reported once
+        self.assertEqual(sorted(adjacency.incident_edges([2, 3])), [(1, 2), (2, 3), (2, 4), (3, 5)])
+
+        # Subgraph only reports edges in the edge view
+        sub = self.graph.getnodes([1, 2, 3])
+        self.assertEqual(sub.adjacency.incident_edges([2]), [(2, 3), (1, 2)])
+
+    def test_adjacency_incident_edges_remove_node(self):
+        """
+        Node removal removes incident edges and updates the index
+        """
+
+        self.graph.remove_node(2)
+
+        self.assertEqual(sorted(self.graph.edges.keys()), [(3, 5), (4, 5)])
+        self.assertEqual(self.graph.adjacency.incident_edges([1, 3, 4]), [(3, 5), (4, 5)])
+        self.assertTrue(2 not in self.graph.edges.adjacency_index())
+        self.assertTrue(2 not in self.graph.edges.adjacency_index(reverse=True))
+
+
+class TestCSRStorageEdges(_BaseStorageDriverTests, UnittestPythonCompatibility):
+    """
+    Unit tests for CSRStorage class storing edges
+    """
+
+    def setUp(self):
+
+        self.new_key = (5, 6)
+        self.mapping = {(1, 2): {'key': 1},
+                        (2, 1): {'key': 2, 'extra': True},
+                        (3, 2): {'key': 3, 'type': 'node'},
+                        (4, 5): {'key': 4, 'weight': 1.33},
+                        (2, 5): {'key': 5, 'weight': 3.11}}
+
+        self.storage_instance = CSRStorage
+        self.storage = CSRStorage(self.mapping)
+
+    def test_storagedriver__eq__(self):
+        """
+        Test Python dict-like __eq__ method
+        """
+
+        graph1 = self.storage_instance({(3, 2): 3, (4, 5): 4, (2, 5): 6})
+        self.assertFalse(self.storage == graph1)
+        self.assertTrue(self.storage == CSRStorage(self.mapping))
+
+    def test_storagedriver__ne__(self):
+        """
+        Test Python dict-like __ne__ method
+        """
+
+        graph1 = self.storage_instance({(3, 2): 3, (4, 5): 4, (2, 5): 6})
+        self.assertTrue(self.storage != graph1)
+        self.assertTrue(self.storage != [(3, 2), (4, 5), (2, 5)])
+
+    def test_csrstorage_data_reference(self):
+        """
+        Test data references stored in the reference side table
+        """
+
+        self.storage.set_data_reference((1, 2), (2, 1))
+        self.assertEqual(self.storage.get_data_reference((2, 1)), (1, 2))
+        self.assertEqual(id(self.storage[(2, 1)]), id(self.storage[(1, 2)]))
+
+        # Setting the referring key sets the referred key
+        self.storage[(2, 1)] = {'key': 6}
+        self.assertDictEqual(self.storage[(1, 2)], {'key': 6})
+
+        # Referring key returns the data reference in a reference free context
+        with self.storage as storage:
+            self.assertDictEqual(storage[(2, 1)], {'$data_ref': (1, 2)})
+
+        # Removing the referred key copies its data to the referring keys
+        self.storage.set_data_reference((1, 2), (4, 5))
+        del self.storage[(1, 2)]
+        self.assertDictEqual(self.storage[(2, 1)], {'key': 6})
+        self.assertDictEqual(self.storage[(4, 5)], {'key': 6})
+        self.assertFalse(self.storage.has_data_reference((2, 1)))
+
+    def test_csrstorage_compact(self):
+        """
+        Test merging pending edges into the CSR arrays
+        """
+
+        self.storage.set_data_reference((2, 5), (5, 2))
+        del self.storage[(2, 1)]
+        self.storage.compact()
+
+        self.assertEqual(len(self.storage._storage.indices), 5)
+        self.assertEqual(len(self.storage._storage.pending_src), 0)
+        self.assertEqual(len(self.storage), 5)
+        self.assertEqual(self.storage.neighbours(2), [5])
+        self.assertEqual(sorted(self.storage.neighbours(2, reverse=True)), [1, 3, 5])
+        self.assertEqual(self.storage.get_data_reference((5, 2)), (2, 5))
+        self.assertDictEqual(self.storage[(4, 5)], {'key': 4, 'weight': 1.33})
+
+        # Edges added after compaction are pending
+        self.storage[(2, 1)] = {'key': 2}
+        self.assertEqual(self.storage.neighbours(2), [5, 1])
+        self.assertTrue((2, 1) in self.storage)
+
+    def test_csrstorage_empty_value(self):
+        """
+        Test reading edges without attributes does not store a value for them
+        """
+
+        self.storage[(5, 6)] = {}
+        self.storage[(6, 5)] = {}
+        self.storage.set_data_reference((6, 5), (5, 4))
+        values = self.storage._storage.values
+        stored = len(values)
+
+        for key in list(self.storage.keys()):
+            self.assertTrue(isinstance(self.storage[key], dict))
+            self.storage.get(key)
+        self.assertEqual(len(values), stored)
+        self.assertDictEqual(self.storage[(5, 6)], {})
+        self.assertEqual(type(copy.copy(self.storage[(5, 6)])), dict)
+
+        # Value is stored when updated in place, also after compaction
+        value = self.storage[(5, 6)]
+        self.storage.compact()
+        value['weight'] = 2.0
+        self.assertDictEqual(self.storage[(5, 6)], {'weight': 2.0})
+        self.assertEqual(len(self.storage._storage.values), stored + 1)
+
+        # Updating a referring key updates the referred key
+        self.storage[(5, 4)].update({'weight': 1.0})
+        self.assertDictEqual(self.storage[(6, 5)], {'weight': 1.0})
+
+        # Removed edges are not restored
+        self.storage[(1, 6)] = {}
+        value = self.storage[(1, 6)]
+        del self.storage[(1, 6)]
+        value['weight'] = 3.0
+        self.assertFalse((1, 6) in self.storage)
+
+
+class TestCSRStorageGraph(UnittestPythonCompatibility):
+    """
+    Unit tests for a Graph using the CSRStorage driver
+    """
+
+    def setUp(self):
+
+        self.graph = Graph(auto_nid=False, storagedriver=init_csrstorage_driver)
+        self.graph.add_edges([(1, 2), (2, 3), (2, 4), (4, 5), (3, 5)], node_from_edge=True, weight=2)
+        self.graph.add_node(6)
+
+    def test_csrstorage_graph_edges(self):
+        """
+        Undirected edges are stored as a pair with a data reference
+        """
+
+        self.assertTrue(isinstance(self.graph.edges, CSRStorage))
+        self.assertEqual(len(self.graph.edges), 10)
+        self.assertEqual(self.graph.edges.get_data_reference((2, 1)), (1, 2))
+        self.assertEqual(self.graph.adjacency[2], [1, 3, 4])
+        self.assertEqual(self.graph.adjacency.degree()[2], 6)
+
+        self.graph.edges[(2, 1)]['weight'] = 3
+        self.assertEqual(self.graph.edges[(1, 2)]['weight'], 3)
+
+    def test_csrstorage_graph_remove(self):
+        """
+        Removing a node removes its edges
+        """
+
+        self.graph.remove_node(2)
+
+        self.assertEqual(len(self.graph.edges), 4)
+        self.assertEqual(self.graph.adjacency[1], [])
+        self.assertEqual(self.graph.adjacency.predecessors(5), [4, 3])
+
+    def test_csrstorage_graph_subgraph(self):
+        """
+        Sub graphs and copies keep using the CSRStorage driver
+        """
+
+        sub = self.graph.getnodes([1, 2, 3])
+        self.assertTrue(isinstance(sub.edges, CSRStorage))
+        self.assertEqual(sorted(sub.edges.keys()), [(1, 2), (2, 1), (2, 3), (3, 2)])
+        self.assertEqual(sub.adjacency[2], [1, 3])
+
+        copy = self.graph.copy()
+        self.assertTrue(isinstance(copy.edges, CSRStorage))
+        self.assertEqual(copy, self.graph)
+        self.assertEqual(copy.edges.get_data_reference((2, 1)), (1, 2))
+
+    def test_csrstorage_graph_compact(self):
+        """
+        Adjacency is unchanged after merging pending edges
+        """
+
+        adjacency = self.graph.adjacency()
+        self.graph.edges.compact()
+
+        self.assertDictEqual(self.graph.adjacency(), adjacency)
+        self.assertEqual(self.graph.edges[(3, 5)], {'weight': 2})
+
+
+class TestSQLiteStorageNodes(_BaseStorageDriverTests, UnittestPythonCompatibility):
+    """
+    Unit tests for SQLiteStorage class storing nodes
+    """
+
+    def setUp(self):
+
+        self.new_key = 'six'
+        self.mapping = {'one': {'key': 1},
+                        'two': {'key': 2, 'extra': True},
+                        'three': {'key': 3, 'type': 'node'},
+                        'four': {'key': 4, 'weight': 1.33},
+                        'five': {'key': 5, 'weight': 3.11}}
+
+        self.storage_instance = SQLiteStorage
+        self.storage = SQLiteStorage(self.mapping)
+
+    def test_storagedriver__eq__(self):
+        """
+        Test Python dict-like __eq__ method
+        """
+
+        graph1 = self.storage_instance({'three': 3, 'four': 4, 'five': 6})
+        self.assertFalse(self.storage == graph1)
+        self.assertTrue(self.storage == SQLiteStorage(self.mapping))
+
+    def test_storagedriver__ne__(self):
+        """
+        Test Python dict-like __ne__ method
+        """
+
+        graph1 = self.storage_instance({'three': 3, 'four': 4, 'five': 6})
+        self.assertTrue(self.storage != graph1)
+        self.assertTrue(self.storage != ['three', 'four', 'five'])
+
+    def test_sqlitestorage_cache(self):
+        """
+        Test values evicted from the LRU cache are read from the database
+        """
+
+        self.storage._storage.cache_size = 2
+        self.storage._storage.cache.clear()
+
+        for key in self.mapping:
+            self.storage[key]['visited'] = True
+        self.assertEqual(len(self.storage._storage.cache), 2)
+
+        for key, value in self.mapping.items():
+            value['visited'] = True
+            self.assertDictEqual(self.storage[key], value)
+
+    def test_sqlitestorage_cache_evicted_record(self):
+        """
+        Test changes made through a record evicted from the LRU cache do not
+        overwrite newer changes to the same key
+        """
+
+        self.storage._storage.cache_size = 2
+        self.storage._storage.cache.clear()
+
+        record = self.storage['one']
+        for key in ('two', 'three', 'four'):
+            self.storage[key]
+        self.assertFalse('one' in self.storage._storage.cache)
+
+        self.storage['one']['value'] = 5
+        record['extra'] = 1
+        del record['key']
+
+        self.assertDictEqual(self.storage['one'], {'value': 5, 'extra': 1})
+        self.assertDictEqual(record, {'value': 5, 'extra': 1})
+
+    def test_sqlitestorage_query(self):
+        """
+        Test query reading the items from the database in batches
+        """
+
+        self.assertEqual(sorted(self.storage.query(lambda k, v: v.get('weight', 0) > 1)), ['five', 'four'])
+
+
+class TestSQLiteStorageEdges(_BaseStorageDriverTests, UnittestPythonCompatibility):
+    """
+    Unit tests for SQLiteStorage class storing edges
+    """
+
+    def setUp(self):
+
+        self.new_key = (5, 6)
+        self.mapping = {(1, 2): {'key': 1},
+                        (2, 1): {'key': 2, 'extra': True},
+                        (3, 2): {'key': 3, 'type': 'node'},
+                        (4, 5): {'key': 4, 'weight': 1.33},
+                        (2, 5): {'key': 5, 'weight': 3.11}}
+
+        self.storage_instance = SQLiteStorage
+        self.storage = SQLiteStorage(self.mapping)
+
+    def test_storagedriver__eq__(self):
+        """
+        Test Python dict-like __eq__ method
+        """
+
+        graph1 = self.storage_instance({(3, 2): 3, (4, 5): 4, (2, 5): 6})
+        self.assertFalse(self.storage == graph1)
+        self.assertTrue(self.storage == SQLiteStorage(self.mapping))
+
+    def test_storagedriver__ne__(self):
+        """
+        Test Python dict-like __ne__ method
+        """
+
+        graph1 = self.storage_instance({(3, 2): 3, (4, 5): 4, (2, 5): 6})
+        self.assertTrue(self.storage != graph1)
+        self.assertTrue(self.storage != [(3, 2), (4, 5), (2, 5)])
+
+    def test_sqlitestorage_data_reference(self):
+        """
+        Test data references and resolving orphan references on removal
+        """
+
+        self.storage.set_data_reference((1, 2), (2, 1))
+        self.assertEqual(self.storage.get_data_reference((2, 1)), (1, 2))
+        self.assertDictEqual(self.storage[(2, 1)], {'key': 1})
+
+        self.storage[(2, 1)]['weight'] = 2
+        self.assertDictEqual(self.storage[(1, 2)], {'key': 1, 'weight': 2})
+
+        with self.storage as storage:
+            self.assertDictEqual(storage[(2, 1)], {'$data_ref': (1, 2)})
+
+        del self.storage[(1, 2)]
+        self.assertIsNone(self.storage.get_data_reference((2, 1)))
+        self.assertDictEqual(self.storage[(2, 1)], {'key': 1, 'weight': 2})
+
+    def test_sqlitestorage_neighbours(self):
+        """
+        Test neighbour lookup using the edge source and target index
+        """
+
+        self.assertEqual(sorted(self.storage.neighbours(2)), [1, 5])
+        self.assertEqual(sorted(self.storage.neighbours(2, reverse=True)), [1, 3])
+        self.assertEqual(self.storage.neighbours(6), [])
+
+
+class TestSQLiteStorageGraph(UnittestPythonCompatibility):
+    """
+    Unit tests for a Graph using the SQLiteStorage driver
+    """
+
+    def setUp(self):
+
+        self.graph = Graph(auto_nid=False, storagedriver=init_sqlitestorage_driver)
+        self.graph.add_edges([(1, 2), (2, 3), (2, 4), (4, 5), (3, 5)], node_from_edge=True, weight=2)
+        self.graph.add_node(6)
+
+    def test_sqlitestorage_graph_edges(self):
+        """
+        Undirected edges are stored as a pair with a data reference
+        """
+
+        self.assertTrue(isinstance(self.graph.edges, SQLiteStorage))
+        self.assertEqual(len(self.graph.edges), 10)
+        self.assertEqual(self.graph.edges.get_data_reference((2, 1)), (1, 2))
+        self.assertEqual(self.graph.adjacency[2], [1, 3, 4])
+        self.assertEqual(self.graph.adjacency.degree()[2], 6)
+
+        self.graph.edges[(2, 1)]['weight'] = 3
+        self.assertEqual(self.graph.edges[(1, 2)]['weight'], 3)
+
+    def test_sqlitestorage_graph_remove(self):
+        """
+        Removing a node removes its edges
+        """
+
+        self.graph.remove_node(2)
+
+        self.assertEqual(len(self.graph.edges), 4)
+        self.assertEqual(self.graph.adjacency[1], [])
+        self.assertEqual(self.graph.adjacency.predecessors(5), [4, 3])
+
+    def test_sqlitestorage_graph_subgraph(self):
+        """
+        Sub graphs share the database, copies are stored in a new one
+        """
+
+        sub = self.graph.getnodes([1, 2, 3])
+        self.assertTrue(isinstance(sub.edges, SQLiteStorage))
+        self.assertEqual(sorted(sub.edges.keys()), [(1, 2), (2, 1), (2, 3), (3, 2)])
+        self.assertEqual(sub.adjacency[2], [1, 3])
+
+        copy = self.graph.copy()
+        self.assertTrue(isinstance(copy.edges, SQLiteStorage))
+        self.assertNotEqual(copy.edges._storage.database.path, self.graph.edges._storage.database.path)
+        self.assertEqual(copy, self.graph)
+        self.assertEqual(copy.edges.get_data_reference((2, 1)), (1, 2))
+
+    def test_sqlitestorage_graph_pickle(self):
+        """
+        Temporary databases are pickled by content, database files by path
+        """
+
+        graph = pickle.loads(pickle.dumps(self.graph))
+        self.assertTrue(isinstance(graph.edges, SQLiteStorage))
+        self.assertNotEqual(graph.edges._storage.database.path, self.graph.edges._storage.database.path)
+        self.assertTrue(graph.nodes._storage.database is graph.edges._storage.database)
+        self.assertEqual(list(graph.edges.keys()), list(self.graph.edges.keys()))
+        self.assertEqual(graph.edges[(2, 1)], {'weight': 2})
+        self.assertEqual(graph.adjacency[2], [1, 3, 4])
+
+        handle, path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(handle)
+        try:
+            graph = Graph(auto_nid=False, storagedriver=partial(init_sqlitestorage_driver, path=path))
+            graph.add_edges([(1, 2), (2, 3)], node_from_edge=True, weight=2)
+            pickled = pickle.dumps(graph)
+
+            # Shared within the process, reopened when the database is closed
+            self.assertTrue(pickle.loads(pickled).edges._storage.database is graph.edges._storage.database)
+            graph.edges._storage.database.close()
+            graph = pickle.loads(pickled)
+            self.assertEqual(graph.edges._storage.database.path, os.path.abspath(path))
+            self.assertEqual(graph.adjacency[2], [1, 3])
+            graph.edges._storage.database.close()
+        finally:
+            os.remove(path)
+
+    def test_sqlitestorage_graph_path_in_use(self):
+        """
+        A database file in use cannot be opened by another graph, copies are
+        stored in a temporary file
+        """
+
+        handle, path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(handle)
+        try:
+            driver = partial(init_sqlitestorage_driver, path=path)
+            graph = Graph(auto_nid=False, storagedriver=driver)
+            graph.add_edges([(1, 2), (2, 3)], node_from_edge=True)
+            self.assertRaises(GraphitException, Graph, storagedriver=driver)
+
+            copy = graph.copy()
+            self.assertTrue(copy.edges._storage.database.temporary)
+            self.assertEqual(copy, graph)
+            graph.edges._storage.database.close()
+        finally:
+            os.remove(path)
+
+
+class TestSnapshotStorageGraph(UnittestPythonCompatibility):
+    """
+    Unit tests for a Graph stored in a read-only memory-mapped snapshot
+    """
+
+    def setUp(self):
+
+        self.graph = GraphAxis()
+        self.graph.add_nodes([u'one', u'two', u'three', u'four'], weight=1)
+        self.graph.add_edges([(1, 2), (2, 3), (2, 4)], label=u'link')
+        self.graph.root = 1
+
+        handle, self.path = tempfile.mkstemp(suffix='.snapshot')
+        os.close(handle)
+        write_snapshot(self.graph, self.path)
+
+        self.snapshot = read_snapshot(self.path)
+
+    def tearDown(self):
+
+        os.remove(self.path)
+
+    def test_snapshotstorage_read(self):
+        """
+        Test the snapshot equals the graph it was written from
+        """
+
+        self.assertTrue(isinstance(self.snapshot, GraphAxis))
+        self.assertTrue(isinstance(self.snapshot.edges, SnapshotEdgeStorage))
+        self.assertEqual(self.snapshot.root, 1)
+        self.assertEqual(self.snapshot, self.graph)
+        self.assertDictEqual(self.snapshot.nodes[2], self.graph.nodes[2])
+        self.assertDictEqual(self.snapshot.edges[(3, 2)], {u'label': u'link'})
+        self.assertEqual(self.snapshot.edges.get_data_reference((3, 2)), (2, 3))
+        self.assertEqual(self.snapshot.adjacency[2], [1, 3, 4])
+        self.assertEqual(self.snapshot.adjacency.predecessors(2), [1, 3, 4])
+        self.assertEqual(self.snapshot.data.nodeid, self.graph.data.nodeid)
+
+    def test_snapshotstorage_read_only(self):
+        """
+        Test changes to nodes and edges raise a GraphitReadOnlyError
+        """
+
+        nodeid = self.snapshot.data.nodeid
+        self.assertRaises(GraphitReadOnlyError, self.snapshot.add_node, u'five')
+        self.assertEqual(self.snapshot.data.nodeid, nodeid)
+        self.assertRaises(GraphitReadOnlyError, self.snapshot.remove_edge, 1, 2)
+        self.assertRaises(GraphitReadOnlyError, self.snapshot.nodes[1].update, {u'weight': 2})
+
+        # Graph data is not read-only
+        self.snapshot.data[u'name'] = u'snapshot'
+        self.assertEqual(self.snapshot.data[u'name'], u'snapshot')
+
+    def test_snapshotstorage_subgraph_copy(self):
+        """
+        Sub graphs share the snapshot, deep copies can be changed
+        """
+
+        sub = self.snapshot.getnodes([1, 2])
+        self.assertTrue(isinstance(sub.edges, SnapshotEdgeStorage))
+        self.assertEqual(sorted(sub.edges.keys()), [(1, 2), (2, 1)])
+
+        copy = self.snapshot.copy()
+        copy.add_edge(3, 4)
+        self.assertEqual(len(copy.edges), len(self.graph.edges) + 2)
+        self.assertEqual(copy.edges.get_data_reference((3, 2)), (2, 3))
+
+    def test_snapshotstorage_pickle(self):
+        """
+        Test pickled snapshot storage refers to the snapshot file
+        """
+
+        edges = pickle.loads(pickle.dumps(self.snapshot.edges))
+        self.assertEqual(list(edges.keys()), list(self.snapshot.edges.keys()))
+        self.assertDictEqual(edges[(1, 2)], {u'label': u'link'})
+
+    def test_snapshotstorage_other_driver(self):
+        """
+        Test snapshot of a graph using another storage driver stores records
+        """
+
+        for driver in (init_arraystorage_driver, init_csrstorage_driver):
+            graph = GraphAxis(storagedriver=driver)
+            graph.add_nodes(range(200), weight=1.5)
+            graph.add_edges([(1, 2), (2, 3)], label=u'link')
+            graph.root = 1
+            write_snapshot(graph, self.path)
+
+            snapshot = read_snapshot(self.path)
+            self.assertEqual(list(snapshot.nodes.keys()), list(graph.nodes.keys()))
+            self.assertEqual(list(snapshot.edges.keys()), list(graph.edges.keys()))
+            self.assertTrue(isinstance(snapshot.nodes[5], SnapshotRecord))
+            self.assertDictEqual(snapshot.nodes[5], dict(graph.nodes[5]))
+            self.assertDictEqual(snapshot.edges[(3, 2)], {u'label': u'link'})
+            self.assertTrue(os.path.getsize(self.path) < 50000)
+
 
 class TestArrayStorageNodes(_BaseStorageDriverTests, UnittestPythonCompatibility):
     """
@@ -778,6 +1448,43 @@ class TestArrayStorageNodes(_BaseStorageDriverTests, UnittestPythonCompatibility
         self.assertIsNotNone(self.storage.describe())
         self.assertIsNotNone(self.storage.index)
 
+    def test_arraystorage_dataframe_rows(self):
+        """
+        Test DataFrame representation with a row per node and typed columns
+        """
+
+        frame = self.storage.dataframe
+        self.assertEqual(sorted(frame.index), sorted(self.mapping.keys()))
+        self.assertEqual(frame[u'key'].dtype, 'int64')
+        self.assertEqual(frame[u'weight'].dtype, 'float64')
+
+        # Undefined attributes are Nan in the DataFrame but not in the row
+        self.assertTrue(frame[u'weight'].isnull()[u'one'])
+        self.assertDictEqual(self.storage[u'one'].to_dict(), {u'key': 1})
+
+        # Storing another type converts the column to object
+        self.storage[u'one'][u'key'] = u'one'
+        self.assertEqual(self.storage.dataframe[u'key'].dtype, object)
+        self.assertEqual(self.storage[u'one'][u'key'], u'one')
+        self.assertEqual(self.storage[u'two'][u'key'], 2)
+
+    def test_arraystorage_set_many(self):
+        """
+        Test batched addition and replacement of nodes
+        """
+
+        self.storage.set_many([(u'two', {u'key': 20}), (u'six', {u'key': 6, u'extra': False}), (u'seven', 7)])
+
+        self.assertEqual(len(self.storage), 7)
+        self.assertDictEqual(self.storage[u'two'].to_dict(), {u'key': 20})
+        self.assertDictEqual(self.storage[u'six'].to_dict(), {u'key': 6, u'extra': False})
+        self.assertEqual(self.storage[u'seven'], 7)
+
+        # Removed rows are dropped from the DataFrame
+        for key in (u'one', u'three', u'four'):
+            del self.storage[key]
+        self.assertEqual(sorted(self.storage.dataframe.index), [u'five', u'seven', u'six', u'two'])
+
 
 class TestArrayStorageEdges(_BaseStorageDriverTests, UnittestPythonCompatibility):
     """